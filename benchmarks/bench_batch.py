@@ -0,0 +1,74 @@
+"""
+Environment steps per second of the batched tables against one ``Environment``.
+
+A step is one decision of one player. The batched tables are stepped with
+random legal actions for every table at once; the single ``Environment``
+plays headless hands with random bots and counts their decisions.
+
+Run from the repository root with ``python -m benchmarks.bench_batch``.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.game import batch, headless
+from src.game.batch import BatchEnvironment
+from src.game.strategies import random_strategy
+
+
+def batch_steps_per_second(num_tables: int, num_players: int, steps: int, seed: int) -> tuple[float, float]:
+    env = BatchEnvironment(num_tables, num_players, starting_score=1000, seed=seed)
+    rng = np.random.default_rng(seed)
+    _, info = env.reset()
+    start = time.perf_counter()
+    for _ in range(steps):
+        roll = rng.random(num_tables)
+        actions = np.where(info["legal"][:, batch.RAISE] & (roll < 0.2), batch.RAISE, np.where(roll > 0.9, batch.FOLD, batch.CALL))
+        _, _, _, info = env.step(actions)
+    elapsed = time.perf_counter() - start
+    return steps * num_tables / elapsed, env.hands_played / elapsed
+
+
+def environment_steps_per_second(num_players: int, hands: int, seed: int) -> tuple[float, float]:
+    rng = random.Random(seed)
+    decisions = 0
+
+    def counting(strategy):
+        def count(player, prev_raise, can_re_raise):
+            nonlocal decisions
+            decisions += 1
+            return strategy(player, prev_raise, can_re_raise)
+        return count
+
+    env = headless.create_table(
+        {f"Bot {i}": counting(random_strategy(random.Random(rng.getrandbits(64)))) for i in range(num_players)},
+        starting_score=1_000_000,
+        seed=seed
+    )
+    start = time.perf_counter()
+    played = headless.play_hands(env, hands)
+    elapsed = time.perf_counter() - start
+    return decisions / elapsed, played / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[1, 64, 1024, 8192], help="batch sizes")
+    parser.add_argument("--players", type=int, default=2, help="players per table")
+    parser.add_argument("--steps", type=int, default=200, help="steps per batch size")
+    parser.add_argument("--hands", type=int, default=5000, help="hands of the single Environment")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    steps, hands = environment_steps_per_second(args.players, args.hands, args.seed)
+    print(f"{'tables':>12} {'steps/s':>14} {'hands/s':>12}")
+    print(f"{'Environment':>12} {steps:>14,.0f} {hands:>12,.0f}")
+    for num_tables in args.tables:
+        steps, hands = batch_steps_per_second(num_tables, args.players, args.steps, args.seed)
+        print(f"{num_tables:>12} {steps:>14,.0f} {hands:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
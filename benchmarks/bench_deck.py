@@ -0,0 +1,41 @@
+"""
+Microbenchmarks of ``Deck`` against the array backed ``ArrayDeck``.
+
+Run from the repository root with ``python -m benchmarks.bench_deck``.
+"""
+import argparse
+import timeit
+
+from src.game.deck import ArrayDeck, Deck
+
+# Cards dealt in a hand with 6 players: 12 hole cards, 5 board cards and 3 burns
+CARDS_PER_HAND = 20
+
+
+def _hand(deck) -> None:
+    deck.reset()
+    for _ in range(CARDS_PER_HAND):
+        deck.draw()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="calls per benchmark")
+    args = parser.parse_args()
+
+    benchmarks = {
+        "construct": lambda cls: (lambda: cls()),
+        "reset": lambda cls: cls().reset,
+        "shuffle": lambda cls: cls().shuffle,
+        "draw 52": lambda cls: (lambda deck: lambda: [deck.reset()] + [deck.draw() for _ in range(52)])(cls()),
+        f"hand ({CARDS_PER_HAND} cards)": lambda cls: (lambda deck: lambda: _hand(deck))(cls()),
+    }
+
+    print(f"{'benchmark':<18} {'Deck (us)':>10} {'ArrayDeck (us)':>15} {'speedup':>8}")
+    for name, make in benchmarks.items():
+        times = [min(timeit.repeat(make(cls), number=args.number, repeat=3)) / args.number * 1e6 for cls in (Deck, ArrayDeck)]
+        print(f"{name:<18} {times[0]:>10.2f} {times[1]:>15.2f} {times[0] / times[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
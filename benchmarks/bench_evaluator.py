@@ -0,0 +1,40 @@
+"""
+Compares the lookup table evaluator with the naive evaluator that ranks every
+five card combination of a hand.
+
+Run from the repository root with ``python -m benchmarks.bench_evaluator``.
+"""
+import argparse
+import random
+import time
+
+from src.game import evaluator
+
+
+def _rate(func, hands: list) -> float:
+    start = time.perf_counter()
+    for hand in hands:
+        func(hand)
+    return len(hands) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hands", type=int, default=200_000, help="hands per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    naive_hands = max(args.hands // 100, 1)
+    print(f"{'cards':>5} {'lookup (hands/s)':>18} {'naive (hands/s)':>18} {'speedup':>8}")
+    for num_cards in (5, 6, 7):
+        indices = [rng.sample(range(evaluator.NUM_CARDS), num_cards) for _ in range(args.hands)]
+        hands = [[evaluator.decode(i) for i in hand] for hand in indices[:naive_hands]]
+
+        lookup = _rate(evaluator.evaluate_indices, indices)
+        naive = _rate(evaluator.evaluate_naive, hands)
+        print(f"{num_cards:>5} {lookup:>18,.0f} {naive:>18,.0f} {lookup / naive:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
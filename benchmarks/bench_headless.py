@@ -0,0 +1,49 @@
+"""
+Measures how many complete hands per second the headless engine plays.
+
+Run from the repository root with ``python -m benchmarks.bench_headless``.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.game import headless
+from src.game.history import HandHistoryWriter
+from src.game.strategies import random_strategy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hands", type=int, default=20_000, help="hands to play")
+    parser.add_argument("--players", type=int, default=6, help="players per table")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history", action="store_true", help="also record a binary hand history")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "hands.bin")
+        writer = HandHistoryWriter(path) if args.history else None
+        played = 0
+        start = time.perf_counter()
+        while played < args.hands:
+            # Tables are replaced when players run out of money
+            env = headless.create_table(
+                {f"Bot {i}": random_strategy(rng) for i in range(args.players)},
+                starting_score=1_000_000,
+                history=writer,
+                seed=rng.getrandbits(64)
+            )
+            played += headless.play_hands(env, args.hands - played)
+        if writer is not None:
+            writer.close()
+        elapsed = time.perf_counter() - start
+        print(f"{played} hands with {args.players} players in {elapsed:.2f}s: {played / elapsed:,.0f} hands/s")
+        if writer is not None:
+            print(f"History: {os.path.getsize(path) / played:.1f} bytes/hand")
+
+
+if __name__ == "__main__":
+    main()
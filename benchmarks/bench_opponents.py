@@ -0,0 +1,49 @@
+"""
+Measures updating the ``OpponentModel`` and scoring players in one batch
+against scoring them one by one.
+
+Run from the repository root with ``python -m benchmarks.bench_opponents``.
+"""
+import argparse
+import random
+import timeit
+
+import numpy as np
+
+from src.game import history
+from src.game.opponents import OpponentModel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=10_000, help="known players")
+    parser.add_argument("--batch", type=int, default=6_000, help="players scored per call, e.g. 1000 tables of 6")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    model = OpponentModel()
+    names = [f"Player {i}" for i in range(args.players)]
+    actions = (history.FOLD, history.CHECK, history.CALL, history.RAISE)
+    observations = [(rng.choice(names), rng.randrange(4), rng.choice(actions)) for _ in range(200_000)]
+
+    number = len(observations)
+    elapsed = timeit.timeit(lambda: [model.observe(*observation) for observation in observations], number=1)
+    print(f"observe: {elapsed / number * 1e9:.0f} ns per action")
+
+    rows = np.array([rng.randrange(args.players) for _ in range(args.batch)])
+    streets = np.array([rng.randrange(4) for _ in range(args.batch)])
+    facing = np.array([rng.random() < 0.5 for _ in range(args.batch)])
+
+    batched = min(timeit.repeat(lambda: model.action_probabilities(rows, streets, facing), number=10, repeat=3)) / 10
+    single = min(timeit.repeat(
+        lambda: [model.action_probabilities(rows[i:i + 1], streets[i:i + 1], facing[i:i + 1]) for i in range(len(rows))],
+        number=1, repeat=3))
+    print(f"action probabilities of {args.batch} players: batched {batched * 1e3:.2f} ms, one by one {single * 1e3:.1f} ms "
+          f"({single / batched:.0f}x)")
+    features = min(timeit.repeat(lambda: model.features(rows), number=10, repeat=3)) / 10
+    print(f"features of {args.batch} players: {features * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Load test of the asyncio table server with simulated clients.
+
+Starts a ``TableServer`` on localhost and connects enough clients to fill
+the requested number of tables. Every client answers each decision right
+away, so the measured action latency (from the server asking for a move to
+receiving it) is the overhead of the server, the connection and the event
+loop under load. Clients and server share one process and event loop.
+
+Run from the repository root with ``python -m benchmarks.bench_server``.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import statistics
+import time
+
+from src.game import server
+
+
+async def client(port: int, name: str, websocket: bool, rng: random.Random) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if websocket:
+        key = base64.b64encode(os.urandom(16))
+        writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Key: " + key + b"\r\nSec-WebSocket-Version: 13\r\n\r\n")
+        while await reader.readline() not in (b"\r\n", b""):
+            pass
+
+    def send(message: dict) -> None:
+        data = json.dumps(message).encode()
+        writer.write(server.encode_frame(data, mask=os.urandom(4)) if websocket else data + b"\n")
+
+    async def receive() -> dict:
+        if websocket:
+            return json.loads((await server.read_frame(reader))[2])
+        line = await reader.readline()
+        return json.loads(line) if line else {"type": "closed"}
+
+    send({"type": "join", "name": name})
+    while (message := await receive())["type"] != "closed":
+        if message["type"] == "decision":
+            actions = message["actions"]
+            roll = rng.random()
+            if "RAISE" in actions and roll < 0.1:
+                send({"id": message["id"], "action": "RAISE", "amount": message["min_raise"]})
+            elif "CALL" in actions:
+                send({"id": message["id"], "action": "FOLD" if roll > 0.9 else "CALL"})
+            else:
+                send({"id": message["id"], "action": "CHECK"})
+    writer.close()
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=1000, method="inclusive")[int(q * 10) - 1]
+
+
+async def run(args: argparse.Namespace) -> None:
+    table_server = server.TableServer(
+        players_per_table=args.players,
+        hands_per_table=args.hands,
+        action_timeout=args.timeout,
+        starting_score=1_000_000,
+    )
+    port = await table_server.start()
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    clients = [
+        asyncio.create_task(client(port, f"Client {i}", args.websocket, rng))
+        for i in range(args.tables * args.players)
+    ]
+    await asyncio.gather(*clients)
+    await table_server.wait_tables()
+    elapsed = time.perf_counter() - start
+    await table_server.close()
+
+    latencies = [latency * 1000 for latency in table_server.action_latencies]
+    hands = sum(table.hands_played for table in table_server.tables)
+    transport = "WebSocket" if args.websocket else "TCP"
+    print(f"{len(table_server.tables)} tables, {len(clients)} {transport} clients: {hands} hands in {elapsed:.2f}s "
+          f"({hands / elapsed:,.0f} hands/s, {len(latencies) / elapsed:,.0f} actions/s)")
+    print(f"Action latency (ms): p50 {percentile(latencies, 50):.2f}  p90 {percentile(latencies, 90):.2f}  "
+          f"p99 {percentile(latencies, 99):.2f}  max {max(latencies):.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tables", type=int, default=200, help="concurrent tables")
+    parser.add_argument("--players", type=int, default=3, help="clients per table")
+    parser.add_argument("--hands", type=int, default=20, help="hands per table")
+    parser.add_argument("--timeout", type=float, default=server.DEFAULT_ACTION_TIMEOUT, help="action timeout in seconds")
+    parser.add_argument("--websocket", action="store_true", help="connect over WebSocket instead of plain TCP")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures how long a fresh process takes until it has played its first hand.
+
+Every run starts a new interpreter, like the CLI and the worker processes of a
+tournament do, and reports the interpreter start-up, the import of the headless
+engine and the first hand. ``--budget-ms`` makes the benchmark fail when the
+median import time exceeds the budget, e.g. in CI.
+
+Run from the repository root with ``python -m benchmarks.bench_startup``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = 150
+
+_CHILD = """
+import time
+start = time.perf_counter()
+from src.game import headless
+from src.game.strategies import passive_strategy
+imported = time.perf_counter()
+env = headless.create_table({"Alice": passive_strategy, "Bob": passive_strategy}, seed=0)
+headless.play_hands(env, 1)
+played = time.perf_counter()
+import json, sys
+print(json.dumps({"import": imported - start, "first_hand": played - imported, "modules": len(sys.modules)}))
+"""
+
+
+def _run(code: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh processes to start")
+    parser.add_argument("--budget-ms", type=float, default=None, help=f"fail when the median import takes longer, e.g. {IMPORT_BUDGET_MS}")
+    args = parser.parse_args()
+
+    baseline = statistics.median(_run("pass")[0] for _ in range(args.runs))
+    totals, imports, first_hands = [], [], []
+    for _ in range(args.runs):
+        total, output = _run(_CHILD)
+        result = json.loads(output)
+        totals.append(total)
+        imports.append(result["import"])
+        first_hands.append(result["first_hand"])
+
+    import_ms = statistics.median(imports) * 1e3
+    print(f"Interpreter:     {baseline * 1e3:7.1f} ms")
+    print(f"Import:          {import_ms:7.1f} ms ({result['modules']} modules loaded)")
+    print(f"First hand:      {statistics.median(first_hands) * 1e3:7.1f} ms")
+    print(f"Process to hand: {statistics.median(totals) * 1e3:7.1f} ms")
+    if args.budget_ms is not None and import_ms > args.budget_ms:
+        print(f"[E] Import took {import_ms:.1f} ms, the budget is {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Benchmark suite of the engine's hot paths with regression tracking.
+
+``run`` times every microbenchmark in several samples and stores the samples
+as JSON together with the commit they were measured on. Benchmarks marked
+with ``memory`` also record the peak memory traced by ``tracemalloc`` while
+the benchmark runs once. ``compare`` reads two result files and flags a
+benchmark as a regression when it got slower by more than a threshold and a
+permutation test on the samples says the difference is not noise. It exits
+with status 1 if there is any regression, so it can gate a CI job.
+
+Run from the repository root with ``python -m benchmarks.suite run`` and
+``python -m benchmarks.suite compare base.json new.json``.
+"""
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from src.game import batch, equity, evaluator, headless, pots, range_equity
+from src.game.card import Card, Suit, Value
+from src.game.deck import ArrayDeck, Deck
+from src.game.events import NULL
+from src.game.game import Game
+from src.game.player import Player
+from src.game.stats import StatsStore
+from src.game.strategies import random_strategy
+
+RESULTS_DIRECTORY = Path(__file__).parent / "results"
+FORMAT_VERSION = 1
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Returns the function to time, called once per sample so every sample starts from a fresh state
+    setup: Callable[[], Callable[[], object]]
+    # Calls per sample
+    number: int
+    # Whether to record the peak memory of one call
+    memory: bool = False
+
+
+class Comparison(NamedTuple):
+    name: str
+    base_us: float
+    new_us: float
+    # new / base, > 1 is slower
+    ratio: float
+    p_value: float
+    regression: bool
+
+
+# region benchmarks
+def _deck_hand(deck_class: type) -> Callable[[], Callable[[], object]]:
+    def setup():
+        deck = deck_class(seed=0)
+        draw = deck.draw
+
+        def hand():
+            # 6 players: 12 hole cards, 3 burns and 5 board cards
+            deck.reset()
+            for _ in range(20):
+                draw()
+        return hand
+    return setup
+
+
+def _deck_method(deck_class: type, method: str) -> Callable[[], Callable[[], object]]:
+    def setup():
+        deck = deck_class(seed=0)
+        deck.reset()
+        return getattr(deck, method)
+    return setup
+
+
+def _card_construction():
+    values = [(value, suit) for value in Value for suit in Suit]
+
+    def construct():
+        for value, suit in values:
+            Card(value, suit)
+    return construct
+
+
+def _card_formatting():
+    cards = [Card.from_index(i) for i in range(evaluator.NUM_CARDS)]
+
+    def format_cards():
+        for card in cards:
+            str(card)
+    return format_cards
+
+
+def _table(num_players: int = 6, seed: int = 0, stats: StatsStore = None):
+    rng = random.Random(seed)
+    return headless.create_table(
+        {f"Bot {i}": random_strategy(random.Random(rng.getrandbits(64))) for i in range(num_players)},
+        starting_score=10_000_000,
+        seed=seed,
+        stats=stats
+    )
+
+
+def _ring_traversal():
+    env = _table()
+    seating = env.seating
+
+    def traverse():
+        # One lap in position order, the seat lookups of a betting round and a blind move
+        for _ in env._players():
+            pass
+        for position in range(len(seating)):
+            seating.player_at(position)
+        seating.rotate()
+    return traverse
+
+
+def _game_blinds():
+    game = Game(events=NULL)
+    for i in range(6):
+        game.add_player(Player(f"Player {i}", events=NULL))
+
+    def post_blinds():
+        game._set_blinds()
+        game.small_blind_index += 1
+    return post_blinds
+
+
+def _full_hand():
+    env = _table()
+    return env.start_game
+
+
+def _decision_table():
+    """A six player table paused at the first decision of a hand."""
+    env = _table()
+    next(env.play_hand())
+    return env
+
+
+def _snapshot():
+    return _decision_table().snapshot
+
+
+def _restore():
+    env = _decision_table()
+    snapshot = env.snapshot()
+    return lambda: env.restore(snapshot)
+
+
+def _legal_query():
+    betting = _decision_table().betting
+
+    def query():
+        # What a bot asks before deciding
+        return betting.legal_actions, betting.is_legal("RAISE", betting.min_raise), betting.max_raise
+    return query
+
+
+def _deepcopy():
+    # What a search had to do without snapshots
+    env = _decision_table()
+    return lambda: copy.deepcopy(env)
+
+
+def _settle():
+    rng = random.Random(0)
+    hands = []
+    for _ in range(64):
+        contributions = [rng.choice((0, 10, 20, 50, 100, 400)) for _ in range(6)]
+        folded = [rng.random() < 0.3 for _ in range(6)]
+        folded[contributions.index(max(contributions))] = False
+        hands.append((contributions, folded, [rng.randrange(1000) for _ in range(6)]))
+
+    def settle():
+        for contributions, folded, strengths in hands:
+            pots.settle(contributions, folded, strengths)
+    return settle
+
+
+def _evaluate_7():
+    rng = random.Random(0)
+    hands = [rng.sample(range(evaluator.NUM_CARDS), 7) for _ in range(256)]
+    evaluate = evaluator.evaluate_indices
+
+    def evaluate_hands():
+        for hand in hands:
+            evaluate(hand)
+    return evaluate_hands
+
+
+def _evaluate_batch():
+    hands = np.random.default_rng(0).random((4096, evaluator.NUM_CARDS)).argsort(axis=1)[:, :7]
+    return lambda: equity.evaluate_batch(hands)
+
+
+def _range_query():
+    # A flop query against a broadway range once the flop table is cached
+    board = [Card.from_index(i) for i in (48, 33, 10)]
+    hero = [Card.from_index(51), Card.from_index(47)]
+    weights = range_equity.range_weights([(Card.from_index(a), Card.from_index(b)) for a in range(32, 52) for b in range(a + 1, 52)])
+    range_equity.hand_vs_range(hero, board, weights)
+    return lambda: range_equity.hand_vs_range(hero, board, weights)
+
+
+def _stats_flush():
+    # The recorded events of 100 hands, added to the columns again on every call
+    store = StatsStore(batch_size=1 << 30)
+    headless.play_hands(_table(stats=store), 100)
+    buffers = [(buffer, buffer[:]) for buffer in (store._action_keys, store._action_chips, store._hand_ids, store._hand_flags, store._hand_won)]
+
+    def flush():
+        for buffer, recorded in buffers:
+            buffer.extend(recorded)
+        store.flush()
+    return flush
+
+
+def _batch_step():
+    env = batch.BatchEnvironment(1024, 6, seed=0)
+    env.reset()
+    # Everybody calls, so every hand is played to the showdown
+    actions = np.full(env.num_tables, batch.CALL)
+    return lambda: env.step(actions)
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark("deck.construct", lambda: Deck, 2_000, memory=True),
+    Benchmark("deck.reset", _deck_method(Deck, "reset"), 2_000),
+    Benchmark("deck.shuffle", _deck_method(Deck, "shuffle"), 2_000),
+    Benchmark("deck.hand", _deck_hand(Deck), 2_000),
+    Benchmark("array_deck.construct", lambda: ArrayDeck, 2_000, memory=True),
+    Benchmark("array_deck.reset", _deck_method(ArrayDeck, "reset"), 20_000),
+    Benchmark("array_deck.hand", _deck_hand(ArrayDeck), 10_000),
+    Benchmark("card.construct_52", _card_construction, 2_000),
+    Benchmark("card.format_52", _card_formatting, 2_000),
+    Benchmark("environment.ring_traversal", _ring_traversal, 10_000),
+    Benchmark("game.blinds", _game_blinds, 2_000),
+    Benchmark("environment.full_hand_6", _full_hand, 200, memory=True),
+    Benchmark("environment.snapshot_6", _snapshot, 20_000),
+    Benchmark("environment.restore_6", _restore, 20_000),
+    Benchmark("environment.deepcopy_6", _deepcopy, 200),
+    Benchmark("betting.legal_query", _legal_query, 200_000),
+    Benchmark("pots.settle_64", _settle, 200),
+    Benchmark("evaluator.evaluate_7_256", _evaluate_7, 200),
+    Benchmark("equity.evaluate_batch_4096", _evaluate_batch, 20, memory=True),
+    Benchmark("range_equity.flop_query", _range_query, 500),
+    Benchmark("batch.step_1024x6", _batch_step, 50, memory=True),
+    Benchmark("stats.flush_100", _stats_flush, 500),
+]
+# endregion
+
+
+# region running
+def measure(benchmark: Benchmark, repeat: int) -> dict:
+    """Times ``repeat`` samples of the benchmark, the result holds the time per call of every sample."""
+    samples = []
+    for _ in range(repeat):
+        func = benchmark.setup()
+        samples.append(timeit.timeit(func, number=benchmark.number) / benchmark.number * 1e6)
+    result = {
+        "number": benchmark.number,
+        "samples_us": samples,
+        "median_us": statistics.median(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+    if benchmark.memory:
+        func = benchmark.setup()
+        tracemalloc.start()
+        func()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(names: list[str] = None, repeat: int = 15, verbose: bool = False) -> dict:
+    """Runs the benchmarks whose name starts with one of ``names`` (all if None)."""
+    results = {
+        "version": FORMAT_VERSION,
+        "commit": _commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    for benchmark in BENCHMARKS:
+        if names and not any(benchmark.name.startswith(name) for name in names):
+            continue
+        result = measure(benchmark, repeat)
+        results["benchmarks"][benchmark.name] = result
+        if verbose:
+            memory = f"  peak {result['peak_bytes'] / 1024:,.1f} KiB" if "peak_bytes" in result else ""
+            print(f"{benchmark.name:<30} {result['median_us']:>12.3f} us  ±{result['stdev_us']:>9.3f}{memory}")
+    return results
+# endregion
+
+
+# region comparing
+def permutation_test(base: list[float], new: list[float], permutations: int = 10_000, seed: int = 0) -> float:
+    """One sided p-value that ``new`` is not slower than ``base``, from a permutation test on the difference of the medians."""
+    samples = np.asarray(base + new, dtype=np.float64)
+    observed = np.median(new) - np.median(base)
+    rng = np.random.default_rng(seed)
+    shuffled = np.argsort(rng.random((permutations, len(samples))), axis=1)
+    permuted = samples[shuffled]
+    differences = np.median(permuted[:, len(base):], axis=1) - np.median(permuted[:, :len(base)], axis=1)
+    return float((np.count_nonzero(differences >= observed) + 1) / (permutations + 1))
+
+
+def compare(base: dict, new: dict, threshold: float = 0.05, alpha: float = 0.01) -> list[Comparison]:
+    """
+    Compares the benchmarks both results have. A benchmark regressed if its median
+    got slower by more than ``threshold`` (relative) and the permutation test gives a
+    p-value below ``alpha``.
+    """
+    comparisons = []
+    for name, new_result in new["benchmarks"].items():
+        base_result = base["benchmarks"].get(name)
+        if base_result is None:
+            continue
+        base_us, new_us = base_result["median_us"], new_result["median_us"]
+        ratio = new_us / base_us
+        p_value = permutation_test(base_result["samples_us"], new_result["samples_us"])
+        comparisons.append(Comparison(name, base_us, new_us, ratio, p_value, ratio > 1 + threshold and p_value < alpha))
+    return comparisons
+# endregion
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and store the results as JSON")
+    run_parser.add_argument("names", nargs="*", help="only run benchmarks whose name starts with one of these")
+    run_parser.add_argument("--repeat", type=int, default=15, help="samples per benchmark")
+    run_parser.add_argument("--output", type=Path, help=f"result file, {RESULTS_DIRECTORY.name}/<commit>.json by default")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("base", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.05, help="relative slowdown to tolerate")
+    compare_parser.add_argument("--alpha", type=float, default=0.01, help="significance level")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.names, args.repeat, verbose=True)
+        output = args.output if args.output is not None else RESULTS_DIRECTORY / f"{results['commit']}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        print(f"[i] Written to {output}")
+        return
+
+    base, new = (json.loads(path.read_text()) for path in (args.base, args.new))
+    comparisons = compare(base, new, args.threshold, args.alpha)
+    print(f"{'benchmark':<30} {base['commit']:>12} {new['commit']:>12} {'change':>8} {'p':>7}")
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.regression else ""
+        print(f"{comparison.name:<30} {comparison.base_us:>10.3f}us {comparison.new_us:>10.3f}us "
+              f"{comparison.ratio - 1:>+8.1%} {comparison.p_value:>7.4f}{flag}")
+    if any(comparison.regression for comparison in comparisons):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
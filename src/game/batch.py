@@ -0,0 +1,273 @@
+"""
+Many tables played in lockstep on NumPy arrays.
+
+``BatchEnvironment`` holds ``num_tables`` tables with the same number of
+players as arrays: the shuffled decks, stacks, bets, contributions, folded
+and all-in flags and the betting state of every table. ``step`` takes one
+action per table for the player whose turn it is and advances every table
+at once, finished hands are settled and a new hand is dealt right away, so
+every step returns an observation of a player who has to decide, like a
+Gym vector environment.
+
+The betting, side pots and payouts follow ``Environment`` exactly (see
+``test_batch.py`` for the differential tests), with two simplifications
+suited to training: every hand starts with the same stacks, and the players
+are indexed by position, so player 0 always posts the small blind.
+
+Actions are ``FOLD``, ``CALL`` (checks when there is nothing to call) and
+``RAISE`` by ``MIN_BET`` or the given amount. Raising when it is not legal
+raises a ``ValueError`` like ``Player.apply_move`` does; ``legal`` in the
+step info masks the legal actions.
+"""
+import numpy as np
+
+from . import betting, evaluator, game_rules
+from .equity import evaluate_batch
+
+FOLD = 0
+CALL = 1
+RAISE = 2
+NUM_ACTIONS = 3
+
+NUM_STREETS = 4
+RIVER = NUM_STREETS - 1
+# Board cards known on every street
+_BOARD_SIZES = np.array([0, 3, 4, 5])
+
+
+class BatchEnvironment():
+    def __init__(self, num_tables: int, num_players: int = 2, starting_score: int = 1000, seed: int = None) -> None:
+        if not 2 <= num_players <= game_rules.MAX_PLAYERS:
+            raise ValueError(f"[E] Tables need between 2 and {game_rules.MAX_PLAYERS} players.")
+        if starting_score <= game_rules.BIG_BLIND:
+            raise ValueError("[E] Starting score must be more than the big blind.")
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.starting_score = starting_score
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_tables, num_players)
+        self.deck = np.zeros((num_tables, evaluator.NUM_CARDS), dtype=np.int64)
+        self.stacks = np.zeros(shape, dtype=np.int64)
+        self.bets = np.zeros(shape, dtype=np.int64)
+        self.contributions = np.zeros(shape, dtype=np.int64)
+        self.folded = np.zeros(shape, dtype=bool)
+        self.all_in = np.zeros(shape, dtype=bool)
+
+        # Betting state like the locals of ``Environment._betting_round``
+        self.street = np.zeros(num_tables, dtype=np.int64)
+        self.position = np.zeros(num_tables, dtype=np.int64)    # Grows by one per seat passed, the seat is position % players
+        self.current_bet = np.zeros(num_tables, dtype=np.int64)
+        self.times_raised = np.zeros(num_tables, dtype=np.int64)
+        self.in_hand = np.zeros(num_tables, dtype=np.int64)
+        self.acting = np.zeros(num_tables, dtype=np.int64)      # In the hand and not all in
+        self.to_act = np.zeros(num_tables, dtype=np.int64)
+
+        self.hands_played = 0
+        self._rows = np.arange(num_tables)
+        # Deck positions of the cards in the order the ``Environment`` draws them: one hole card
+        # for every player, the second one for every player, then burn and flop, burn and turn, burn and river
+        self._hole_slots = np.stack([np.arange(num_players), num_players + np.arange(num_players)], axis=1)
+        board = 2 * num_players
+        self._board_slots = np.array([board + 1, board + 2, board + 3, board + 5, board + 7])
+        self.observation_size = 2 * evaluator.NUM_CARDS + NUM_STREETS + 6 * num_players + 3
+
+    # region api
+    def reset(self) -> tuple[np.ndarray, dict]:
+        """Deals a new hand at every table, returns the observations and info like ``step``."""
+        self._new_hands(self._rows)
+        finished = self._advance(self._rows)
+        if len(finished) > 0:
+            raise ValueError(f"[E] Hands ended before the first decision at tables {finished}.")
+        return self.observe(), self._info(np.zeros((self.num_tables, self.num_players), dtype=np.int64))
+
+    def step(self, actions: np.ndarray, amounts: np.ndarray = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Plays one action at every table and moves on to the next decision.
+
+        Returns the observations of the next players to act, the chips every
+        player won or lost at tables whose hand ended (shape (tables, players),
+        0 elsewhere), which tables finished a hand and an info dict with the
+        ``player`` to act, the ``legal`` action mask and the ``payouts``. Finished
+        tables already show the first decision of their next hand.
+        """
+        rows = self._rows
+        actions = np.asarray(actions)
+        amounts = np.full(self.num_tables, game_rules.MIN_BET, dtype=np.int64) if amounts is None else np.asarray(amounts, dtype=np.int64)
+        seat = self.position % self.num_players
+        stack = self.stacks[rows, seat]
+        bet = self.bets[rows, seat]
+        to_call = self.current_bet - bet
+
+        folding = actions == FOLD
+        calling = actions == CALL
+        raising = actions == RAISE
+        if not (folding | calling | raising).all():
+            raise ValueError(f"[E] Invalid actions at tables {np.flatnonzero(~(folding | calling | raising))}")
+        illegal = raising & ~self._can_raise(stack, to_call)
+        illegal |= raising & ((amounts < game_rules.MIN_BET) | (amounts > betting.max_raise(stack, to_call)))
+        if illegal.any():
+            raise ValueError(f"[E] Invalid raises at tables {np.flatnonzero(illegal)}")
+
+        paid = np.where(raising, to_call + amounts, np.where(calling, np.minimum(to_call, stack), 0))
+        self.stacks[rows, seat] -= paid
+        self.bets[rows, seat] += paid
+        self.contributions[rows, seat] += paid
+
+        self.folded[rows[folding], seat[folding]] = True
+        self.in_hand -= folding
+        self.acting -= folding
+        self.current_bet = np.where(raising, bet + paid, self.current_bet)
+        self.times_raised += raising
+        self.to_act = np.where(raising, self.acting - 1, self.to_act - 1)
+        went_all_in = ~folding & (self.stacks[rows, seat] == 0)
+        self.all_in[rows, seat] |= went_all_in
+        self.acting -= went_all_in
+        self.position += 1
+
+        payouts = np.zeros((self.num_tables, self.num_players), dtype=np.int64)
+        rewards = np.zeros((self.num_tables, self.num_players), dtype=np.float32)
+        done = np.zeros(self.num_tables, dtype=bool)
+        finished = self._advance(rows)
+        while len(finished):
+            payouts[finished] = self._settle(finished)
+            rewards[finished] = payouts[finished] - self.contributions[finished]
+            done[finished] = True
+            self.hands_played += len(finished)
+            self._new_hands(finished)
+            finished = self._advance(finished)
+        return self.observe(), rewards, done, self._info(payouts)
+
+    def legal_actions(self) -> np.ndarray:
+        """Mask of the legal actions of the players to act, shape (tables, NUM_ACTIONS)."""
+        seat = self.position % self.num_players
+        stack = self.stacks[self._rows, seat]
+        to_call = self.current_bet - self.bets[self._rows, seat]
+        legal = np.ones((self.num_tables, NUM_ACTIONS), dtype=bool)
+        legal[:, RAISE] = self._can_raise(stack, to_call)
+        return legal
+
+    def observe(self) -> np.ndarray:
+        """
+        Observations of the players to act as float32 rows: hole cards and board
+        one-hot over the 52 card indices, the street one-hot, the position one-hot,
+        the stacks, bets and contributions of all players in units of the starting
+        score, their folded and all-in flags, the amount to call, whether raising is
+        allowed and the raises on the street.
+        """
+        n, p = self.num_tables, self.num_players
+        rows = self._rows
+        seat = self.position % p
+        scale = 1 / self.starting_score
+        obs = np.zeros((n, self.observation_size), dtype=np.float32)
+
+        obs[rows[:, None], self.deck[rows[:, None], self._hole_slots[seat]]] = 1
+        board = self.deck[:, self._board_slots]
+        obs[rows[:, None], evaluator.NUM_CARDS + board] = np.arange(5) < _BOARD_SIZES[self.street][:, None]
+        offset = 2 * evaluator.NUM_CARDS
+        obs[rows, offset + self.street] = 1
+        offset += NUM_STREETS
+        obs[rows, offset + seat] = 1
+        offset += p
+        for values in (self.stacks * scale, self.bets * scale, self.contributions * scale, self.folded, self.all_in):
+            obs[:, offset:offset + p] = values
+            offset += p
+        to_call = self.current_bet - self.bets[rows, seat]
+        obs[:, offset] = to_call * scale
+        obs[:, offset + 1] = self._can_raise(self.stacks[rows, seat], to_call)
+        obs[:, offset + 2] = self.times_raised / game_rules.MAX_TIMES_RAISABLE_PER_ROUND
+        return obs
+    # endregion
+
+    # region hands
+    def _can_raise(self, stack: np.ndarray, to_call: np.ndarray) -> np.ndarray:
+        # Like ``BettingRound``, a raise must leave the player with money
+        return (self.times_raised < game_rules.MAX_TIMES_RAISABLE_PER_ROUND) & (betting.max_raise(stack, to_call) >= game_rules.MIN_BET)
+
+    def _info(self, payouts: np.ndarray) -> dict:
+        return {"player": self.position % self.num_players, "legal": self.legal_actions(), "payouts": payouts}
+
+    def _new_hands(self, tables: np.ndarray) -> None:
+        """Shuffles, deals and posts the blinds at the given tables."""
+        self.deck[tables] = np.argsort(self.rng.random((len(tables), evaluator.NUM_CARDS)), axis=1)
+        self.stacks[tables] = self.starting_score
+        self.bets[tables] = 0
+        self.folded[tables] = False
+        self.all_in[tables] = False
+        for seat, blind in ((0, game_rules.SMALL_BLIND), (1, game_rules.BIG_BLIND)):
+            self.stacks[tables, seat] -= blind
+            self.bets[tables, seat] = blind
+        self.contributions[tables] = self.bets[tables]
+
+        self.street[tables] = 0
+        # The player after the big blind opens
+        self.position[tables] = 2
+        self.current_bet[tables] = game_rules.BIG_BLIND
+        self.times_raised[tables] = 0
+        self.in_hand[tables] = self.num_players
+        self.acting[tables] = self.num_players
+        self.to_act[tables] = self.num_players
+
+    def _advance(self, tables: np.ndarray) -> np.ndarray:
+        """
+        Moves the given tables on to the next player who has to decide, skipping
+        folded and all-in players and ending betting rounds. Returns the tables
+        whose hand is over.
+        """
+        finished = []
+        pending = tables
+        while len(pending):
+            seat = self.position[pending] % self.num_players
+            in_round = (self.to_act[pending] > 0) & (self.in_hand[pending] > 1)
+            skip = in_round & (self.folded[pending, seat] | self.all_in[pending, seat])
+            # Nobody left to bet against
+            closed = in_round & ~skip & (self.acting[pending] < 2) & (self.bets[pending, seat] >= self.current_bet[pending])
+            self.position[pending[skip]] += 1
+
+            ended = pending[~in_round | closed]
+            next_round = ended
+            if len(ended):
+                self.bets[ended] = 0
+                self.current_bet[ended] = 0
+                over = (self.street[ended] == RIVER) | (self.in_hand[ended] < 2)
+                finished.append(ended[over])
+                next_round = ended[~over]
+                self.street[next_round] += 1
+                self.position[next_round] = 0
+                self.times_raised[next_round] = 0
+                self.acting[next_round] = self.in_hand[next_round] - self.all_in[next_round].sum(axis=1)
+                self.to_act[next_round] = self.acting[next_round]
+            pending = np.concatenate([pending[skip], next_round])
+        return np.concatenate(finished) if finished else np.zeros(0, dtype=np.int64)
+
+    def _settle(self, tables: np.ndarray) -> np.ndarray:
+        """Payouts of the finished hands at the given tables, like ``pots.settle`` with the positions as tie breaker."""
+        p = self.num_players
+        contributions = self.contributions[tables]
+        folded = self.folded[tables]
+        hole = self.deck[tables[:, None], self._hole_slots.reshape(-1)].reshape(len(tables), p, 2)
+        board = np.broadcast_to(self.deck[tables][:, None, self._board_slots], (len(tables), p, 5))
+        strengths = evaluate_batch(np.concatenate([hole, board], axis=2).reshape(-1, 7)).reshape(len(tables), p)
+        strengths = np.where(folded, -1, strengths)
+
+        # Every player still in the hand caps a pot at their contribution, the last one takes everything above
+        levels = np.sort(np.where(folded, np.iinfo(np.int64).max, contributions), axis=1)
+        num_contenders = p - folded.sum(axis=1)
+        payouts = np.zeros_like(contributions)
+        previous = np.zeros(len(tables), dtype=np.int64)
+        for k in range(p):
+            active = k < num_contenders
+            level = np.where(active, levels[:, k], previous)
+            cap = np.where(k == num_contenders - 1, np.iinfo(np.int64).max, level)
+            amount = (np.minimum(contributions, cap[:, None]) - np.minimum(contributions, previous[:, None])).sum(axis=1)
+            previous = level
+
+            eligible = ~folded & (contributions >= level[:, None])
+            best = np.where(eligible, strengths, -1).max(axis=1)
+            winners = eligible & (strengths == best[:, None]) & active[:, None]
+            num_winners = np.maximum(winners.sum(axis=1), 1)
+            share, odd_chips = np.divmod(amount, num_winners)
+            # Odd chips go to the winners closest to the small blind
+            payouts += winners * share[:, None] + (winners & (np.cumsum(winners, axis=1) <= odd_chips[:, None]))
+        return payouts
+    # endregion
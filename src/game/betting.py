@@ -0,0 +1,160 @@
+"""
+Betting round state machine shared by all four streets.
+
+A ``BettingRound`` follows one street of betting at a ``Seating``: whose turn
+it is, the bet to match, the raises so far and when the round is over. The
+players able to act (neither folded nor all in) form a ring of seats that
+players unlink from when they fold or go all in, and counters keep track of
+how many of them still have to act. Passing the turn on and noticing the end
+of the round therefore never walks around the table.
+
+What the player to act may do is worked out once when the turn passes to
+them and looked up in a table of the legal action sets, so ``to_call``,
+``can_raise``, ``min_raise``, ``max_raise`` and ``legal_actions`` are plain
+attributes and ``is_legal`` is a couple of comparisons. Raises follow
+``game_rules``: at most ``MAX_TIMES_RAISABLE_PER_ROUND`` per round, by at
+least ``MIN_BET`` and never with all of a player's money, as a balance of 0
+means being out of the game.
+"""
+from typing import TYPE_CHECKING
+
+from . import game_rules
+
+if TYPE_CHECKING:
+    from .seating import Seating
+
+FOLD = "FOLD"
+CHECK = "CHECK"
+CALL = "CALL"
+RAISE = "RAISE"
+
+# Indexed by 2 * facing a bet + may raise, the tuples are shared by every decision
+_LEGAL_ACTIONS = (
+    (CHECK, FOLD),
+    (CHECK, RAISE, FOLD),
+    (CALL, FOLD),
+    (CALL, RAISE, FOLD),
+)
+NO_SEAT = -1
+
+
+def legal_actions(to_call: int, can_raise: bool) -> tuple[str, ...]:
+    return _LEGAL_ACTIONS[2 * (to_call > 0) + can_raise]
+
+
+def max_raise(stack: int, to_call: int) -> int:
+    """The most a player may raise by after calling, a raise must leave the player with money."""
+    return stack - to_call - 1
+
+
+class BettingRound():
+    __slots__ = (
+        "seating", "current_bet", "times_raised", "in_hand", "acting", "to_act", "complete",
+        "seat", "to_call", "can_raise", "min_raise", "max_raise", "legal_actions",
+        "_stacks", "_bets", "_next", "_previous",
+    )
+
+    def __init__(
+            self,
+            seating: "Seating",
+            first_position: int,
+            current_bet: int,
+            times_raised: int = 0,
+            to_act: int = None
+            ) -> None:
+        """
+        Starts a round in which the first player able to act from ``first_position``
+        (0 = small blind) opens. ``times_raised`` and ``to_act`` continue a round
+        that was interrupted at that player, e.g. by a snapshot.
+        """
+        self.seating = seating
+        self.current_bet = current_bet
+        self.times_raised = times_raised
+        self.min_raise = game_rules.MIN_BET
+        self._stacks = seating.stacks
+        self._bets = seating.bets
+
+        folded, all_in = seating.folded, seating.all_in
+        order = seating.order
+        start = (seating.button + first_position) % len(order)
+        ring = [seat for seat in order[start:] + order[:start] if not folded[seat] and not all_in[seat]]
+        self._next = following = [NO_SEAT] * seating.max_seats
+        self._previous = previous = [NO_SEAT] * seating.max_seats
+        last = ring[-1] if ring else NO_SEAT
+        for seat in ring:
+            following[last] = seat
+            previous[seat] = last
+            last = seat
+
+        self.in_hand = seating.num_active
+        self.acting = len(ring)
+        self.to_act = to_act if to_act is not None else self.acting
+        self.complete = False
+        self._turn(ring[0] if ring else NO_SEAT)
+
+    @property
+    def position(self) -> int:
+        """Position of the player to act relative to the small blind."""
+        order = self.seating.order
+        return (order.index(self.seat) - self.seating.button) % len(order)
+
+    def is_legal(self, action: str, amount: int = 0) -> bool:
+        """Whether the player to act may make a move, ``amount`` is what a raise raises by."""
+        if action not in self.legal_actions:
+            return False
+        return action != RAISE or (isinstance(amount, int) and self.min_raise <= amount <= self.max_raise)
+
+    def record(self, folded: bool = False) -> None:
+        """
+        Passes the turn on once the move of the player to act is in the seating's
+        arrays. A bet above the current bet is a raise, any other one a call or check.
+        """
+        seat = self.seat
+        following = self._next[seat]
+        if folded:
+            self.in_hand -= 1
+            self.acting -= 1
+            self.to_act -= 1
+            self._unlink(seat)
+        else:
+            bet = self._bets[seat]
+            if bet > self.current_bet:
+                # Everybody else has to act again
+                self.current_bet = bet
+                self.times_raised += 1
+                self.to_act = self.acting - 1
+            else:
+                self.to_act -= 1
+            if self._stacks[seat] == 0:
+                self.seating.all_in[seat] = 1
+                self.acting -= 1
+                self._unlink(seat)
+        self._turn(following)
+
+    def _turn(self, seat: int) -> None:
+        """Gives the turn to a seat and works out its options, or ends the round."""
+        bets = self._bets
+        # A player who is the only one left to act does not get to bet against the all-in players, only to call
+        if self.to_act <= 0 or self.in_hand < 2 or (self.acting < 2 and bets[seat] >= self.current_bet):
+            self.complete = True
+            self.seat = NO_SEAT
+            self.to_call = 0
+            self.can_raise = False
+            self.max_raise = 0
+            self.legal_actions = ()
+            return
+
+        to_call = self.current_bet - bets[seat]
+        most = max_raise(self._stacks[seat], to_call)
+        can_raise = self.times_raised < game_rules.MAX_TIMES_RAISABLE_PER_ROUND and most >= self.min_raise
+        self.seat = seat
+        self.to_call = to_call
+        self.can_raise = can_raise
+        self.max_raise = most if can_raise else 0
+        self.legal_actions = _LEGAL_ACTIONS[2 * (to_call > 0) + can_raise]
+
+    def _unlink(self, seat: int) -> None:
+        following = self._next[seat]
+        previous = self._previous[seat]
+        self._next[previous] = following
+        self._previous[following] = previous
@@ -0,0 +1,131 @@
+"""
+Bounded least recently used cache for expensive queries.
+
+Equity tables, equity estimates and strategy lookups are keyed by the
+canonical form of the situation (see ``isomorphism``) and kept in an
+``LruCache``. A cache is bounded by the memory of its values and
+optionally by the number of entries, and evicts the entries used least
+recently first.
+
+Every cache registers under its name, ``stats`` reports the hits, misses,
+evictions and memory of all of them, e.g. to size the caches for a
+simulation.
+"""
+import sys
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+DEFAULT_MAX_BYTES = 64 * 2 ** 20
+
+
+class CacheStats(NamedTuple):
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def sizeof(value: Any) -> int:
+    """Estimates the memory of a value, NumPy arrays by their buffers and tuples by their items."""
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LruCache():
+    def __init__(
+            self,
+            name: str,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_entries: int = None,
+            size: Callable[[Any], int] = sizeof
+            ) -> None:
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._size = size
+        # Key to value and its size in bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores a value, a value larger than the whole cache is not stored."""
+        size = self._size(value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes or (self.max_entries is not None and len(self._entries) > self.max_entries):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drops all entries, the statistics are kept."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.name, self.hits, self.misses, self.evictions, len(self._entries), self.bytes, self.max_bytes)
+
+
+_caches: dict[str, LruCache] = {}
+
+
+def stats() -> list[CacheStats]:
+    """The statistics of every cache created so far."""
+    return [cache.stats() for cache in _caches.values()]
+
+
+def summary() -> str:
+    lines = [f"{'cache':<20} {'entries':>9} {'MB':>8} {'hit rate':>9} {'hits':>10} {'misses':>10} {'evictions':>10}"]
+    for cache_stats in stats():
+        lines.append(
+            f"{cache_stats.name:<20} {cache_stats.entries:>9} {cache_stats.bytes / 2 ** 20:>8.1f} {cache_stats.hit_rate:>9.1%} "
+            f"{cache_stats.hits:>10} {cache_stats.misses:>10} {cache_stats.evictions:>10}"
+        )
+    return "\n".join(lines)
@@ -22,9 +22,68 @@ class Suit(Enum):
     SPADES = "♠️"
 
 class Card():
-    def __init__(self, value: Value, suit: Suit) -> None:
-        self.value: Value = value
-        self.suit: Suit = suit
-    
+    """
+    An immutable playing card.
+
+    There is exactly one instance per value and suit: ``Card(value, suit)`` returns
+    the canonical card, so cards can be compared by identity and used as dict keys
+    and set members without allocating. Value and suit can be given as enum members
+    or by name.
+
+    Every card has an ``index`` between 0 and 51 (``value * 4 + suit`` in the order of
+    the enums) and a bitmask ``mask == 1 << index``.
+    """
+    __slots__ = ("value", "suit", "index", "mask", "_str")
+
+    _interned: dict[tuple, "Card"] = {}
+    _by_index: list["Card"] = []
+
+    def __new__(cls, value: Value | str, suit: Suit | str) -> "Card":
+        try:
+            return cls._interned[value, suit]
+        except KeyError:
+            raise ValueError(f"[E] Invalid card {value} of {suit}") from None
+
+    @classmethod
+    def from_index(cls, index: int) -> "Card":
+        return cls._by_index[index]
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "Card":
+        # Exactly one of the 52 card bits has to be set
+        if not mask or mask & (mask - 1) or mask >> len(cls._by_index):
+            raise ValueError(f"[E] Invalid card mask {mask:#x}")
+        return cls._by_index[mask.bit_length() - 1]
+
+    @classmethod
+    def _create(cls, value: Value, suit: Suit, index: int) -> "Card":
+        card = object.__new__(cls)
+        object.__setattr__(card, "value", value)
+        object.__setattr__(card, "suit", suit)
+        object.__setattr__(card, "index", index)
+        object.__setattr__(card, "mask", 1 << index)
+        object.__setattr__(card, "_str", "|" + value.value + suit.value + "|")
+        return card
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Cards are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Cards are immutable")
+
+    def __reduce__(self):
+        # Unpickling returns the canonical card
+        return Card, (self.value, self.suit)
+
+    def __repr__(self) -> str:
+        return f"Card({self.value.name}, {self.suit.name})"
+
     def __str__(self) -> str:
-        return "|" + Value[self.value].value.__str__() + Suit[self.suit].value + "|"
\ No newline at end of file
+        return self._str
+
+for _value in Value:
+    for _suit in Suit:
+        _card = Card._create(_value, _suit, len(Card._by_index))
+        Card._by_index.append(_card)
+        Card._interned[_value, _suit] = _card
+        Card._interned[_value.name, _suit.name] = _card
@@ -0,0 +1,574 @@
+"""
+Counterfactual regret minimization for heads-up play.
+
+The betting tree follows ``game_rules``: the blinds, raises of ``MIN_BET``
+and at most ``MAX_TIMES_RAISABLE_PER_ROUND`` raises per street, with the
+small blind acting first on every street like in the ``Environment``. Stacks
+are assumed deep enough to never be all in.
+
+The abstraction keeps the regrets small and the lookups O(1):
+
+- cards are bucketed by equity against a random hand, from the preflop table
+  before the flop and from batched rollouts afterwards
+- an information set is the street, whether the player acts first or last,
+  the raises on the street, whether the player faces a bet and the bucket,
+  so ``infoset`` is plain arithmetic and the regrets and strategy sums are
+  flat NumPy arrays with one row per information set
+
+The solver runs external sampling MCCFR with regret matching+. Iterations
+can be spread over processes, every worker runs a share of the iterations
+on the current regrets and the updates are summed. Exploitability is
+measured with a vectorized best response over a fixed sample of deals.
+
+The average strategy is exported to a small binary file that ``CFRPlayer``
+memory-maps. Multiway tables are played with the heads-up strategy, using
+the equity against all opponents for the bucket and treating the player who
+closes the action as the one acting last.
+"""
+import argparse
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from . import evaluator, game_rules, isomorphism, preflop, seeding
+from .cache import LruCache
+from .equity import evaluate_batch
+from .events import EventBus
+from .player import Player
+
+# region abstraction
+FOLD = 0
+CALL = 1    # Checks when not facing a bet
+RAISE = 2
+NUM_ACTIONS = 3
+
+NUM_STREETS = 4
+NUM_POSITIONS = 2
+MAX_RAISES = game_rules.MAX_TIMES_RAISABLE_PER_ROUND
+NUM_SITUATIONS = NUM_STREETS * NUM_POSITIONS * (MAX_RAISES + 1) * 2
+
+DEFAULT_BUCKETS = 8
+DEFAULT_ROLLOUTS = 32
+DEFAULT_PATH = Path(__file__).parent / "data" / "cfr_strategy.bin"
+
+# Board cards known on every street
+_BOARD_SIZES = (0, 3, 4, 5)
+_BLOCKED = 2.0
+
+
+def situation(street: int, position: int, raises: int, facing_bet: bool) -> int:
+    """Index of a betting situation, ``position`` is 0 for the player acting first and 1 for the one acting last."""
+    return ((street * NUM_POSITIONS + position) * (MAX_RAISES + 1) + raises) * 2 + facing_bet
+
+
+def infoset(situation: int, bucket: int, num_buckets: int) -> int:
+    return situation * num_buckets + bucket
+
+
+def legal_actions(raises: int, facing_bet: bool) -> tuple[bool, bool, bool]:
+    """Legal abstract actions, folding without facing a bet is left out as it never gains anything."""
+    return facing_bet, True, raises < MAX_RAISES
+
+
+def to_bucket(equities: np.ndarray, num_buckets: int) -> np.ndarray:
+    return np.minimum((equities * num_buckets).astype(np.int64), num_buckets - 1)
+
+
+def preflop_equities(hole_cards: np.ndarray, num_opponents: int = 1) -> np.ndarray:
+    """Looks up the preflop equity of every row of hole cards (card indices)."""
+    ranks = hole_cards >> 2
+    high, low = ranks.max(axis=1), ranks.min(axis=1)
+    suited = (hole_cards[:, 0] & 3) == (hole_cards[:, 1] & 3)
+    hand_class = np.where(suited, high * preflop.NUM_RANKS + low, low * preflop.NUM_RANKS + high)
+    return np.asarray(preflop.default_table().table[hand_class, num_opponents - 1], dtype=np.float64)
+
+
+def rollout_equities(
+        hole_cards: np.ndarray,
+        board: np.ndarray,
+        rollouts: int,
+        rng: np.random.Generator,
+        num_opponents: int = 1
+        ) -> np.ndarray:
+    """Estimates the equity of every row of hole cards on its board against random hands with ``rollouts`` runouts each."""
+    num_hands, board_size = board.shape
+    known = np.repeat(np.concatenate([hole_cards, board], axis=1), rollouts, axis=0)
+    keys = rng.random((len(known), evaluator.NUM_CARDS))
+    np.put_along_axis(keys, known, _BLOCKED, axis=1)
+
+    needed = 5 - board_size + 2 * num_opponents
+    drawn = np.argpartition(keys, needed - 1, axis=1)[:, :needed]
+    drawn = np.take_along_axis(drawn, np.argsort(np.take_along_axis(keys, drawn, axis=1), axis=1), axis=1)
+    runout = np.concatenate([known[:, 2:], drawn[:, :5 - board_size]], axis=1)
+
+    strength = evaluate_batch(np.concatenate([known[:, :2], runout], axis=1))
+    best = np.zeros_like(strength)
+    for i in range(num_opponents):
+        opponent = drawn[:, 5 - board_size + 2 * i:7 - board_size + 2 * i]
+        best = np.maximum(best, evaluate_batch(np.concatenate([opponent, runout], axis=1)))
+    share = np.where(strength > best, 1.0, np.where(strength == best, 0.5, 0.0))
+    return share.reshape(num_hands, rollouts).mean(axis=1)
+
+
+class Deals(NamedTuple):
+    # Bucket of every player on every street, shape (deals, 2, NUM_STREETS)
+    buckets: np.ndarray
+    # 0 or 1 for the player winning the showdown, 2 for a tie
+    winners: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.winners)
+
+
+def deal(num_deals: int, num_buckets: int, rollouts: int, rng: np.random.Generator) -> Deals:
+    """Deals random heads-up hands and buckets them for every street."""
+    keys = rng.random((num_deals, evaluator.NUM_CARDS))
+    cards = np.argpartition(keys, 8, axis=1)[:, :9]
+    holes = (cards[:, 0:2], cards[:, 2:4])
+    board = cards[:, 4:9]
+
+    buckets = np.empty((num_deals, 2, NUM_STREETS), dtype=np.int64)
+    strengths = []
+    for player, hole in enumerate(holes):
+        buckets[:, player, 0] = to_bucket(preflop_equities(hole), num_buckets)
+        for street in range(1, NUM_STREETS):
+            equities = rollout_equities(hole, board[:, :_BOARD_SIZES[street]], rollouts, rng)
+            buckets[:, player, street] = to_bucket(equities, num_buckets)
+        strengths.append(evaluate_batch(np.concatenate([hole, board], axis=1)))
+    winners = np.where(strengths[0] > strengths[1], 0, np.where(strengths[1] > strengths[0], 1, 2))
+    return Deals(buckets, winners)
+# endregion
+
+
+# region betting tree
+DECISION = 0
+FOLDED = 1
+SHOWDOWN = 2
+
+
+class BettingTree():
+    """
+    The heads-up betting tree as flat lists indexed by node, node 0 is the first
+    decision before the flop. Player 0 is the small blind.
+    """
+    def __init__(self) -> None:
+        self.kind: list[int] = []
+        self.player: list[int] = []         # Player to act, the player who folded at FOLDED nodes
+        self.street: list[int] = []
+        self.situation: list[int] = []
+        self.children: list[tuple[int, int, int]] = []
+        self.bets: list[tuple[int, int]] = []
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def _node(self, kind: int, player: int, street: int, situation_index: int, bets: tuple[int, int]) -> int:
+        self.kind.append(kind)
+        self.player.append(player)
+        self.street.append(street)
+        self.situation.append(situation_index)
+        self.children.append((-1, -1, -1))
+        self.bets.append(bets)
+        return len(self.kind) - 1
+
+    def _build(self) -> None:
+        # node, street, player to act, raises, players still to act, bets
+        root = self._decision(0, 0, 0, (game_rules.SMALL_BLIND, game_rules.BIG_BLIND))
+        stack = [(root, 0, 0, 0, 2, (game_rules.SMALL_BLIND, game_rules.BIG_BLIND))]
+        while stack:
+            node, street, player, raises, to_act, bets = stack.pop()
+            facing_bet = bets[1 - player] > bets[player]
+            children = [-1, -1, -1]
+            if facing_bet:
+                children[FOLD] = self._node(FOLDED, player, street, -1, bets)
+
+            # Call or check
+            called = list(bets)
+            called[player] = bets[1 - player]
+            called = tuple(called)
+            if to_act > 1:
+                children[CALL] = self._decision(street, 1 - player, raises, called)
+                stack.append((children[CALL], street, 1 - player, raises, to_act - 1, called))
+            elif street + 1 < NUM_STREETS:
+                # The small blind opens every street
+                children[CALL] = self._decision(street + 1, 0, 0, called)
+                stack.append((children[CALL], street + 1, 0, 0, 2, called))
+            else:
+                children[CALL] = self._node(SHOWDOWN, -1, street, -1, called)
+
+            if raises < MAX_RAISES:
+                raised = list(called)
+                raised[player] += game_rules.MIN_BET
+                raised = tuple(raised)
+                children[RAISE] = self._decision(street, 1 - player, raises + 1, raised)
+                stack.append((children[RAISE], street, 1 - player, raises + 1, 1, raised))
+            self.children[node] = tuple(children)
+
+    def _decision(self, street: int, player: int, raises: int, bets: tuple[int, int]) -> int:
+        facing_bet = bets[1 - player] > bets[player]
+        return self._node(DECISION, player, street, situation(street, player, raises, facing_bet), bets)
+
+    def legal(self) -> np.ndarray:
+        """Legal actions of every situation, shape (NUM_SITUATIONS, NUM_ACTIONS)."""
+        legal = np.zeros((NUM_SITUATIONS, NUM_ACTIONS), dtype=bool)
+        for street in range(NUM_STREETS):
+            for position in range(NUM_POSITIONS):
+                for raises in range(MAX_RAISES + 1):
+                    for facing_bet in (False, True):
+                        legal[situation(street, position, raises, facing_bet)] = legal_actions(raises, facing_bet)
+        return legal
+# endregion
+
+
+# region solver
+class SolverReport(NamedTuple):
+    iterations: int
+    elapsed: float
+    iterations_per_second: float
+    # Chips per hand a best response wins against the average strategy, averaged over both seats
+    exploitability: float
+
+    @property
+    def milli_big_blinds(self) -> float:
+        return self.exploitability / game_rules.BIG_BLIND * 1000
+
+
+class Solver():
+    def __init__(self, num_buckets: int = DEFAULT_BUCKETS, rollouts: int = DEFAULT_ROLLOUTS) -> None:
+        self.num_buckets = num_buckets
+        self.rollouts = rollouts
+        self.tree = BettingTree()
+        self.legal = np.repeat(self.tree.legal(), num_buckets, axis=0)
+        self.num_infosets = NUM_SITUATIONS * num_buckets
+        self.regrets = np.zeros(self.num_infosets * NUM_ACTIONS)
+        self.strategy_sum = np.zeros(self.num_infosets * NUM_ACTIONS)
+        self.iterations = 0
+
+    # region iterations
+    def run(self, iterations: int, rng: np.random.Generator, batch_size: int = 256) -> None:
+        """Runs MCCFR iterations, each one traverses a sampled deal once for every player."""
+        draw = random.Random(int(rng.integers(1 << 62))).random
+        regrets = memoryview(self.regrets)
+        strategy_sum = memoryview(self.strategy_sum)
+        done = 0
+        while done < iterations:
+            deals = deal(min(batch_size, iterations - done), self.num_buckets, self.rollouts, rng)
+            for buckets, winner in zip(deals.buckets.tolist(), deals.winners.tolist()):
+                for traverser in (0, 1):
+                    self._traverse(0, traverser, buckets, winner, regrets, strategy_sum, draw)
+            done += len(deals)
+        self.iterations += iterations
+
+    def _traverse(self, node: int, traverser: int, buckets: list, winner: int, regrets: memoryview, strategy_sum: memoryview, draw) -> float:
+        tree = self.tree
+        kind = tree.kind[node]
+        if kind == FOLDED:
+            bets = tree.bets[node]
+            folder = tree.player[node]
+            return -bets[traverser] if folder == traverser else bets[1 - traverser]
+        if kind == SHOWDOWN:
+            if winner == 2:
+                return 0.0
+            bets = tree.bets[node]
+            return bets[1 - traverser] if winner == traverser else -bets[traverser]
+
+        player = tree.player[node]
+        children = tree.children[node]
+        base = (tree.situation[node] * self.num_buckets + buckets[player][tree.street[node]]) * NUM_ACTIONS
+
+        # Regret matching
+        positive = [max(regrets[base + a], 0.0) if children[a] >= 0 else 0.0 for a in range(NUM_ACTIONS)]
+        total = positive[0] + positive[1] + positive[2]
+        if total > 0:
+            sigma = [p / total for p in positive]
+        else:
+            num_legal = sum(1 for child in children if child >= 0)
+            sigma = [1.0 / num_legal if child >= 0 else 0.0 for child in children]
+
+        if player == traverser:
+            utilities = [0.0, 0.0, 0.0]
+            value = 0.0
+            for a in range(NUM_ACTIONS):
+                if children[a] >= 0:
+                    utilities[a] = self._traverse(children[a], traverser, buckets, winner, regrets, strategy_sum, draw)
+                    value += sigma[a] * utilities[a]
+            for a in range(NUM_ACTIONS):
+                if children[a] >= 0:
+                    # Regret matching+ never lets regrets go negative
+                    regrets[base + a] = max(regrets[base + a] + utilities[a] - value, 0.0)
+            return value
+
+        for a in range(NUM_ACTIONS):
+            strategy_sum[base + a] += sigma[a]
+        roll = draw()
+        for a in range(NUM_ACTIONS):
+            roll -= sigma[a]
+            if roll < 0 and children[a] >= 0:
+                break
+        else:
+            a = max(a for a in range(NUM_ACTIONS) if children[a] >= 0)
+        return self._traverse(children[a], traverser, buckets, winner, regrets, strategy_sum, draw)
+    # endregion
+
+    # region strategies
+    def average_strategy(self) -> np.ndarray:
+        """The average strategy, shape (infosets, NUM_ACTIONS), uniform over the legal actions of unvisited infosets."""
+        sums = self.strategy_sum.reshape(-1, NUM_ACTIONS) * self.legal
+        totals = sums.sum(axis=1, keepdims=True)
+        uniform = self.legal / self.legal.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, sums / np.where(totals > 0, totals, 1), uniform)
+
+    def exploitability(self, deals: Deals, strategy: np.ndarray = None) -> float:
+        """Chips per hand a best response wins on the given deals, averaged over both seats."""
+        strategy = strategy if strategy is not None else self.average_strategy()
+        return (self.best_response_value(deals, strategy, 0) + self.best_response_value(deals, strategy, 1)) / 2
+
+    def best_response_value(self, deals: Deals, strategy: np.ndarray, player: int) -> float:
+        """Value of the best response of ``player`` against ``strategy`` in the abstract game, over the given deals."""
+        tree = self.tree
+        opponent = 1 - player
+        buckets = deals.buckets
+        num_deals = len(deals)
+        num_buckets = self.num_buckets
+
+        # Reach probability of the opponent at every decision of the player
+        reach: dict[int, np.ndarray] = {}
+        by_situation: dict[int, list[int]] = {}
+        stack = [(0, np.ones(num_deals))]
+        while stack:
+            node, node_reach = stack.pop()
+            if tree.kind[node] != DECISION:
+                continue
+            children = tree.children[node]
+            if tree.player[node] == player:
+                reach[node] = node_reach
+                by_situation.setdefault(tree.situation[node], []).append(node)
+                stack.extend((child, node_reach) for child in children if child >= 0)
+            else:
+                probabilities = strategy[tree.situation[node] * num_buckets + buckets[:, opponent, tree.street[node]]]
+                stack.extend((child, node_reach * probabilities[:, a]) for a, child in enumerate(children) if child >= 0)
+
+        values: dict[int, np.ndarray] = {}
+
+        def choose(situation_index: int) -> None:
+            """Picks the best action of every bucket in a situation across all nodes it occurs at."""
+            nodes = by_situation[situation_index]
+            totals = np.zeros((num_buckets, NUM_ACTIONS))
+            action_values = {}
+            for node in nodes:
+                node_buckets = buckets[:, player, tree.street[node]]
+                action_values[node] = q = np.zeros((num_deals, NUM_ACTIONS))
+                for a, child in enumerate(tree.children[node]):
+                    if child >= 0:
+                        q[:, a] = value(child)
+                        totals[:, a] += np.bincount(node_buckets, weights=reach[node] * q[:, a], minlength=num_buckets)
+            totals[:, ~self.legal[situation_index * num_buckets]] = -np.inf
+            choice = totals.argmax(axis=1)
+            for node in nodes:
+                values[node] = action_values[node][np.arange(num_deals), choice[buckets[:, player, tree.street[node]]]]
+
+        def value(node: int) -> np.ndarray:
+            kind = tree.kind[node]
+            bets = tree.bets[node]
+            if kind == FOLDED:
+                return np.full(num_deals, -bets[player] if tree.player[node] == player else bets[opponent], dtype=np.float64)
+            if kind == SHOWDOWN:
+                return np.where(deals.winners == player, bets[opponent], np.where(deals.winners == 2, 0, -bets[player])).astype(np.float64)
+            if tree.player[node] == player:
+                if node not in values:
+                    choose(tree.situation[node])
+                return values.pop(node)
+            probabilities = strategy[tree.situation[node] * num_buckets + buckets[:, opponent, tree.street[node]]]
+            return sum(probabilities[:, a] * value(child) for a, child in enumerate(tree.children[node]) if child >= 0)
+
+        return float(value(0).mean())
+    # endregion
+
+
+def _run_worker(task: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Runs a share of the iterations on a copy of the regrets and returns the regret and strategy updates."""
+    regrets, iterations, seed, num_buckets, rollouts = task
+    solver = Solver(num_buckets, rollouts)
+    solver.regrets[:] = regrets
+    solver.run(iterations, np.random.default_rng(seed))
+    return solver.regrets - regrets, solver.strategy_sum
+
+
+def solve(
+        iterations: int,
+        num_buckets: int = DEFAULT_BUCKETS,
+        workers: int = 1,
+        report_every: int = 1000,
+        rollouts: int = DEFAULT_ROLLOUTS,
+        eval_deals: int = 2000,
+        seed: int = 0,
+        verbose: bool = False
+        ) -> tuple[Solver, list[SolverReport]]:
+    """
+    Runs ``iterations`` MCCFR iterations and reports the speed and the
+    exploitability on a fixed sample of ``eval_deals`` deals every ``report_every``
+    iterations. With more than one worker the iterations between two reports are
+    split over a process pool and their updates are summed.
+    """
+    # Every worker of every round runs on a stream of its own
+    seeds = seeding.seed_sequence(seed)
+    rng, evaluation_rng = (np.random.default_rng(child) for child in seeds.spawn(2))
+    solver = Solver(num_buckets, rollouts)
+    evaluation = deal(eval_deals, num_buckets, rollouts, evaluation_rng)
+    reports: list[SolverReport] = []
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        elapsed = 0.0
+        while solver.iterations < iterations:
+            chunk = min(report_every, iterations - solver.iterations)
+            start = time.perf_counter()
+            if pool is None:
+                solver.run(chunk, rng)
+            else:
+                shares = [chunk // workers + (1 if i < chunk % workers else 0) for i in range(workers)]
+                tasks = [
+                    (solver.regrets, share, worker_seed, num_buckets, rollouts)
+                    for share, worker_seed in zip(shares, seeding.spawn_seeds(seeds, workers)) if share
+                ]
+                for regret_update, strategy_sum in pool.map(_run_worker, tasks):
+                    solver.regrets += regret_update
+                    solver.strategy_sum += strategy_sum
+                np.maximum(solver.regrets, 0, out=solver.regrets)
+                solver.iterations += chunk
+            elapsed += time.perf_counter() - start
+
+            report = SolverReport(solver.iterations, elapsed, solver.iterations / elapsed, solver.exploitability(evaluation))
+            reports.append(report)
+            if verbose:
+                print(f"[i] {report.iterations:>8} iterations, {report.iterations_per_second:,.0f} it/s, "
+                      f"exploitability {report.milli_big_blinds:,.0f} mbb/hand")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return solver, reports
+# endregion
+
+
+# region strategy file
+_MAGIC = b"CFRS"
+_VERSION = 1
+# magic, version, buckets, raises per street, actions, min bet, big blind
+_HEADER = struct.Struct("<4sHHHHHH")
+
+
+def write_strategy(strategy: np.ndarray, num_buckets: int, path: Path = DEFAULT_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, num_buckets, MAX_RAISES, NUM_ACTIONS, game_rules.MIN_BET, game_rules.BIG_BLIND))
+        file.write(np.ascontiguousarray(strategy, dtype="<f2").tobytes())
+
+
+class StrategyTable():
+    """Read only, memory-mapped view of a strategy file with one row of action probabilities per infoset."""
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        with open(path, "rb") as file:
+            magic, version, num_buckets, max_raises, num_actions, min_bet, big_blind = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or num_actions != NUM_ACTIONS:
+            raise ValueError(f"[E] {path} is not a strategy file.")
+        if (max_raises, min_bet, big_blind) != (MAX_RAISES, game_rules.MIN_BET, game_rules.BIG_BLIND):
+            raise ValueError(f"[E] {path} was solved for different game rules.")
+        self.num_buckets: int = num_buckets
+        self.table = np.memmap(path, dtype="<f2", mode="r", offset=_HEADER.size, shape=(NUM_SITUATIONS * num_buckets, NUM_ACTIONS))
+
+    def probabilities(self, street: int, position: int, raises: int, facing_bet: bool, bucket: int) -> np.ndarray:
+        return self.table[infoset(situation(street, position, raises, facing_bet), bucket, self.num_buckets)]
+# endregion
+
+
+# region player
+# Streets by the number of cards a player sees
+_STREET_BY_CARDS = {2: 0, 5: 1, 6: 2, 7: 3}
+
+
+# Buckets of postflop situations, shared by all players as the rollouts dominate a decision
+_buckets = LruCache("cfr.buckets", max_bytes=16 * 2 ** 20)
+
+
+class CFRPlayer(Player):
+    """A player following the average strategy of a solved ``StrategyTable``."""
+    def __init__(
+            self,
+            name: str = None,
+            table: StrategyTable = None,
+            events: EventBus = None,
+            rng: random.Random = None,
+            rollouts: int = 256
+            ) -> None:
+        super().__init__(name, strategy=self._decide, events=events)
+        self.table = table if table is not None else StrategyTable()
+        self.rng = rng if rng is not None else random.Random()
+        self._np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.rollouts = rollouts
+        self._bucket_key = None
+        self._bucket = 0
+
+    def _decide(self, player: Player, prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+        street = _STREET_BY_CARDS[self.hand_state.num_cards]
+        seating = self._seating
+        position = seating.position_of(self) if seating is not None else 0
+        num_players = len(seating) if seating is not None else 2
+        acts_last = position == 1 if street == 0 else position == num_players - 1
+        num_opponents = max(seating.num_active - 1, 1) if seating is not None else 1
+
+        base = game_rules.BIG_BLIND if street == 0 else 0
+        raises = min(max((self.bet_this_round + prev_raise - base) // game_rules.MIN_BET, 0), MAX_RAISES)
+        facing_bet = prev_raise > 0
+
+        probabilities = self.table.probabilities(street, int(acts_last), raises, facing_bet, self._current_bucket(num_opponents))
+        action = self.rng.choices(range(NUM_ACTIONS), weights=np.asarray(probabilities, dtype=np.float64))[0]
+        if action == RAISE and can_re_raise:
+            return "RAISE", game_rules.MIN_BET
+        if action == FOLD and facing_bet:
+            return "FOLD", 0
+        return ("CALL", 0) if facing_bet else ("CHECK", 0)
+
+    def _current_bucket(self, num_opponents: int) -> int:
+        """The equity bucket of the hand, computed once per street."""
+        key = (self.hand_state.card_mask, num_opponents)
+        if key != self._bucket_key:
+            hole = np.array([[card.index for card in self.cards]])
+            if self.hand_state.num_cards == 2:
+                equities = preflop_equities(hole, min(num_opponents, preflop.MAX_OPPONENTS))
+                self._bucket = int(to_bucket(equities, self.table.num_buckets)[0])
+            else:
+                board_mask = self.hand_state.card_mask & ~(self.cards[0].mask | self.cards[1].mask)
+                board = [i for i in range(evaluator.NUM_CARDS) if board_mask >> i & 1]
+                situation = (isomorphism.canonical_index(hole[0].tolist(), board), num_opponents, self.table.num_buckets, self.rollouts)
+                self._bucket = _buckets.get_or_compute(situation, lambda: self._rollout_bucket(hole, board, num_opponents))
+            self._bucket_key = key
+        return self._bucket
+
+    def _rollout_bucket(self, hole: np.ndarray, board: list[int], num_opponents: int) -> int:
+        equities = rollout_equities(hole, np.array([board]), self.rollouts, self._np_rng, num_opponents)
+        return int(to_bucket(equities, self.table.num_buckets)[0])
+# endregion
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solves the abstracted heads-up game with MCCFR and writes the strategy file.")
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report-every", type=int, default=5_000)
+    parser.add_argument("--rollouts", type=int, default=DEFAULT_ROLLOUTS, help="runouts per equity estimate of a bucket")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    solver, _ = solve(args.iterations, args.buckets, args.workers, args.report_every, args.rollouts, seed=args.seed, verbose=True)
+    write_strategy(solver.average_strategy(), args.buckets, args.path)
+    print(f"[i] Written to {args.path}")
@@ -1,14 +1,21 @@
 import random
+from array import array
 from .card import Card, Suit, Value
 from . import gui
 
 class Deck():
-    def __init__(self) -> None:
-        self._cards: list[Card] = [Card(value.name, suit.name) for value in Value for suit in Suit]
+    # Shared by all decks, ``Value`` by ``Suit`` order is the order of the card indices
+    _cards: list[Card] = [Card(value, suit) for value in Value for suit in Suit]
+
+    def __init__(self, seed: int = None) -> None:
         self.cards: list[Card] = self._cards.copy()
+        self.rng = random.Random(seed)
+
+    def seed(self, seed: int) -> None:
+        self.rng.seed(seed)
         
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
         
     def draw(self, num: int  = 0) -> Card:
         return self.cards.pop(num)
@@ -16,6 +23,14 @@ class Deck():
     def reset(self) -> None:
         self.cards = self._cards.copy()
         self.shuffle()
+
+    def snapshot(self) -> bytes:
+        """The indices of the remaining cards from the top."""
+        return bytes(card.index for card in self.cards)
+
+    def restore(self, state: bytes) -> None:
+        """Puts back the remaining cards of a ``snapshot``, shuffle afterwards to deal other cards."""
+        self.cards = [Card.from_index(i) for i in state]
     
     def __str__(self) -> str:
         title = "DECK OVERVIEW"
@@ -23,4 +38,98 @@ class Deck():
         for card in self.cards:
             string += card.__str__() + "\n"
         string += gui.DIVIDER
-            
\ No newline at end of file
+            
+
+
+class ArrayDeck():
+    """
+    Drop-in replacement for ``Deck`` that never allocates while playing.
+
+    The deck is a preallocated array of the 52 card indices (see ``evaluator.encode``)
+    with a cursor pointing at the top card. Shuffling is lazy: every draw performs
+    one Fisher-Yates step on the remaining cards, so only as many cards are shuffled
+    as are actually dealt. Each deck has its own seedable generator, a reset
+    starts from the sorted deck again so the cards only depend on the seed.
+    """
+    _cards: list[Card] = [Card.from_index(i) for i in range(52)]
+    _sorted = array("B", range(52))
+
+    def __init__(self, seed: int = None) -> None:
+        self.rng = random.Random(seed)
+        self._random = self.rng.random
+        self._order = array("B", range(len(self._cards)))
+        self._cursor = 0
+        # Cards in front of this position are in their final (shuffled) order
+        self._shuffled = len(self._order)
+
+    def seed(self, seed: int) -> None:
+        self.rng.seed(seed)
+
+    @property
+    def cards(self) -> list[Card]:
+        """The remaining cards from the top of the deck."""
+        self._shuffle_until(len(self._order))
+        return [self._cards[i] for i in self._order[self._cursor:]]
+
+    def __len__(self) -> int:
+        return len(self._order) - self._cursor
+
+    def shuffle(self) -> None:
+        self._shuffled = self._cursor
+
+    def draw(self, num: int = 0) -> Card:
+        if num:
+            return self._draw_below_top(num)
+
+        # Fast path: one Fisher-Yates step for the top card if it is not shuffled yet
+        i = self._cursor
+        order = self._order
+        if i >= self._shuffled:
+            j = i + int(self._random() * (len(order) - i))
+            order[i], order[j] = order[j], order[i]
+            self._shuffled = i + 1
+        self._cursor = i + 1
+        return self._cards[order[i]]
+
+    def _draw_below_top(self, num: int) -> Card:
+        position = self._cursor + num
+        if position >= len(self._order):
+            raise IndexError("draw from empty deck")
+        self._shuffle_until(position + 1)
+
+        # Keep the order of the cards above the drawn one, like list.pop(num)
+        order = self._order
+        card = order[position]
+        order[self._cursor + 1:position + 1] = order[self._cursor:position]
+        self._cursor += 1
+        return self._cards[card]
+
+    def reset(self) -> None:
+        self._order[:] = self._sorted
+        self._cursor = 0
+        self.shuffle()
+
+    def snapshot(self) -> bytes:
+        """
+        The cursor followed by the order of all 52 cards.
+
+        The remaining cards are shuffled first, taking the same random numbers
+        the next draws would have taken. Restoring therefore deals exactly the
+        cards the deck would have dealt, shuffle after ``restore`` for others.
+        """
+        self._shuffle_until(len(self._order))
+        return bytes((self._cursor,)) + self._order.tobytes()
+
+    def restore(self, state: bytes) -> None:
+        self._cursor = state[0]
+        memoryview(self._order)[:] = state[1:]
+        self._shuffled = len(self._order)
+
+    def _shuffle_until(self, end: int) -> None:
+        order = self._order
+        size = len(order)
+        for i in range(self._shuffled, end):
+            j = i + int(self._random() * (size - i))
+            order[i], order[j] = order[j], order[i]
+        if end > self._shuffled:
+            self._shuffled = end
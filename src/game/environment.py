@@ -1,122 +1,366 @@
-from .player import Player
+import random
+import struct
+from typing import TYPE_CHECKING, Generator, Iterator, NamedTuple
+
+from .player import Player, InsufficientMoneyError, OutOfMoneyError
 from .deck import Deck
 from .card import Card
+from . import events as ev
+from .events import CONSOLE, NULL, EventBus
+from .seating import Seating
+from .betting import BettingRound
+from .strategies import Strategy
+from . import evaluator
+from . import pots
+from . import history as hand_history
 from . import game_rules
+from . import profiling
+
+if TYPE_CHECKING:
+    from .stats import StatsStore
+
+class NotEnoughPlayersError(ValueError):
+    pass
+
+class Decision(NamedTuple):
+    """A point in a hand where a player has to decide, answered with a strategy's ``(action, amount)``."""
+    player: Player
+    prev_raise: int
+    can_re_raise: bool
+
+Hand = Generator[Decision, tuple[str, int], None]
+
+class TableSnapshot(NamedTuple):
+    """
+    The complete state of a table, see ``Environment.snapshot``.
+
+    ``state`` is an immutable buffer whose size only depends on the number of
+    seats, the deck state is padded to a fixed width, so a snapshot is shared
+    by any number of restores without copying.
+    """
+    state: bytes
+    players: tuple[Player, ...]
+
+# Pot, current bet, hand seed, action position, street, raises, players left to act, betting round under way, hand seed set
+_SNAPSHOT = struct.Struct("<qqQqBBB??")
+# Size of the deck section, a length byte followed by the largest deck state (``ArrayDeck``'s cursor and order)
+_DECK_SIZE = 1 + 1 + 52
+# money_earned, money_lost, times_folded, times_raised, times_checked, times_called of every seat
+_STATS = struct.Struct("<6q")
+_NO_CARD = 0xFF
 
 class Environment():
     min_players = 2
-    
-    @property 
+
+    @property
     def table_cards(self) -> list[Card]:
-        return self.the_flop + [self.turn_card] + [self.the_river]
-    
-    def __init__(self) -> None:
-        self.deck: Deck = Deck()
+        return self.the_flop + [card for card in (self.turn_card, self.the_river) if card is not None]
+
+    def __init__(
+            self,
+            events: EventBus = None,
+            deck: Deck = None,
+            history: "hand_history.HandHistoryWriter" = None,
+            seed: int = None,
+            profiler: "profiling.HandProfiler" = None,
+            stats: "StatsStore" = None
+            ) -> None:
+        # The table's own bus, its events are forwarded to the given one
+        self.events: EventBus = EventBus(parent=events if events is not None else CONSOLE)
+        self.history: hand_history.HandHistoryWriter = history
+        if history is not None:
+            self.events.subscribe(history.on_event, ev.DEBUG, hand_history.RECORDED_EVENTS)
+        # Counts the players' actions from the same events
+        self.stats: StatsStore = stats
+        if stats is not None:
+            self.events.subscribe(stats.on_event, ev.DEBUG, hand_history.RECORDED_EVENTS)
+        self.deck: Deck = deck if deck is not None else Deck()
+        # Draws the seed the deck is shuffled with before every hand
+        self.rng = random.Random(seed)
+        self.hand_seed: int = None
+        # Times the phases of every hand if set
+        self.profiler: profiling.HandProfiler = profiler
         self.the_flop: list[Card] = []
         self.turn_card: Card = None
         self.the_river: Card = None
 
-        self.small_blind: Player = None
-        self.big_blind: Player = None
+        self.seating: Seating = Seating()
         self.current_player: Player =  None
-        
+        self.street: int = hand_history.PRE_FLOP
+
         self.pot: int = 0
         self.current_bet: int = 0
         self.starting_score: int = 100
-    
+
+        # The betting round under way, None between rounds
+        self.betting: BettingRound = None
+
+    @property
+    def small_blind(self) -> Player:
+        return self.seating.small_blind
+
+    @property
+    def big_blind(self) -> Player:
+        return self.seating.big_blind
+
+    @property
+    def num_players(self) -> int:
+        return len(self.seating)
+
     # region player handling
     def add_player(self, player: Player) -> None:
-        if self.small_blind is None:
-            self.small_blind = player
-            player.next_player = player
-            player.prev_player = player
-        elif self.big_blind is None:
-            self.big_blind = player
-            player.prev_player = self.small_blind
-            player.next_player = self.small_blind
-            self.small_blind.next_player = player
-            self.small_blind.prev_player = player
-        else:
-            next_player = self.big_blind
-
-            while next_player.next_player != self.small_blind:
-                next_player = next_player.next_player
-            
-            next_player.next_player = player
-            player.prev_player = next_player
-            player.next_player = self.small_blind
-            self.small_blind.prev_player = player
+        self.seating.sit(player)
         player._money = self.starting_score
-        print(f"[P] {player.name} added to the game")
+        self.events.emit(ev.PLAYER, ev.INFO, "[P] {} added to the game", player.name)
 
         # Print order
-        p = self.small_blind.next_player
-        order = self.small_blind.name
-        while p != self.small_blind:
-            order += " -> " + p.name
-            p = p.next_player
-        print(f"[O] Current order: {order}")
-    
+        if self.events.enabled(ev.INFO):
+            self.events.emit(ev.PLAYER, ev.INFO, "[O] Current order: {}", ' -> '.join(p.name for p in self._players()))
+
     def remove_player(self, player: Player) -> None:
-        if player == self.small_blind:
-            self.small_blind = player.next_player
-            self.big_blind = self.small_blind.next_player
-        if player == self.big_blind:
-            self.big_blind = player.prev_player
-        
-        player.prev_player.next_player = player.next_player
-        player.next_player.prev_player = player.prev_player
+        # The next player takes over the seat's position, e.g. becomes the new small blind
+        self._muck(player)
+        self.seating.leave(player)
     # endregion
 
-    # region game
-    def start_game(self) -> None:
-        if self.small_blind is None or self.big_blind is None:
-            raise ValueError("Not enough players to start game")
-        
-        self._reset()
+    # region game
+    def start_game(self, seed: int = None) -> None:
+        """
+        Plays one hand from dealing the cards to the showdown.
+
+        Afterwards the blinds move on by one seat, so calling this repeatedly plays
+        a session of consecutive hands. Every player decides through their strategy.
+        The deck is shuffled with the given seed, by default with the next seed of
+        the table's generator.
+        """
+        self._drive(self.play_hand(seed))
+
+    def _drive(self, hand: Hand) -> None:
+        profiler = self.profiler
+        try:
+            decision = next(hand)
+            if profiler is None:
+                while True:
+                    player = decision.player
+                    decision = hand.send(player.strategy(player, decision.prev_raise, decision.can_re_raise))
+            while True:
+                player = decision.player
+                start = profiler.start()
+                move = player.strategy(player, decision.prev_raise, decision.can_re_raise)
+                profiler.decision(player.name, start)
+                decision = hand.send(move)
+        except StopIteration:
+            pass
+
+    def play_hand(self, seed: int = None) -> Hand:
+        """
+        Plays one hand like ``start_game`` but leaves the decisions to the caller.
+
+        The hand pauses at every ``Decision`` it yields and continues once the
+        ``(action, amount)`` of the player is sent back, so a hand can wait for
+        players without blocking, e.g. in an event loop.
+        """
+        if self.num_players < self.min_players:
+            raise NotEnoughPlayersError("Not enough players to start game")
+
+        profiler = self.profiler
+        if profiler is not None:
+            hand_start = start = profiler.start()
+        self._reset(seed)
         self._deal_cards()
-        
+        if self.events.enabled(ev.DEBUG):
+            players = list(self._players())
+            self.events.emit(ev.HAND_START, ev.DEBUG, "[H] Hand of {0}", players, [p.money for p in players], self.hand_seed)
+        if profiler is not None:
+            start = profiler.lap(profiling.DEAL, start)
+
         self._place_blinds()
-        self.pre_flop_round()
-        #self.deck.draw() # Burn a card
-        #self.flop_round()
-        #self.deck.draw() # Burn a card
-        #self.turn_round()
-        #self.deck.draw() # Burn a card
-        #self.river_round()
-        #self.deck.draw() # Burn a card
-        #self.showdown_round()
-        
-        # Print players scores
-        print(self._player_overview()) 
-    
-    def _reset(self) -> None:
-        # Reset pot and bets
+        if profiler is not None:
+            profiler.lap(profiling.BLINDS, start)
+        yield from self._play_streets(hand_history.PRE_FLOP)
+        self._finish_hand()
+        if profiler is not None:
+            profiler.lap(profiling.HAND, hand_start, exclusive=False)
+
+    def resume_hand(self) -> Hand:
+        """
+        Continues a hand put back with ``restore`` like ``play_hand``, starting with
+        the decision the snapshot was taken at.
+        """
+        if self.betting is None:
+            raise ValueError("[E] The snapshot was not taken at a decision.")
+        yield from self._play_streets(self.street, resume=True)
+        self._finish_hand()
+
+    def _play_streets(self, first_street: int, resume: bool = False) -> Hand:
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.start()
+        game_rounds = (self.pre_flop_round, self.flop_round, self.turn_round, self.river_round)
+        for street in range(first_street, len(game_rounds)):
+            if self._players_in_hand() < 2:
+                break
+            yield from self._continue_round() if resume else game_rounds[street]()
+            resume = False
+            if profiler is not None:
+                start = profiler.lap(profiling.STREETS[street], start)
+
+    def _finish_hand(self) -> None:
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.start()
+        self.showdown_round()
+        if profiler is not None:
+            start = profiler.lap(profiling.SHOWDOWN, start)
+        self.events.emit(ev.HAND_END, ev.DEBUG, "[H] Board {0}", self.table_cards)
+
+        # Print players scores
+        if self.events.enabled(ev.INFO):
+            self.events.emit(ev.OVERVIEW, ev.INFO, "{}", self._player_overview())
+        self._move_blinds()
+        self._remove_busted_players()
+        if profiler is not None:
+            profiler.lap(profiling.CLEANUP, start)
+
+    # region snapshots
+    def snapshot(self) -> TableSnapshot:
+        """
+        Captures the table between hands or at a decision: the seats, stacks, bets,
+        pot, board, hole cards, the order of the deck and whose turn it is.
+
+        Together with ``restore`` and ``rollout`` this lets a search try moves from
+        a decision and play them out many times without copying any objects. The
+        table's generator is not part of the snapshot, restoring puts back the
+        remaining cards in their order and ``deck.shuffle()`` deals other ones.
+        """
+        seating = self.seating
+        players = seating.players
+        betting = self.betting
+        holes = bytearray(b"\xff" * (2 * seating.max_seats))
+        stats = bytearray(_STATS.size * seating.max_seats)
+        for seat in seating.order:
+            player = players[seat]
+            for i, card in enumerate(player.cards):
+                holes[2 * seat + i] = card.index
+            _STATS.pack_into(
+                stats, _STATS.size * seat, player.money_earned, player.money_lost,
+                player.times_folded, player.times_raised, player.times_checked, player.times_called
+            )
+        deck = self.deck.snapshot()
+        state = b"".join((
+            _SNAPSHOT.pack(
+                self.pot, self.current_bet, self.hand_seed or 0, betting.position if betting is not None else 0,
+                self.street, betting.times_raised if betting is not None else 0,
+                betting.to_act if betting is not None else 0, betting is not None, self.hand_seed is not None
+            ),
+            seating.snapshot(),
+            holes,
+            bytes(card.index for card in self.table_cards).ljust(5, b"\xff"),
+            stats,
+            bytes((len(deck),)),
+            deck.ljust(_DECK_SIZE - 1, b"\xff"),
+        ))
+        return TableSnapshot(state, tuple(players))
+
+    def restore(self, snapshot: TableSnapshot) -> None:
+        """
+        Puts the table back into the state of a ``snapshot`` of this table.
+
+        A hand snapshotted at a decision continues with ``resume_hand`` or ``rollout``.
+        If the snapshot was taken by the strategy deciding, the hand that asked for
+        the decision continues as well once the snapshot is restored.
+        """
+        seating = self.seating
+        seats = seating.max_seats
+        state = memoryview(snapshot.state)
+        (self.pot, self.current_bet, hand_seed, position, self.street,
+         times_raised, to_act, in_round, seeded) = _SNAPSHOT.unpack_from(state)
+        self.hand_seed = hand_seed if seeded else None
+        offset = _SNAPSHOT.size
+        seating.restore(state[offset:offset + seating.snapshot_size], snapshot.players)
+        offset += seating.snapshot_size
+
+        holes = state[offset:offset + 2 * seats]
+        offset += 2 * seats
+        board = [Card.from_index(i) for i in state[offset:offset + 5] if i != _NO_CARD]
+        offset += 5
+        self.the_flop = board[:3]
+        self.turn_card = board[3] if len(board) > 3 else None
+        self.the_river = board[4] if len(board) > 4 else None
+
+        players = seating.players
+        for seat in seating.order:
+            player = players[seat]
+            player.cards = [Card.from_index(i) for i in holes[2 * seat:2 * seat + 2] if i != _NO_CARD]
+            hand_state = player.hand_state
+            hand_state.clear()
+            if player.cards:
+                for card in player.cards + board:
+                    hand_state.add_card(card)
+            (player.money_earned, player.money_lost, player.times_folded,
+             player.times_raised, player.times_checked, player.times_called) = _STATS.unpack_from(state, offset + _STATS.size * seat)
+        offset += _STATS.size * seats
+
+        self.deck.restore(state[offset + 1:offset + 1 + state[offset]])
+        self.betting = BettingRound(seating, position, self.current_bet, times_raised, to_act) if in_round else None
+        self.current_player = seating.player_at(position) if in_round else self.small_blind
+
+    def rollout(self, move: tuple[str, int] = None, strategy: Strategy = None) -> None:
+        """
+        Plays a hand put back with ``restore`` to the end without emitting events.
+
+        ``move`` answers the decision the snapshot was taken at, every other decision
+        is made by the given strategy or else by the players' own strategies.
+        """
+        events, profiler = self.events, self.profiler
+        self.events, self.profiler = NULL, None
+        # Players emit on their own buses, muted too and put back with the table's
+        players = [(player, player.events) for player in self._players()]
+        for player, _ in players:
+            player.events = NULL
+        hand = self.resume_hand()
+        try:
+            decision = next(hand)
+            if move is not None:
+                decision = hand.send(move)
+            while True:
+                player = decision.player
+                decide = strategy if strategy is not None else player.strategy
+                decision = hand.send(decide(player, decision.prev_raise, decision.can_re_raise))
+        except StopIteration:
+            pass
+        finally:
+            self.events, self.profiler = events, profiler
+            for player, player_events in players:
+                player.events = player_events
+    # endregion
+
+    def _reset(self, seed: int = None) -> None:
+        # Reset pot and bets
         self.pot = 0
         self.current_bet = 0
+        self.street = hand_history.PRE_FLOP
 
-        # Reset cards
+        # Reset cards, the seed alone decides the order of the deck
+        self.hand_seed = seed if seed is not None else self.rng.getrandbits(64)
+        self.deck.seed(self.hand_seed)
         self.deck.reset()
         self.the_flop = []
         self.turn_card = None
         self.the_river = None
-        
-        # Reset players
-        player = self.small_blind
-        player.cards = []
-        while player != self.small_blind:
+
+        # Reset players
+        self.seating.new_hand()
+        for player in self._players():
             player.cards = []
-            player = player.next_player
+            player.hand_state.clear()
         self.current_player = self.small_blind
-    
+
     def _deal_cards(self) -> None:
         for _ in range(2):
-            self.current_player.deal_card(self.deck.draw())
-            self.current_player = self.current_player.next_player
-            while self.current_player != self.small_blind:
-                self.current_player.deal_card(self.deck.draw())
-                self.current_player = self.current_player.next_player
-    
+            for player in self._players():
+                player.deal_card(self.deck.draw())
+
     def _place_blinds(self) -> None:
         sb_paid = False
         bb_paid = False
@@ -125,81 +369,192 @@ class Environment():
         while not sb_paid:
             try:
                 sb_paid = self.small_blind.pay_small_blind()
-                print(f"[SB] {self.small_blind.name} pays the small blind ({game_rules.SMALL_BLIND})")
-            except ValueError:
-                print(f"[!] {self.small_blind.name} does not have enough money for small blind and is therefore kicked from the game. ({self.small_blind.money})")
+                self.events.emit(ev.BLIND, ev.INFO, "[SB] {} pays the small blind ({})", self.small_blind.name, game_rules.SMALL_BLIND)
+                self.events.emit(ev.ACTION, ev.DEBUG, "[H] {1.name}: {2} {3}", self.street, self.small_blind, hand_history.SMALL_BLIND, game_rules.SMALL_BLIND)
+            except (InsufficientMoneyError, OutOfMoneyError):
+                self.events.emit(ev.GAME, ev.WARNING, "[!] {} does not have enough money for small blind and is therefore kicked from the game. ({})", self.small_blind.name, self.small_blind.money)
                 self.remove_player(self.small_blind)
+                if self.num_players < self.min_players:
+                    raise NotEnoughPlayersError("Not enough players to continue game")
         self.pot += game_rules.SMALL_BLIND
-        
-        # Big blind
+
+        # Big blind
         while not bb_paid:
             try:
                 bb_paid = self.big_blind.pay_big_blind()
-                print(f"[BB] {self.big_blind.name} pays the big blind ({game_rules.BIG_BLIND})")
-            except ValueError:
-                print(f"[!] {self.big_blind.name} does not have enough money for big blind and is therefore kicked from the game. ({self.big_blind.money})")
+                self.events.emit(ev.BLIND, ev.INFO, "[BB] {} pays the big blind ({})", self.big_blind.name, game_rules.BIG_BLIND)
+                self.events.emit(ev.ACTION, ev.DEBUG, "[H] {1.name}: {2} {3}", self.street, self.big_blind, hand_history.BIG_BLIND, game_rules.BIG_BLIND)
+            except (InsufficientMoneyError, OutOfMoneyError):
+                self.events.emit(ev.GAME, ev.WARNING, "[!] {} does not have enough money for big blind and is therefore kicked from the game. ({})", self.big_blind.name, self.big_blind.money)
                 self.remove_player(self.big_blind)
+                if self.num_players < self.min_players:
+                    # Give the small blind back to the last player
+                    self.small_blind.money = self.small_blind.money + self.pot
+                    self.pot = 0
+                    raise NotEnoughPlayersError("Not enough players to continue game")
         self.pot += game_rules.BIG_BLIND
-        
+
         self.current_bet = game_rules.BIG_BLIND
-        self.current_player = self.big_blind.next_player
-    
+        self.current_player = self.seating.player_at(2)
+
+    def _move_blinds(self) -> None:
+        self.seating.rotate()
+
     # region game phases
-    def pre_flop_round(self) -> None:
-        times_raised = 0
-
-        first_player = self.small_blind
-        self.current_player = first_player
-
-        move = first_player.make_move()
-        if move:
-            # Raise or Check
-            self.pot += move
-            self.current_bet = move
-        # Go to the next player
-        self.current_player = self.current_player.next_player
-
-        # Repeat until first player to change something has been reached
-        while self.current_player != first_player:
-            move = self.current_player.make_move(
-                prev_raise = self.current_bet - self.current_player.bet_this_round, 
-                can_re_raise = times_raised < game_rules.MAX_TIMES_RAISABLE_PER_ROUND
-                )
+    # The betting rounds yield the decisions of the players, see ``play_hand``
+    def pre_flop_round(self) -> Hand:
+        # The player after the big blind opens, the big blind acts last
+        yield from self._betting_round(2)
 
-            if move is not None:
-                # Raise or Check
-                self.pot += move
-                self.current_bet = move
-            else:
-                self.remove_player(self.current_player)
+    def flop_round(self) -> Hand:
+        self.street = hand_history.FLOP
+        self.deck.draw() # Burn a card
+        self.the_flop = [self.deck.draw() for _ in range(3)]
+        self._deal_board(self.the_flop)
+        self.events.emit(ev.BOARD, ev.INFO, "[F] Flop: {}{}{}", *self.the_flop)
+        yield from self._betting_round(0)
 
-            # Go to the next player
-            self.current_player = self.current_player.next_player
+    def turn_round(self) -> Hand:
+        self.street = hand_history.TURN
+        self.deck.draw() # Burn a card
+        self.turn_card = self.deck.draw()
+        self._deal_board([self.turn_card])
+        self.events.emit(ev.BOARD, ev.INFO, "[T] Turn: {}", self.turn_card)
+        yield from self._betting_round(0)
+
+    def river_round(self) -> Hand:
+        self.street = hand_history.RIVER
+        self.deck.draw() # Burn a card
+        self.the_river = self.deck.draw()
+        self._deal_board([self.the_river])
+        self.events.emit(ev.BOARD, ev.INFO, "[R] River: {}", self.the_river)
+        yield from self._betting_round(0)
 
-        self._reset_player_round_bets()
-    
-    def flop_round(self) -> None:
-        pass
-    
-    def turn_round(self) -> None:
-        pass
-    
-    def river_round(self) -> None:
-        pass
-    
     def showdown_round(self) -> None:
-        pass
+        """
+        Ranks the hands of all players still in the hand and awards them the pot.
+
+        Players who went all in can only win what everybody put in up to their own
+        contribution, the rest forms side pots (see ``pots``). Every pot is split
+        evenly between the eligible players holding the best hand. Chips that cannot
+        be split evenly go to the winners closest to the left of the dealer, starting
+        with the small blind. If everybody else folded, the last player in the hand
+        wins without showing.
+        """
+        contenders = list(self.seating.active())
+        if len(contenders) == 1:
+            winner = contenders[0]
+            self.events.emit(ev.WIN, ev.INFO, "[W] {} wins {}", winner.name, self.pot)
+            self.events.emit(ev.PAYOUT, ev.DEBUG, "[H] {0.name} wins {1}", winner, self.pot)
+            winner.money = winner.money + self.pot
+            self.pot = 0
+            return
+
+        board = self.table_cards
+        seats = self.seating.order
+        strengths = [0] * len(seats)
+        for i, seat in enumerate(seats):
+            p = self.seating.players[seat]
+            if not self.seating.folded[seat]:
+                strengths[i] = evaluator.evaluate(p.cards + board)
+                if self.events.enabled(ev.INFO):
+                    self.events.emit(ev.SHOWDOWN, ev.INFO, "[S] {} shows {} ({})", p.name, ''.join(card.__str__() for card in p.cards), evaluator.describe(strengths[i]))
+
+        payouts = pots.settle(
+            [self.seating.contributions[seat] for seat in seats],
+            [self.seating.folded[seat] for seat in seats],
+            strengths,
+            [(i - self.seating.button) % len(seats) for i in range(len(seats))],
+            )
+        for i, seat in enumerate(seats):
+            if payouts[i] == 0:
+                continue
+            winner = self.seating.players[seat]
+            if self.events.enabled(ev.INFO):
+                self.events.emit(ev.WIN, ev.INFO, "[W] {} wins {} with {}", winner.name, payouts[i], evaluator.describe(strengths[i]))
+            self.events.emit(ev.PAYOUT, ev.DEBUG, "[H] {0.name} wins {1}", winner, payouts[i])
+            winner.money = winner.money + payouts[i]
+        self.pot = 0
+
+    def _remove_busted_players(self) -> None:
+        stacks = self.seating.stacks
+        for seat in [seat for seat in self.seating.order if stacks[seat] == 0]:
+            player = self.seating.players[seat]
+            self.events.emit(ev.GAME, ev.WARNING, "[!] {} is out of money and leaves the game", player.name)
+            self.remove_player(player)
     # endregion
-    
+
     # region helpers
+    def _betting_round(self, first_position: int) -> Hand:
+        """
+        Lets the players act in turn starting at the given position (0 = small blind)
+        until everybody still in the hand has matched the current bet or only one
+        player is left, see ``BettingRound``.
+
+        Folded players give back their cards and are skipped for the rest of the hand,
+        so are players who are all in.
+        """
+        self.betting = BettingRound(self.seating, first_position, self.current_bet)
+        yield from self._continue_round()
+
+    def _continue_round(self) -> Hand:
+        players = self.seating.players
+        betting = self.betting
+        while not betting.complete:
+            player = players[betting.seat]
+            self.current_player = player
+            bet_before = player.bet_this_round
+            prev_raise = betting.to_call
+            can_re_raise = betting.can_raise
+            player.prepare_move(prev_raise)
+            action, amount = yield Decision(player, prev_raise, can_re_raise)
+            # A strategy that restored a snapshot taken at this decision put back a new round
+            betting = self.betting
+            move = player.apply_move(action, amount, prev_raise, can_re_raise, betting.max_raise)
+            paid = player.bet_this_round - bet_before
+            self.pot += paid
+            if self.events.enabled(ev.DEBUG):
+                self._record_action(player, move, paid)
+            if move is None:
+                self._muck(player)
+            betting.record(move is None)
+            self.current_bet = betting.current_bet
+
+        self.betting = None
+        self._reset_player_round_bets()
+
+    def _muck(self, player: Player) -> None:
+        player.cards = []
+        player.hand_state.clear()
+        self.seating.fold(player.seat)
+
+    def _deal_board(self, cards: list[Card]) -> None:
+        """Adds new board cards to the hand state of every player still in the hand."""
+        for player in self.seating.active():
+            for card in cards:
+                player.hand_state.add_card(card)
+
+    def _record_action(self, player: Player, move: int, paid: int) -> None:
+        if move is None:
+            action = hand_history.FOLD
+        elif player.bet_this_round > self.current_bet:
+            action = hand_history.RAISE
+        elif paid == 0:
+            action = hand_history.CHECK
+        else:
+            action = hand_history.CALL
+        self.events.emit(ev.ACTION, ev.DEBUG, "[H] {1.name}: {2} {3}", self.street, player, action, paid)
+
+    def _players(self) -> Iterator[Player]:
+        """Iterates once around the table starting at the small blind."""
+        return iter(self.seating)
+
+    def _players_in_hand(self) -> int:
+        return self.seating.num_active
+
     def _reset_player_round_bets(self) -> None:
-        p = self.small_blind
-        p.bet_this_round = 0
-        p = p.next_player
-        
-        while p != self.small_blind:
-            p.bet_this_round = 0
-            p = p.next_player    
+        self.seating.new_round()
+        self.current_bet = 0
     # endregion
 
     # endregion
@@ -208,11 +563,7 @@ class Environment():
     def _player_overview(self) -> str:
         overview = "\n"
         overview += "-------------- Overview --------------\n"
-        p = self.small_blind
-        overview += p.__str__() + "\n"
-        p = p.next_player
-        while p != self.small_blind:
+        for p in self._players():
             overview += p.__str__() + "\n"
-            p = p.next_player
         return overview
     # endregion
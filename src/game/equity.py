@@ -0,0 +1,240 @@
+"""
+Monte Carlo hand equity over NumPy card arrays.
+
+Cards are handled as 0-51 indices (see ``evaluator.encode``). Instead of
+shuffling a ``Deck`` per trial, whole batches of runouts are drawn at once:
+every row gets random sort keys for the 52 cards, the known cards get keys
+that can never be picked and the smallest keys become the missing board
+cards and the opponents' hole cards.
+
+The simulation runs batch after batch until the confidence interval of the
+equity estimate is narrower than the requested margin or ``max_trials`` is
+reached, which keeps the time spent on a decision bounded.
+"""
+from statistics import NormalDist
+from typing import Mapping, NamedTuple, Sequence, Union
+
+import numpy as np
+
+from . import evaluator, isomorphism
+from .cache import LruCache
+from .card import Card
+
+Combo = tuple[Card, Card]
+HandRange = Union[Sequence[Combo], Mapping[Combo, float]]
+
+BOARD_SIZE = 5
+_BLOCKED = 2.0  # Larger than any key drawn by ``Generator.random``
+
+
+class EquityResult(NamedTuple):
+    equity: float
+    std_error: float
+    trials: int
+
+    def interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return self.equity - z * self.std_error, self.equity + z * self.std_error
+
+
+# region batch evaluation
+class _Tables():
+    """NumPy copies of the evaluator lookup tables."""
+    def __init__(self) -> None:
+        # Converted straight from the mapped table file, the keys are sorted already
+        self.count_keys = np.asarray(evaluator._DATA.count_keys, dtype=np.int64)
+        self.count_values = np.asarray(evaluator._DATA.count_values, dtype=np.int32)
+        self.flush = np.asarray(evaluator._DATA.flush, dtype=np.int32)
+        self.rank_key = np.asarray(evaluator._RANK_KEY, dtype=np.int64)
+        self.rank_bit = np.asarray(evaluator._RANK_BIT, dtype=np.int64)
+        self.suit_key = np.asarray(evaluator._SUIT_KEY, dtype=np.int64)
+        self.flush_suit = np.asarray(evaluator._FLUSH_SUIT, dtype=np.int64)
+
+
+_tables: _Tables = None
+
+
+def _get_tables() -> _Tables:
+    global _tables
+    if _tables is None:
+        _tables = _Tables()
+    return _tables
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Evaluates many hands at once.
+
+    ``cards`` is an integer array of shape ``(hands, 5..7)`` holding card indices,
+    the result holds the ``evaluator.evaluate`` strength of every row.
+    """
+    tables = _get_tables()
+    cards = np.asarray(cards)
+
+    keys = tables.rank_key[cards].sum(axis=1)
+    strengths = tables.count_values[np.searchsorted(tables.count_keys, keys)]
+
+    flush_suit = tables.flush_suit[tables.suit_key[cards].sum(axis=1)]
+    has_flush = flush_suit >= 0
+    if has_flush.any():
+        flush_cards = cards[has_flush]
+        in_suit = (flush_cards & 3) == flush_suit[has_flush, None]
+        masks = np.where(in_suit, tables.rank_bit[flush_cards], 0).sum(axis=1)
+        strengths[has_flush] = tables.flush[masks]
+    return strengths
+# endregion
+
+
+# region equity
+def _range_arrays(hand_range: HandRange, dead: set[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the combos of a range that are not blocked by dead cards and their sampling probabilities."""
+    if isinstance(hand_range, Mapping):
+        items = list(hand_range.items())
+    else:
+        items = [(combo, 1.0) for combo in hand_range]
+
+    combos = []
+    weights = []
+    for (first, second), weight in items:
+        indices = (evaluator.encode(first), evaluator.encode(second))
+        if weight > 0 and dead.isdisjoint(indices) and indices[0] != indices[1]:
+            combos.append(indices)
+            weights.append(weight)
+    if not combos:
+        raise ValueError("[E] Range has no combos left after removing known cards.")
+
+    weights = np.asarray(weights, dtype=np.float64)
+    return np.asarray(combos, dtype=np.int64), weights / weights.sum()
+
+
+def _simulate(
+        rng: np.random.Generator,
+        batch_size: int,
+        hero: np.ndarray,
+        board: np.ndarray,
+        ranges: list[tuple[np.ndarray, np.ndarray]],
+        num_random: int
+        ) -> np.ndarray:
+    """Simulates one batch of runouts and returns the hero's share of the pot in every valid trial."""
+    rows = np.arange(batch_size)[:, None]
+    keys = rng.random((batch_size, evaluator.NUM_CARDS))
+    keys[:, hero] = _BLOCKED
+    keys[:, board] = _BLOCKED
+
+    # Opponents with a range get a sampled combo, trials where two of them collide are discarded
+    opponents = []
+    valid = np.ones(batch_size, dtype=bool)
+    for combos, probabilities in ranges:
+        hands = combos[rng.choice(len(combos), size=batch_size, p=probabilities)]
+        valid &= (keys[rows, hands] < _BLOCKED).all(axis=1)
+        keys[rows, hands] = _BLOCKED
+        opponents.append(hands)
+
+    # The remaining board cards and random opponents get the cards with the smallest keys
+    needed = BOARD_SIZE - len(board) + 2 * num_random
+    if needed:
+        drawn = np.argpartition(keys, needed - 1, axis=1)[:, :needed]
+        drawn = np.take_along_axis(drawn, np.argsort(np.take_along_axis(keys, drawn, axis=1), axis=1), axis=1)
+    else:
+        drawn = np.empty((batch_size, 0), dtype=np.int64)
+    runout = np.concatenate([np.broadcast_to(board, (batch_size, len(board))), drawn[:, :BOARD_SIZE - len(board)]], axis=1)
+    dealt = drawn[:, BOARD_SIZE - len(board):]
+    for i in range(num_random):
+        opponents.append(dealt[:, 2 * i:2 * i + 2])
+
+    runout = runout[valid]
+    hero_strength = evaluate_batch(np.concatenate([np.broadcast_to(hero, (len(runout), 2)), runout], axis=1))
+    best_opponent = np.zeros(len(runout), dtype=hero_strength.dtype)
+    tied = np.zeros(len(runout), dtype=np.int64)
+    for hands in opponents:
+        strength = evaluate_batch(np.concatenate([hands[valid], runout], axis=1))
+        tied = np.where(strength > best_opponent, 1, tied + (strength == best_opponent))
+        best_opponent = np.maximum(best_opponent, strength)
+
+    win = hero_strength > best_opponent
+    tie = hero_strength == best_opponent
+    return np.where(win, 1.0, np.where(tie, 1.0 / (tied + 1), 0.0))
+
+
+def equity(
+        hole_cards: Sequence[Card],
+        table_cards: Sequence[Card] = (),
+        num_opponents: int = 1,
+        ranges: Sequence[HandRange] = (),
+        margin: float = 0.005,
+        confidence: float = 0.95,
+        batch_size: int = 100_000,
+        max_trials: int = 2_000_000,
+        rng: np.random.Generator = None
+        ) -> EquityResult:
+    """
+    Estimates the share of the pot the hole cards win at showdown on average.
+
+    ``ranges`` optionally holds one range per opponent, given either as a list of
+    combos or as a mapping of combos to weights. Opponents without a range (up to
+    ``num_opponents``) hold random cards.
+
+    Batches of ``batch_size`` runouts are simulated until the ``confidence`` interval
+    is at most ``margin`` wide on each side or ``max_trials`` runouts were simulated.
+    """
+    if len(hole_cards) != 2:
+        raise ValueError("[E] Equity needs exactly 2 hole cards.")
+    if len(table_cards) > BOARD_SIZE:
+        raise ValueError(f"[E] Cannot have more than {BOARD_SIZE} table cards.")
+    num_opponents = max(num_opponents, len(ranges))
+    if num_opponents < 1:
+        raise ValueError("[E] Equity needs at least one opponent.")
+
+    rng = rng if rng is not None else np.random.default_rng()
+    hero = np.asarray([evaluator.encode(card) for card in hole_cards], dtype=np.int64)
+    board = np.asarray([evaluator.encode(card) for card in table_cards], dtype=np.int64)
+    dead = set(hero.tolist()) | set(board.tolist())
+    if len(dead) != len(hero) + len(board):
+        raise ValueError("[E] Hole cards and table cards must not contain duplicates.")
+    range_arrays = [_range_arrays(hand_range, dead) for hand_range in ranges]
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    simulated = 0
+    trials = 0
+    total = 0.0
+    total_squared = 0.0
+    std_error = float("inf")
+    while simulated < max_trials:
+        size = min(batch_size, max_trials - simulated)
+        shares = _simulate(rng, size, hero, board, range_arrays, num_opponents - len(ranges))
+        simulated += size
+        trials += len(shares)
+        total += shares.sum()
+        total_squared += np.square(shares).sum()
+        if trials < 2:
+            continue
+        mean = total / trials
+        std_error = np.sqrt(max(total_squared / trials - mean ** 2, 0.0) / (trials - 1))
+        if z * std_error <= margin:
+            break
+
+    if trials == 0:
+        raise ValueError("[E] Ranges are incompatible, no valid runout found.")
+    return EquityResult(float(total / trials), float(std_error), trials)
+
+
+_cache = LruCache("equity", max_bytes=8 * 2 ** 20)
+
+
+def cached_equity(
+        hole_cards: Sequence[Card],
+        table_cards: Sequence[Card] = (),
+        num_opponents: int = 1,
+        margin: float = 0.005
+        ) -> EquityResult:
+    """
+    ``equity`` against random opponents, simulated once per situation up to a renaming
+    of the suits (see ``isomorphism``) and answered from a cache afterwards.
+    """
+    key = (
+        isomorphism.canonical_index([card.index for card in hole_cards], [card.index for card in table_cards]),
+        num_opponents,
+        margin,
+    )
+    return _cache.get_or_compute(key, lambda: equity(hole_cards, table_cards, num_opponents, margin=margin))
+# endregion
@@ -0,0 +1,372 @@
+"""
+Lookup table based hand evaluator.
+
+Every card is encoded as a small integer ``rank * 4 + suit`` (0-51) where the
+rank follows the order of ``Value`` (two = 0, ace = 12) and the suit follows
+the order of ``Suit``. Hands of 5, 6 or 7 cards are ranked with two
+precomputed tables:
+
+- a flush table indexed by the 13 bit rank mask of the flush suit
+- a table for all other hands keyed by the base 5 rank count of the hand
+  (every rank occurs at most 4 times, so the key is a perfect hash)
+
+With at most 7 cards a flush always beats whatever the remaining cards make,
+so only one table lookup is needed per hand.
+
+Generating the tables takes most of a second, so they are generated offline
+(``python -m src.game.evaluator``) into a binary file that is memory-mapped
+on import. Processes share the mapped pages, NumPy code reads the arrays
+without copying them (see ``equity``). If the file is missing, truncated or
+written for another ``_VERSION`` the tables are generated on import. The
+contents themselves are not checked, so changing the tables means bumping
+``_VERSION`` and writing the file again.
+
+The result is a hand strength between 1 and ``HAND_CLASSES``: a higher value
+means a better hand and equal values split the pot.
+
+The functions here rank one hand per call, which in CPython is bound by the
+interpreter at roughly a million hands per second per core. Code that ranks
+many hands, like equity simulations, passes them as a NumPy array to
+``equity.evaluate_batch`` instead, which uses the same tables.
+"""
+import mmap
+import os
+import struct
+from itertools import combinations, combinations_with_replacement
+from typing import NamedTuple, Optional, Sequence
+
+from .card import Card, Suit, Value
+
+# region hand categories
+HIGH_CARD = 0
+ONE_PAIR = 1
+TWO_PAIR = 2
+THREE_OF_A_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_OF_A_KIND = 7
+STRAIGHT_FLUSH = 8
+
+HAND_NAMES = [
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+]
+# endregion
+
+NUM_RANKS = len(Value)
+NUM_SUITS = len(Suit)
+NUM_CARDS = NUM_RANKS * NUM_SUITS
+
+# Rank masks of all straights from the ace high straight down to the wheel
+_STRAIGHTS = [(0b11111 << low, low + 4) for low in range(NUM_RANKS - 5, -1, -1)]
+_STRAIGHTS.append(((1 << 12) | 0b1111, 3))
+
+
+# region encoding
+def encode(card: Card) -> int:
+    """Returns the 0-51 index of a card."""
+    return card.index
+
+
+def decode(index: int) -> Card:
+    """Returns the card belonging to a 0-51 index."""
+    return Card.from_index(index)
+# endregion
+
+
+# region table generation
+def _pack(category: int, ranks: list[int]) -> int:
+    """Packs a category and up to five tie breaking ranks into one sortable integer."""
+    strength = category
+    for i in range(5):
+        strength = (strength << 4) | (ranks[i] if i < len(ranks) else 0)
+    return strength
+
+
+def _straight_high(rank_mask: int) -> int:
+    for straight, high in _STRAIGHTS:
+        if rank_mask & straight == straight:
+            return high
+    return -1
+
+
+def _flush_strength(rank_mask: int) -> int:
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return _pack(STRAIGHT_FLUSH, [high])
+    ranks = [r for r in range(NUM_RANKS - 1, -1, -1) if rank_mask >> r & 1]
+    return _pack(FLUSH, ranks[:5])
+
+
+def _count_strength(counts: list[int]) -> int:
+    """Strength of the best five cards that can be made from the given rank counts (ignoring flushes)."""
+    by_count: list[list[int]] = [[] for _ in range(5)]
+    present: list[int] = []
+    rank_mask = 0
+    for rank in range(NUM_RANKS - 1, -1, -1):
+        if counts[rank]:
+            by_count[counts[rank]].append(rank)
+            present.append(rank)
+            rank_mask |= 1 << rank
+
+    def kickers(exclude: list[int], num: int) -> list[int]:
+        return [r for r in present if r not in exclude][:num]
+
+    if by_count[4]:
+        quads = by_count[4][0]
+        return _pack(FOUR_OF_A_KIND, [quads] + kickers([quads], 1))
+    if by_count[3]:
+        trips = by_count[3][0]
+        pairs = sorted(by_count[3][1:] + by_count[2], reverse=True)
+        if pairs:
+            return _pack(FULL_HOUSE, [trips, pairs[0]])
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return _pack(STRAIGHT, [high])
+    if by_count[3]:
+        trips = by_count[3][0]
+        return _pack(THREE_OF_A_KIND, [trips] + kickers([trips], 2))
+    if len(by_count[2]) >= 2:
+        pairs = by_count[2][:2]
+        return _pack(TWO_PAIR, pairs + kickers(pairs, 1))
+    if by_count[2]:
+        pair = by_count[2][0]
+        return _pack(ONE_PAIR, [pair] + kickers([pair], 3))
+    return _pack(HIGH_CARD, kickers([], 5))
+
+
+def _straight_out_ranks() -> list[int]:
+    """For every rank mask without a straight, the mask of the ranks that would complete one (see ``hand_state``)."""
+    outs = [0] * (1 << NUM_RANKS)
+    for mask in range(1 << NUM_RANKS):
+        missing = [straight & ~mask for straight, _ in _STRAIGHTS]
+        if 0 in missing:
+            continue
+        for ranks in missing:
+            # Exactly one rank of this straight is missing
+            if ranks & (ranks - 1) == 0:
+                outs[mask] |= ranks
+    return outs
+
+
+class _TableData(NamedTuple):
+    # Hand class of every rank mask of a flush suit
+    flush: Sequence[int]
+    # Sorted rank count keys of all hands without a flush and their hand classes
+    count_keys: Sequence[int]
+    count_values: Sequence[int]
+    # Packed strength of every hand class from the worst to the best
+    strengths: Sequence[int]
+    straight_outs: Sequence[int]
+    # Suit with at least 5 cards of every suit count key, -1 for none
+    flush_suits: Sequence[int]
+
+
+def _build_tables() -> _TableData:
+    flush_packed = [0] * (1 << NUM_RANKS)
+    for mask in range(1 << NUM_RANKS):
+        if bin(mask).count("1") >= 5:
+            flush_packed[mask] = _flush_strength(mask)
+
+    count_packed: dict[int, int] = {}
+    for num_cards in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(NUM_RANKS), num_cards):
+            counts = [0] * NUM_RANKS
+            key = 0
+            for rank in ranks:
+                counts[rank] += 1
+                key += 5 ** rank
+            if max(counts) <= NUM_SUITS:
+                count_packed[key] = _count_strength(counts)
+
+    # Compress the packed strengths into dense hand classes (1 = worst, HAND_CLASSES = best)
+    distinct = sorted(set(count_packed.values()) | {s for s in flush_packed if s})
+    dense = {packed: i + 1 for i, packed in enumerate(distinct)}
+
+    flush_table = [dense[s] if s else 0 for s in flush_packed]
+    count_keys = sorted(count_packed)
+    flush_suits = [-1] * (1 << (3 * NUM_SUITS))
+    for key in range(len(flush_suits)):
+        for suit in range(NUM_SUITS):
+            if (key >> (3 * suit)) & 0b111 >= 5:
+                flush_suits[key] = suit
+    return _TableData(
+        flush_table, count_keys, [dense[count_packed[key]] for key in count_keys], distinct, _straight_out_ranks(), flush_suits
+    )
+
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "evaluator_tables.bin")
+
+_MAGIC = b"EVAL"
+_VERSION = 1
+# magic, version, flush table size, number of count keys, number of hand classes, padded to 32 bytes
+_HEADER = struct.Struct("<4sH2xIII12x")
+
+
+def write_tables(path: str = DEFAULT_PATH) -> None:
+    """Writes freshly generated tables, 32 bit sections first so every section is aligned."""
+    data = _build_tables()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(data.flush), len(data.count_keys), len(data.strengths)))
+        file.write(struct.pack(f"<{len(data.count_keys)}I", *data.count_keys))
+        file.write(struct.pack(f"<{len(data.strengths)}I", *data.strengths))
+        file.write(struct.pack(f"<{len(data.flush)}H", *data.flush))
+        file.write(struct.pack(f"<{len(data.count_values)}H", *data.count_values))
+        file.write(struct.pack(f"<{len(data.straight_outs)}H", *data.straight_outs))
+        file.write(struct.pack(f"<{len(data.flush_suits)}b", *data.flush_suits))
+
+
+def _load_tables(path: str = DEFAULT_PATH) -> Optional[_TableData]:
+    """Maps a table file read only, returns None if there is no usable file."""
+    try:
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, num_flush, num_counts, num_classes = _HEADER.unpack_from(buffer)
+    except struct.error:
+        return None
+    if magic != _MAGIC or version != _VERSION or num_flush != 1 << NUM_RANKS:
+        return None
+
+    sizes = (("I", num_counts), ("I", num_classes), ("H", num_flush), ("H", num_counts), ("H", num_flush), ("b", 1 << (3 * NUM_SUITS)))
+    # A file cut short would otherwise map to sections that are short too
+    if len(buffer) != _HEADER.size + sum(struct.calcsize(code) * size for code, size in sizes):
+        return None
+
+    view = memoryview(buffer)
+    offset = _HEADER.size
+    sections = []
+    for code, size in sizes:
+        end = offset + struct.calcsize(code) * size
+        sections.append(view[offset:end].cast(code))
+        offset = end
+    count_keys, strengths, flush, count_values, straight_outs, flush_suits = sections
+    return _TableData(flush, count_keys, count_values, strengths, straight_outs, flush_suits)
+
+
+def _to_list(values: Sequence[int]) -> list[int]:
+    return values.tolist() if isinstance(values, memoryview) else list(values)
+
+
+_DATA = _load_tables() or _build_tables()
+# The hot path indexes plain lists and dicts, which is faster than indexing the mapped memory
+_FLUSH_TABLE = _to_list(_DATA.flush)
+# Filled on first use, building the dict takes longer than the rest of the import
+_COUNT_TABLE: dict[int, int] = {}
+_DENSE: dict[int, int] = {}
+
+HAND_CLASSES = len(_DATA.strengths)
+_CATEGORIES = [0] + [packed >> 20 for packed in _DATA.strengths]
+
+
+def _count_table() -> dict[int, int]:
+    if not _COUNT_TABLE:
+        _COUNT_TABLE.update(zip(_to_list(_DATA.count_keys), _to_list(_DATA.count_values)))
+    return _COUNT_TABLE
+
+
+def _dense() -> dict[int, int]:
+    if not _DENSE:
+        _DENSE.update((packed, i + 1) for i, packed in enumerate(_DATA.strengths))
+    return _DENSE
+
+# Per card contributions to the lookup keys
+_RANK_KEY = [5 ** (i // NUM_SUITS) for i in range(NUM_CARDS)]
+_RANK_BIT = [1 << (i // NUM_SUITS) for i in range(NUM_CARDS)]
+# Suit counts are packed 3 bits per suit, enough for up to 7 cards
+_SUIT_KEY = [1 << (3 * (i % NUM_SUITS)) for i in range(NUM_CARDS)]
+_FLUSH_SUIT = _to_list(_DATA.flush_suits)
+# endregion
+
+
+# region evaluation
+def evaluate_indices(cards: list[int]) -> int:
+    """
+    Returns the strength of a 5, 6 or 7 card hand given as 0-51 card indices.
+
+    This is the fastest single hand path, use ``equity.evaluate_batch`` for many hands.
+    """
+    key = 0
+    suit_key = 0
+    for card in cards:
+        key += _RANK_KEY[card]
+        suit_key += _SUIT_KEY[card]
+
+    flush_suit = _FLUSH_SUIT[suit_key]
+    if flush_suit >= 0:
+        mask = 0
+        for card in cards:
+            if card & 3 == flush_suit:
+                mask |= _RANK_BIT[card]
+        return _FLUSH_TABLE[mask]
+    try:
+        return _COUNT_TABLE[key]
+    except KeyError:
+        return _count_table()[key]
+
+
+def evaluate(cards: list[Card]) -> int:
+    """Returns the strength of a 5, 6 or 7 card hand, higher is better."""
+    if not 5 <= len(cards) <= 7:
+        raise ValueError(f"[E] Can only evaluate 5 to 7 cards, got {len(cards)}.")
+    return evaluate_indices([card.index for card in cards])
+
+
+def category(strength: int) -> int:
+    """Returns the hand category (e.g. ``FLUSH``) of a hand strength."""
+    return _CATEGORIES[strength]
+
+
+def describe(strength: int) -> str:
+    return HAND_NAMES[_CATEGORIES[strength]]
+# endregion
+
+
+# region naive reference
+def _five_card_strength(cards: tuple[int, ...]) -> int:
+    counts = [0] * NUM_RANKS
+    suits = set()
+    rank_mask = 0
+    for card in cards:
+        counts[card // NUM_SUITS] += 1
+        suits.add(card % NUM_SUITS)
+        rank_mask |= 1 << (card // NUM_SUITS)
+    if len(suits) == 1:
+        return _flush_strength(rank_mask)
+    return _count_strength(counts)
+
+
+def evaluate_naive(cards: list[Card]) -> int:
+    """
+    Reference evaluator that ranks every five card combination of the hand directly.
+
+    Much slower than ``evaluate`` but independent of the lookup tables, which makes it
+    useful for testing and benchmarking.
+    """
+    indices = [card.index for card in cards]
+    best = max(_five_card_strength(hand) for hand in combinations(indices, 5))
+    return _dense()[best]
+# endregion
+
+
+if __name__ == "__main__":
+    # Imported here as every other process imports this module on startup
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generates the evaluator lookup tables.")
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    write_tables(args.path)
+    print(f"[i] Written to {args.path}")
@@ -0,0 +1,138 @@
+"""
+Structured events emitted while the game is played.
+
+``Player``, ``Environment`` and ``Game`` publish every message as an
+``Event`` on their ``EventBus`` instead of printing it directly. An event
+holds its kind, a level and a format template with its arguments; the text
+is only formatted when a subscriber asks for ``event.message``, so emitting
+to a bus nobody listens to costs little more than the call.
+
+Subscribers are callables taking the event. The console output is one of
+them (``print_event``), the hand history writer, metrics such as the
+``EventCounter`` or a GUI are others. A bus can forward its events to a
+parent bus, so e.g. a table's own subscribers see its events and the
+console still prints them.
+"""
+import weakref
+from collections import Counter
+from typing import Callable, Iterable, NamedTuple
+
+# region levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+# Level of a bus without subscribers
+OFF = 100
+# endregion
+
+# region kinds
+PLAYER = "player"        # players created, joining or leaving
+DEAL = "deal"            # hole cards dealt
+MONEY = "money"          # money won or spent
+BLIND = "blind"
+MOVE = "move"            # a player's turn and decision
+BOARD = "board"          # flop, turn and river
+SHOWDOWN = "showdown"
+WIN = "win"
+OVERVIEW = "overview"
+GAME = "game"            # game flow, e.g. players kicked or the game being over
+
+# Structured records of a hand, their arguments are the data (see ``HandHistoryWriter.on_event``)
+HAND_START = "hand_start"    # players, stacks
+ACTION = "action"            # street, player, action code, amount
+PAYOUT = "payout"            # player, amount
+HAND_END = "hand_end"        # board
+# endregion
+
+
+class Event(NamedTuple):
+    kind: str
+    level: int
+    template: str
+    args: tuple
+
+    @property
+    def message(self) -> str:
+        return self.template.format(*self.args)
+
+    def __str__(self) -> str:
+        return self.message
+
+
+Subscriber = Callable[[Event], None]
+
+
+class EventBus():
+    def __init__(self, parent: "EventBus" = None) -> None:
+        self.parent = parent
+        self._subscribers: list[tuple[Subscriber, int, frozenset]] = []
+        self._children: "weakref.WeakSet[EventBus]" = weakref.WeakSet()
+        # Lowest level any subscriber of this bus wants
+        self._own_level: int = OFF
+        # Lowest level any subscriber of this bus or a parent wants, events below it are dropped at once
+        self.level: int = OFF
+        if parent is not None:
+            parent._children.add(self)
+            self.level = parent.level
+
+    def subscribe(self, subscriber: Subscriber, level: int = INFO, kinds: Iterable[str] = None) -> None:
+        """Calls the subscriber with every event of at least the given level, only of the given kinds if any."""
+        self._subscribers.append((subscriber, level, frozenset(kinds) if kinds is not None else None))
+        self._own_level = min(self._own_level, level)
+        self._update_level()
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers = [entry for entry in self._subscribers if entry[0] != subscriber]
+        self._own_level = min((level for _, level, _ in self._subscribers), default=OFF)
+        self._update_level()
+
+    def _update_level(self) -> None:
+        level = min(self._own_level, self.parent.level if self.parent is not None else OFF)
+        if level != self.level:
+            self.level = level
+            for child in self._children:
+                child._update_level()
+
+    def enabled(self, level: int) -> bool:
+        """Whether events of this level reach any subscriber, used to skip building expensive arguments."""
+        return level >= self.level
+
+    def emit(self, kind: str, level: int, template: str, *args) -> None:
+        if level < self.level:
+            return
+        self.publish(Event(kind, level, template, args))
+
+    def publish(self, event: Event) -> None:
+        level = event.level
+        if level >= self._own_level:
+            for subscriber, min_level, kinds in self._subscribers:
+                if level >= min_level and (kinds is None or event.kind in kinds):
+                    subscriber(event)
+        if self.parent is not None:
+            self.parent.publish(event)
+
+
+class _NullBus(EventBus):
+    def subscribe(self, subscriber: Subscriber, level: int = INFO, kinds: Iterable[str] = None) -> None:
+        raise ValueError("[E] NULL is shared by every headless table, subscribe to a bus of your own.")
+
+
+# region subscribers
+def print_event(event: Event) -> None:
+    print(event.message)
+
+
+class EventCounter():
+    """Counts the events per kind, e.g. to collect metrics of a simulation."""
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+
+    def __call__(self, event: Event) -> None:
+        self.counts[event.kind] += 1
+# endregion
+
+
+CONSOLE = EventBus()
+CONSOLE.subscribe(print_event, INFO)
+# Drops every event, used for headless simulations
+NULL = _NullBus()
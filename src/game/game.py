@@ -1,39 +1,54 @@
+import random
+
 from .player import Player, InsufficientMoneyError, OutOfMoneyError
 from .deck import Deck
 from .card import Card
+from . import events as ev
+from .events import CONSOLE, EventBus
+from .seating import Seating
 from . import game_rules
+from . import profiling
 
 class Game():
-    def __init__(self) -> None:
-        self._small_blind_index = 0
-        self.players: list[Player] = []
-        self.deck = Deck()
+    def __init__(self, events: EventBus = None, deck: Deck = None, seed: int = None, profiler: profiling.HandProfiler = None) -> None:
+        self.events: EventBus = events if events is not None else CONSOLE
+        self.seating: Seating = Seating()
+        self.deck = deck if deck is not None else Deck()
+        # Draws the seed the deck is shuffled with before every round
+        self.rng = random.Random(seed)
+        self.hand_seed: int = None
+        # Times the phases of every round if set
+        self.profiler: profiling.HandProfiler = profiler
     
+    @property
+    def players(self) -> list[Player]:
+        return self.seating.in_seat_order()
+
     @property
     def small_blind_index(self) -> int:
-        return self._small_blind_index
+        return self.seating.button
 
     @small_blind_index.setter
     def small_blind_index(self, new_index: int) -> None:
-        if new_index >= len(self.players):
-            self._small_blind_index = 0
+        if new_index >= len(self.seating):
+            self.seating.button = 0
         else:
-            self._small_blind_index = new_index
+            self.seating.button = new_index
     
     @property
     def big_blind_index(self) -> int:
-        if self.small_blind_index == len(self.players) - 1:
+        if self.small_blind_index == len(self.seating) - 1:
             return 0
         else:
             return self.small_blind_index + 1
     
     def add_player(self, player: Player) -> None:
-        self.players.append(player)
+        self.seating.sit(player)
         player.money = game_rules.STARTING_MONEY
     
     def remove_player(self, player: Player) -> None:
-        self.players.remove(player)
-        print(f"[i] {player.name} has been removed from the game")
+        self.seating.leave(player)
+        self.events.emit(ev.PLAYER, ev.INFO, "[i] {} has been removed from the game", player.name)
 
     def play_round(self) -> None:
         bet = 0
@@ -41,7 +56,12 @@ class Game():
         table_cards: list[Card] = []
         
         # Set blinds
+        profiler = self.profiler
+        if profiler is not None:
+            start = profiler.start()
         self._set_blinds()
+        if profiler is not None:
+            profiler.lap(profiling.BLINDS, start)
     
     def _set_blinds(self) -> None:
         self._set_small_blind()
@@ -71,7 +91,7 @@ class Game():
         except OutOfMoneyError:
             self.remove_player(small_blind)
         
-        if len(self.players) == 1:
+        if len(self.seating) == 1:
             self.game_over()
         elif not done:
             self._set_small_blind()
@@ -89,7 +109,7 @@ class Game():
         except OutOfMoneyError:
             self.remove_player(big_blind)
         
-        if len(self.players) == 1:
+        if len(self.seating) == 1:
             self.game_over()
         elif not done:
             self._set_small_blind()
@@ -99,12 +119,13 @@ class Game():
             player.money = player.money + earning
     
     def run(self) -> None:
-        while len(self.players) >= 2:
-            self.deck.shuffle()
-            self.play_round()
+        while len(self.seating) >= 2:
+            self.hand_seed = self.rng.getrandbits(64)
+            self.deck.seed(self.hand_seed)
             self.deck.reset()
+            self.play_round()
         else:
             self.game_over()
     
     def game_over(self) -> None:
-        print("[i] Game over!")
+        self.events.emit(ev.GAME, ev.INFO, "[i] Game over!")
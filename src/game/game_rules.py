@@ -1,4 +1,5 @@
 MAX_POSSIBLE_CARDS_ON_HAND = 2
+MAX_PLAYERS = 10
 MAX_TIMES_RAISABLE_PER_ROUND = 2
 MIN_BET = 10
 SMALL_BLIND = MIN_BET // 2
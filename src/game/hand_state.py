@@ -0,0 +1,101 @@
+"""
+Incremental hand state of a single player.
+
+A ``HandState`` is updated card by card as the hole cards are dealt and the
+board cards arrive. Every update only touches a few counters and bitmasks,
+and the evaluator lookup keys are kept as running sums, so the made hand,
+the draws and the outs can be read at any point without evaluating the hand
+again from scratch.
+"""
+from . import evaluator
+from .card import Card
+
+NUM_RANKS = evaluator.NUM_RANKS
+NUM_SUITS = evaluator.NUM_SUITS
+
+# For every rank mask without a straight, the mask of the ranks that would complete one
+_STRAIGHT_OUT_RANKS = evaluator._to_list(evaluator._DATA.straight_outs)
+
+
+class HandState():
+    __slots__ = ("num_cards", "card_mask", "rank_mask", "rank_counts", "suit_counts", "suit_masks", "_rank_key", "_suit_key")
+
+    def __init__(self, cards: list[Card] = ()) -> None:
+        self.clear()
+        for card in cards:
+            self.add_card(card)
+
+    def clear(self) -> None:
+        self.num_cards = 0
+        self.card_mask = 0
+        self.rank_mask = 0
+        self.rank_counts = [0] * NUM_RANKS
+        self.suit_counts = [0] * NUM_SUITS
+        # Rank mask per suit
+        self.suit_masks = [0] * NUM_SUITS
+        # Running sums of the evaluator lookup keys
+        self._rank_key = 0
+        self._suit_key = 0
+
+    def add_card(self, card: Card) -> None:
+        index = card.index
+        rank = index >> 2
+        suit = index & 3
+        self.num_cards += 1
+        self.card_mask |= card.mask
+        self.rank_mask |= 1 << rank
+        self.rank_counts[rank] += 1
+        self.suit_counts[suit] += 1
+        self.suit_masks[suit] |= 1 << rank
+        self._rank_key += evaluator._RANK_KEY[index]
+        self._suit_key += evaluator._SUIT_KEY[index]
+
+    # region made hand
+    @property
+    def strength(self) -> int:
+        """The ``evaluator.evaluate`` strength of the hand, 0 while it has fewer than 5 cards."""
+        if self.num_cards < 5:
+            return 0
+        flush_suit = evaluator._FLUSH_SUIT[self._suit_key]
+        if flush_suit >= 0:
+            return evaluator._FLUSH_TABLE[self.suit_masks[flush_suit]]
+        try:
+            return evaluator._COUNT_TABLE[self._rank_key]
+        except KeyError:
+            return evaluator._count_table()[self._rank_key]
+
+    @property
+    def category(self) -> int:
+        """The made hand category (e.g. ``evaluator.FLUSH``), ``None`` while it has fewer than 5 cards."""
+        return evaluator.category(self.strength) if self.num_cards >= 5 else None
+    # endregion
+
+    # region draws
+    @property
+    def flush_draw(self) -> bool:
+        """Whether one more card of a suit makes a flush."""
+        return max(self.suit_counts) == 4
+
+    @property
+    def straight_draw(self) -> int:
+        """Number of ranks that complete a straight: 0 = none, 1 = gutshot, 2 = open-ended."""
+        return _STRAIGHT_OUT_RANKS[self.rank_mask].bit_count()
+
+    @property
+    def outs(self) -> int:
+        """Number of unseen cards that complete a straight or a flush the hand does not have yet."""
+        straight_ranks = _STRAIGHT_OUT_RANKS[self.rank_mask]
+        outs = 0
+        rank = 0
+        while straight_ranks >> rank:
+            if straight_ranks >> rank & 1:
+                outs += NUM_SUITS - self.rank_counts[rank]
+            rank += 1
+
+        counts = self.suit_counts
+        if 4 in counts:
+            suit = counts.index(4)
+            # Suited cards that also complete the straight were already counted
+            outs += NUM_RANKS - 4 - (straight_ranks & ~self.suit_masks[suit]).bit_count()
+        return outs
+    # endregion
@@ -0,0 +1,56 @@
+"""
+Headless mode for the ``Environment``.
+
+Tables created here drop all messages and let every player decide through a
+strategy callback, so complete hands are played without any console I/O.
+"""
+from typing import TYPE_CHECKING
+
+from .deck import ArrayDeck, Deck
+from .environment import Environment, NotEnoughPlayersError
+from .events import NULL, EventBus
+from .history import HandHistoryWriter
+from .player import Player
+from .profiling import HandProfiler
+from .strategies import Strategy
+
+if TYPE_CHECKING:
+    from .stats import StatsStore
+
+
+def create_table(
+        strategies: dict[str, Strategy],
+        starting_score: int = None,
+        events: EventBus = NULL,
+        deck: Deck = None,
+        history: HandHistoryWriter = None,
+        seed: int = None,
+        profiler: HandProfiler = None,
+        stats: "StatsStore" = None
+        ) -> Environment:
+    """
+    Creates a table with one player per name, seated in the order of the given mapping.
+
+    Uses an ``ArrayDeck`` unless another deck is given. The seed makes the cards of
+    every hand reproducible (see ``seeding``).
+    """
+    env = Environment(events=events, deck=deck if deck is not None else ArrayDeck(), history=history, seed=seed, profiler=profiler, stats=stats)
+    if starting_score is not None:
+        env.starting_score = starting_score
+    for name, strategy in strategies.items():
+        env.add_player(Player(name, strategy=strategy, events=events))
+    return env
+
+
+def play_hands(env: Environment, num_hands: int) -> int:
+    """
+    Plays up to ``num_hands`` consecutive hands on the table.
+
+    Stops early when too few players are left and returns the number of hands played.
+    """
+    for played in range(num_hands):
+        try:
+            env.start_game()
+        except NotEnoughPlayersError:
+            return played
+    return num_hands
@@ -0,0 +1,278 @@
+"""
+Compact binary hand histories.
+
+A history file is an append-only sequence of records. Every record starts
+with a one byte tag and the length of its payload, so files can be streamed
+record by record and concatenated:
+
+- player records map a small player id to a name, they are written the first
+  time a player shows up
+- hand records hold the seed the deck was shuffled with, the seats (player
+  id, stack before the blinds and hole cards), the blinds and actions of
+  every street with the chips they put in the pot, the board and the payouts
+
+The writer collects a hand in memory, packs it when the hand is over and
+only writes to disk once its buffer is full, so recording costs a few
+``struct.pack`` calls per hand. The reader yields one ``HandRecord`` at a
+time and ``replay`` plays a recorded hand through an ``Environment`` again.
+"""
+import struct
+from typing import TYPE_CHECKING, BinaryIO, Iterator, NamedTuple
+
+from .card import Card
+from . import events as ev
+from .events import NULL, Event, EventBus
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# region format
+PLAYER_RECORD = 1
+HAND_RECORD = 2
+
+# Actions
+SMALL_BLIND = 0
+BIG_BLIND = 1
+FOLD = 2
+CHECK = 3
+CALL = 4
+RAISE = 5
+ACTION_NAMES = ["SMALL_BLIND", "BIG_BLIND", "FOLD", "CHECK", "CALL", "RAISE"]
+
+# Streets
+PRE_FLOP = 0
+FLOP = 1
+TURN = 2
+RIVER = 3
+
+_NO_CARD = 0xFF
+
+_RECORD = struct.Struct("<BI")         # tag, payload length
+_PLAYER = struct.Struct("<H")          # player id, followed by the name
+_HAND = struct.Struct("<QQBHB")        # hand id, deck seed, seats, actions, board cards
+_SEAT = struct.Struct("<HqBB")         # player id, stack, hole cards
+_ACTION = struct.Struct("<BBBI")       # street, seat, action, amount
+_PAYOUT = struct.Struct("<I")
+
+# Events the writer records when subscribed to a table's bus
+RECORDED_EVENTS = (ev.HAND_START, ev.ACTION, ev.PAYOUT, ev.HAND_END)
+# endregion
+
+
+class Action(NamedTuple):
+    street: int
+    seat: int
+    action: int
+    amount: int
+
+
+class HandRecord(NamedTuple):
+    hand_id: int
+    players: list[str]
+    stacks: list[int]
+    hole_cards: list[tuple[Card, ...]]
+    actions: list[Action]
+    board: list[Card]
+    payouts: list[int]
+    seed: int
+
+
+class HandHistoryWriter():
+    """
+    Records the hands played by an ``Environment``.
+
+    Attach it with ``Environment(history=writer)``, which subscribes ``on_event``
+    to the table's events, and close it (or use it as a context manager) to write
+    the remaining buffered hands.
+    """
+    def __init__(self, path: "Path", buffer_size: int = 1 << 20) -> None:
+        self._file: BinaryIO = open(path, "ab")
+        self._buffer = bytearray()
+        self.buffer_size = buffer_size
+        self._player_ids: dict[str, int] = {}
+        self.hands_written = 0
+
+        # Hand in progress
+        self._seed = 0
+        self._seats: dict[object, int] = {}
+        self._seat_data: list[bytes] = []
+        self._actions: list[bytes] = []
+        self._payouts: list[int] = []
+
+    # region recording
+    def on_event(self, event: Event) -> None:
+        kind = event.kind
+        if kind == ev.ACTION:
+            self.action(*event.args)
+        elif kind == ev.PAYOUT:
+            self.payout(*event.args)
+        elif kind == ev.HAND_START:
+            self.begin_hand(*event.args)
+        elif kind == ev.HAND_END:
+            self.end_hand(*event.args)
+
+    def begin_hand(self, players: list, stacks: list[int] = None, seed: int = 0) -> None:
+        """Starts a hand with the players in seat order (small blind first) and their hole cards dealt."""
+        self._seed = seed
+        self._seats = {player: seat for seat, player in enumerate(players)}
+        self._seat_data = []
+        self._actions = []
+        self._payouts = [0] * len(players)
+        for seat, player in enumerate(players):
+            cards = [card.index for card in player.cards] + [_NO_CARD] * (2 - len(player.cards))
+            stack = stacks[seat] if stacks is not None else player.money
+            self._seat_data.append(_SEAT.pack(self._player_id(player.name), stack, *cards))
+
+    def action(self, street: int, player, action: int, amount: int = 0) -> None:
+        self._actions.append(_ACTION.pack(street, self._seats[player], action, amount))
+
+    def payout(self, player, amount: int) -> None:
+        self._payouts[self._seats[player]] += amount
+
+    def end_hand(self, board: list[Card]) -> None:
+        payload = b"".join((
+            _HAND.pack(self.hands_written, self._seed, len(self._seat_data), len(self._actions), len(board)),
+            *self._seat_data,
+            *self._actions,
+            bytes(card.index for card in board),
+            *(_PAYOUT.pack(amount) for amount in self._payouts),
+        ))
+        self._write(HAND_RECORD, payload)
+        self.hands_written += 1
+    # endregion
+
+    def _player_id(self, name: str) -> int:
+        player_id = self._player_ids.get(name)
+        if player_id is None:
+            player_id = len(self._player_ids)
+            self._player_ids[name] = player_id
+            self._write(PLAYER_RECORD, _PLAYER.pack(player_id) + name.encode())
+        return player_id
+
+    def _write(self, tag: int, payload: bytes) -> None:
+        self._buffer += _RECORD.pack(tag, len(payload))
+        self._buffer += payload
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "HandHistoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_hands(path: "Path") -> Iterator[HandRecord]:
+    """Streams the hands of a history file without loading the whole file."""
+    names: dict[int, str] = {}
+    with open(path, "rb", buffering=1 << 20) as file:
+        while True:
+            header = file.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            tag, length = _RECORD.unpack(header)
+            payload = file.read(length)
+
+            if tag == PLAYER_RECORD:
+                (player_id,) = _PLAYER.unpack_from(payload)
+                names[player_id] = payload[_PLAYER.size:].decode()
+            elif tag == HAND_RECORD:
+                yield _parse_hand(payload, names)
+
+
+def _parse_hand(payload: bytes, names: dict[int, str]) -> HandRecord:
+    hand_id, seed, num_seats, num_actions, num_board = _HAND.unpack_from(payload)
+    offset = _HAND.size
+
+    players, stacks, hole_cards = [], [], []
+    for player_id, stack, *cards in _SEAT.iter_unpack(payload[offset:offset + num_seats * _SEAT.size]):
+        players.append(names[player_id])
+        stacks.append(stack)
+        hole_cards.append(tuple(Card.from_index(card) for card in cards if card != _NO_CARD))
+    offset += num_seats * _SEAT.size
+
+    actions = [Action(*action) for action in _ACTION.iter_unpack(payload[offset:offset + num_actions * _ACTION.size])]
+    offset += num_actions * _ACTION.size
+
+    board = [Card.from_index(card) for card in payload[offset:offset + num_board]]
+    offset += num_board
+
+    payouts = [amount for (amount,) in _PAYOUT.iter_unpack(payload[offset:offset + num_seats * _PAYOUT.size])]
+    return HandRecord(hand_id, players, stacks, hole_cards, actions, board, payouts, seed)
+
+
+# region replay
+class StackedDeck():
+    """Deck that deals a fixed sequence of cards, used to replay recorded hands."""
+    def __init__(self, cards: list[Card]) -> None:
+        self.cards = cards
+        self._cursor = 0
+
+    def seed(self, seed: int) -> None:
+        pass
+
+    def shuffle(self) -> None:
+        pass
+
+    def draw(self, num: int = 0) -> Card:
+        card = self.cards[self._cursor + num]
+        self._cursor += 1
+        return card
+
+    def reset(self) -> None:
+        self._cursor = 0
+
+    def snapshot(self) -> bytes:
+        return bytes((self._cursor,))
+
+    def restore(self, state: bytes) -> None:
+        self._cursor = state[0]
+
+
+def _deal_order(hand: HandRecord) -> list[Card]:
+    """Arranges the recorded cards in the order the ``Environment`` draws them."""
+    cards = [cards[0] for cards in hand.hole_cards] + [cards[1] for cards in hand.hole_cards]
+    # Burned cards were not recorded, any card that is not in play will do
+    used = set(cards) | set(hand.board)
+    burn = next(Card.from_index(i) for i in range(52) if Card.from_index(i) not in used)
+    board = hand.board
+    for street in (board[:3], board[3:4], board[4:5]):
+        cards += [burn] + street
+    return cards
+
+
+def _scripted_strategy(actions: list[Action]):
+    moves = iter(actions)
+
+    def strategy(player, prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+        action = next(moves)
+        # Raises are recorded with the chips put in, which includes calling the previous raise
+        return ACTION_NAMES[action.action], action.amount - prev_raise
+
+    return strategy
+
+
+def replay(hand: HandRecord, events: EventBus = NULL, history: HandHistoryWriter = None):
+    """Plays a recorded hand through a fresh ``Environment`` and returns the environment."""
+    from .environment import Environment
+    from .player import Player
+
+    env = Environment(events=events, deck=StackedDeck(_deal_order(hand)), history=history)
+    for seat, name in enumerate(hand.players):
+        actions = [a for a in hand.actions if a.seat == seat and a.action not in (SMALL_BLIND, BIG_BLIND)]
+        player = Player(name, strategy=_scripted_strategy(actions), events=events)
+        env.add_player(player)
+        player._money = hand.stacks[seat]
+    env.start_game(hand.seed)
+    return env
+# endregion
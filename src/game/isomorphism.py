@@ -0,0 +1,69 @@
+"""
+Suit isomorphism of hole cards and boards.
+
+Suits have no rank in poker, so two situations that only differ by a
+renaming of the suits (A♥K♥ on 7♥7♦2♣ and A♠K♠ on 7♠7♣2♦) have the same
+equities, strategies and so on. Up to 24 situations share one canonical
+form, e.g. the 22100 flops reduce to 1755 and the 1326 starting hands to
+169.
+
+A situation is described per suit by the ranks it has on the board and in
+the hole. Sorting the suits by that signature and renaming them in that
+order gives the canonical form: isomorphic situations have the same
+signatures, so they end up with the same cards. Cards are 0-51 indices
+(see ``evaluator.encode``).
+"""
+from itertools import permutations
+from typing import Sequence
+
+NUM_SUITS = 4
+# Renamings of the suits, ``SUIT_PERMUTATIONS[i][suit]`` is the new name of a suit
+SUIT_PERMUTATIONS: list[tuple[int, ...]] = list(permutations(range(NUM_SUITS)))
+_PERMUTATION_INDEX = {suits: i for i, suits in enumerate(SUIT_PERMUTATIONS)}
+_RANK_BITS = 13
+
+
+def _signatures(hole: Sequence[int], board: Sequence[int]) -> list[int]:
+    """The ranks of every suit on the board and in the hole as one number per suit."""
+    signatures = [0] * NUM_SUITS
+    for card in board:
+        signatures[card & 3] |= 1 << (_RANK_BITS + (card >> 2))
+    for card in hole:
+        signatures[card & 3] |= 1 << (card >> 2)
+    return signatures
+
+
+def canonical_permutation(hole: Sequence[int], board: Sequence[int] = ()) -> int:
+    """The index in ``SUIT_PERMUTATIONS`` of the renaming that makes a situation canonical."""
+    signatures = _signatures(hole, board)
+    suits = [0] * NUM_SUITS
+    for name, suit in enumerate(sorted(range(NUM_SUITS), key=signatures.__getitem__, reverse=True)):
+        suits[suit] = name
+    return _PERMUTATION_INDEX[tuple(suits)]
+
+
+def rename(cards: Sequence[int], permutation: int) -> list[int]:
+    suits = SUIT_PERMUTATIONS[permutation]
+    return [card - (card & 3) + suits[card & 3] for card in cards]
+
+
+def canonical(hole: Sequence[int], board: Sequence[int] = ()) -> tuple[tuple[int, ...], tuple[int, ...], int]:
+    """
+    The canonical hole cards and board of a situation, both sorted, and the index of
+    the renaming of the suits that leads there.
+    """
+    permutation = canonical_permutation(hole, board)
+    return tuple(sorted(rename(hole, permutation))), tuple(sorted(rename(board, permutation))), permutation
+
+
+def canonical_index(hole: Sequence[int], board: Sequence[int] = ()) -> int:
+    """
+    A number that is equal for two situations exactly if they are isomorphic.
+
+    The number packs the sorted suit signatures, so it is a key for lookups and
+    caches rather than a dense index.
+    """
+    index = 0
+    for signature in sorted(_signatures(hole, board), reverse=True):
+        index = (index << (2 * _RANK_BITS)) | signature
+    return index
@@ -0,0 +1,28 @@
+"""
+Player names in binary files.
+
+The stats store and the opponent model save the names of their players as
+one block: every name is its UTF-8 length followed by the UTF-8 bytes, so a
+name may hold any character, line breaks included.
+"""
+import struct
+from typing import Iterable
+
+_LENGTH = struct.Struct("<I")
+
+
+def pack_names(names: Iterable[str]) -> bytes:
+    encoded = [name.encode() for name in names]
+    return b"".join(_LENGTH.pack(len(name)) + name for name in encoded)
+
+
+def unpack_names(block: bytes, count: int) -> list[str]:
+    """Reads ``count`` names written by ``pack_names``."""
+    names = []
+    offset = 0
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(block, offset)
+        offset += _LENGTH.size
+        names.append(bytes(block[offset:offset + length]).decode())
+        offset += length
+    return names
@@ -0,0 +1,215 @@
+"""
+Opponent models built from the actions players take.
+
+Every player known to an ``OpponentModel`` has one row of counters in a
+NumPy matrix: hands dealt, hands voluntarily played (VPIP), preflop raises,
+hands won and how often they folded, checked, called or raised on every
+street. Subscribed to a table's events (``model.attach(env)``) the counters
+are updated as the actions happen, one increment per action. One model can
+watch many tables at once.
+
+Features and action probabilities are computed from the counters for many
+players in one vectorized call, e.g. for every seat of every table in a
+simulation. Profiles are saved to a compact binary file and loading them
+memory-maps the counters, so only the rows of the requested players are
+read.
+"""
+import struct
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from . import events as ev
+from . import history
+from .events import Event
+from .names import pack_names, unpack_names
+
+NUM_STREETS = 4
+# Folds, checks, calls and raises in the order of the history action codes
+NUM_ACTIONS = 4
+_FIRST_ACTION = history.FOLD
+
+# region counters
+HANDS = 0
+VPIP = 1
+PFR = 2
+WINS = 3
+ACTIONS = 4     # NUM_STREETS * NUM_ACTIONS counters, ``ACTIONS + street * NUM_ACTIONS + action``
+NUM_COUNTERS = ACTIONS + NUM_STREETS * NUM_ACTIONS
+# endregion
+
+# region features
+FEATURE_NAMES = ("hands", "vpip", "pfr", "aggression", "fold_to_bet", "win_rate")
+NUM_FEATURES = len(FEATURE_NAMES)
+# endregion
+
+# Pseudo counts of the action probabilities of an unknown player (fold, call/check, raise)
+PRIOR = np.array([1.0, 2.0, 1.0])
+
+_MAGIC = b"OPPM"
+_VERSION = 2
+# magic, version, number of players, number of counters, length of the names block (see ``names``)
+_HEADER = struct.Struct("<4sHIHI")
+
+
+def _rate(count: np.ndarray, total: np.ndarray) -> np.ndarray:
+    return np.divide(count, total, out=np.zeros_like(count), where=total > 0)
+
+
+class OpponentModel():
+    def __init__(self, capacity: int = 64) -> None:
+        self.rows: dict[str, int] = {}
+        self.names: list[str] = []
+        self.counts = np.zeros((capacity, NUM_COUNTERS), dtype=np.int32)
+        # Whether a player already counted for VPIP / PFR in the current hand
+        self._voluntary = np.zeros(capacity, dtype=bool)
+        self._raised = np.zeros(capacity, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.rows
+
+    # region rows
+    def row(self, name: str) -> int:
+        """Returns the row of a player, adding unknown players."""
+        row = self.rows.get(name)
+        if row is None:
+            row = len(self.names)
+            if row == len(self.counts):
+                self._grow(2 * row)
+            self.rows[name] = row
+            self.names.append(name)
+        return row
+
+    def rows_of(self, names: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.row(name) for name in names), dtype=np.intp)
+
+    def _grow(self, capacity: int) -> None:
+        counts = np.zeros((capacity, NUM_COUNTERS), dtype=np.int32)
+        counts[:len(self.counts)] = self.counts
+        self.counts = counts
+        self._voluntary = np.resize(self._voluntary, capacity)
+        self._raised = np.resize(self._raised, capacity)
+    # endregion
+
+    # region updates
+    def attach(self, env) -> None:
+        """Updates the model with everything that happens at the table of an ``Environment``."""
+        env.events.subscribe(self.on_event, ev.DEBUG, (ev.HAND_START, ev.ACTION, ev.PAYOUT))
+
+    def on_event(self, event: Event) -> None:
+        kind = event.kind
+        if kind == ev.ACTION:
+            street, player, action, _ = event.args
+            self.observe(player.name, street, action)
+        elif kind == ev.HAND_START:
+            self.new_hand(player.name for player in event.args[0])
+        elif kind == ev.PAYOUT:
+            player, amount = event.args
+            if amount > 0:
+                self.counts[self.row(player.name), WINS] += 1
+
+    def new_hand(self, names: Iterable[str]) -> None:
+        rows = self.rows_of(names)
+        self.counts[rows, HANDS] += 1
+        self._voluntary[rows] = False
+        self._raised[rows] = False
+
+    def observe(self, name: str, street: int, action: int) -> None:
+        """Counts one action (a ``history`` action code), blinds are not counted."""
+        if action < _FIRST_ACTION:
+            return
+        row = self.rows.get(name)
+        if row is None:
+            row = self.row(name)
+        counts = self.counts
+        counts[row, ACTIONS + street * NUM_ACTIONS + action - _FIRST_ACTION] += 1
+        if street == history.PRE_FLOP and action >= history.CALL:
+            if not self._voluntary[row]:
+                self._voluntary[row] = True
+                counts[row, VPIP] += 1
+            if action == history.RAISE and not self._raised[row]:
+                self._raised[row] = True
+                counts[row, PFR] += 1
+    # endregion
+
+    # region scoring
+    def features(self, rows: Sequence[int]) -> np.ndarray:
+        """
+        Returns one row of ``FEATURE_NAMES`` per player: hands seen, VPIP, PFR,
+        aggression (raises per raise or call), folds per decision facing a bet and
+        hands won per hand. Rates of players without data are 0.
+        """
+        counts = self.counts[np.asarray(rows, dtype=np.intp)].astype(np.float64)
+        actions = counts[:, ACTIONS:].reshape(-1, NUM_STREETS, NUM_ACTIONS).sum(axis=1)
+        folds, _, calls, raises = actions.T
+        hands = counts[:, HANDS]
+
+        features = np.empty((len(counts), NUM_FEATURES), dtype=np.float32)
+        features[:, 0] = hands
+        features[:, 1] = _rate(counts[:, VPIP], hands)
+        features[:, 2] = _rate(counts[:, PFR], hands)
+        features[:, 3] = _rate(raises, raises + calls)
+        features[:, 4] = _rate(folds, folds + calls + raises)
+        features[:, 5] = _rate(counts[:, WINS], hands)
+        return features
+
+    def action_probabilities(self, rows: Sequence[int], streets: Sequence[int], facing_bet: Sequence[bool]) -> np.ndarray:
+        """
+        Predicts how likely every player folds, calls (or checks) and raises in
+        the given situations, one row of probabilities per player.
+
+        The observed frequencies on the street are smoothed with ``PRIOR``. A
+        player not facing a bet is assumed to never fold.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        streets = np.asarray(streets, dtype=np.intp)
+        facing_bet = np.asarray(facing_bet, dtype=bool)
+
+        first = ACTIONS + streets * NUM_ACTIONS
+        counts = self.counts[rows[:, None], first[:, None] + np.arange(NUM_ACTIONS)].astype(np.float64)
+        # Calling a bet and checking are both the passive choice
+        weights = np.empty((len(rows), 3))
+        weights[:, 0] = np.where(facing_bet, counts[:, 0], 0.0)
+        weights[:, 1] = np.where(facing_bet, counts[:, 2], counts[:, 1])
+        weights[:, 2] = counts[:, 3]
+        weights += PRIOR
+        weights[~facing_bet, 0] = 0.0
+        return weights / weights.sum(axis=1, keepdims=True)
+    # endregion
+
+    # region persistence
+    def save(self, path: Path) -> None:
+        names = pack_names(self.names)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(self.names), NUM_COUNTERS, len(names)))
+            file.write(names)
+            file.write(np.ascontiguousarray(self.counts[:len(self.names)], dtype="<i4").tobytes())
+
+    @classmethod
+    def load(cls, path: Path, names: Iterable[str] = None) -> "OpponentModel":
+        """Loads the saved profiles of the given players (all if None), unknown players start empty."""
+        with open(path, "rb") as file:
+            magic, version, num_players, num_counters, names_length = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION or num_counters != NUM_COUNTERS:
+                raise ValueError(f"[E] {path} is not an opponent model file.")
+            saved_names = unpack_names(file.read(names_length), num_players)
+
+        model = cls(capacity=max(num_players, 1) if names is None else 64)
+        if num_players == 0:
+            if names is not None:
+                model.rows_of(names)
+            return model
+        saved_counts = np.memmap(path, dtype="<i4", mode="r", offset=_HEADER.size + names_length, shape=(num_players, num_counters))
+        saved_rows = {name: row for row, name in enumerate(saved_names)}
+
+        wanted = saved_names if names is None else list(names)
+        rows = model.rows_of(wanted)
+        known = np.array([name in saved_rows for name in wanted], dtype=bool)
+        source = np.array([saved_rows[name] for name in wanted if name in saved_rows], dtype=np.intp)
+        model.counts[rows[known]] = saved_counts[source]
+        return model
+    # endregion
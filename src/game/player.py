@@ -1,5 +1,15 @@
-from . import game_rules
+from array import array
+from typing import TYPE_CHECKING
+
+from . import betting, game_rules
 from .card import Card
+from .hand_state import HandState
+from . import events as ev
+from .events import CONSOLE, EventBus
+from .strategies import Strategy, console_strategy
+
+if TYPE_CHECKING:
+    from .seating import Seating
 
 class OutOfMoneyError(Exception):
     pass
@@ -8,16 +18,25 @@ class InsufficientMoneyError(Exception):
     pass
 
 class Player():    
-    def __init__(self, name: str = None) -> None:
+    def __init__(self, name: str = None, strategy: Strategy = None, events: EventBus = None) -> None:
         # if not name:
         #     name = input("Enter player name: ")
         self.name = name
+        self.strategy: Strategy = strategy if strategy is not None else console_strategy
+        self.events: EventBus = events if events is not None else CONSOLE
 
         self.cards: list[Card] = []
+        # Hole cards and board, updated card by card by the environment
+        self.hand_state: HandState = HandState()
 
-        self._money = 0
-        self.bet_this_round = 0
-        self.bet_this_game = 0
+        # Money and bets live in the arrays of the seating the player sits at,
+        # an unseated player has single element arrays of its own
+        self.seat: int = None
+        self._seating: "Seating" = None
+        self._slot = 0
+        self._stacks = array("q", [0])
+        self._bets = array("q", [0])
+        self._contributions = array("q", [0])
         
         # Stats
         self.money_earned = 0
@@ -27,11 +46,51 @@ class Player():
         self.times_checked = 0
         self.times_called = 0
 
-        self.prev_player: Player = None
-        self.next_player: Player = None
-        
-        print(f"[P] Player created: " + self.name)
+        self.events.emit(ev.PLAYER, ev.INFO, "[P] Player created: {}", self.name)
     
+    # region seat storage
+    def _bind(self, seating: "Seating", seat: int) -> None:
+        self.seat = seat
+        self._seating = seating
+        self._slot = seat
+        self._stacks = seating.stacks
+        self._bets = seating.bets
+        self._contributions = seating.contributions
+
+    def _unbind(self) -> None:
+        slot = self._slot
+        self._stacks = array("q", [self._stacks[slot]])
+        self._bets = array("q", [self._bets[slot]])
+        self._contributions = array("q", [self._contributions[slot]])
+        self.seat = None
+        self._seating = None
+        self._slot = 0
+
+    @property
+    def _money(self) -> int:
+        return self._stacks[self._slot]
+
+    @_money.setter
+    def _money(self, value: int) -> None:
+        self._stacks[self._slot] = value
+
+    @property
+    def bet_this_round(self) -> int:
+        return self._bets[self._slot]
+
+    @bet_this_round.setter
+    def bet_this_round(self, value: int) -> None:
+        self._bets[self._slot] = value
+
+    @property
+    def bet_this_game(self) -> int:
+        return self._contributions[self._slot]
+
+    @bet_this_game.setter
+    def bet_this_game(self, value: int) -> None:
+        self._contributions[self._slot] = value
+    # endregion
+
     @property
     def money(self) -> int:
         return self._money
@@ -44,11 +103,14 @@ class Player():
             raise OutOfMoneyError(f"[!] {self.name} has no money left")
         if new_balance > self._money:
             money_made = new_balance - self._money
-            print(f"[+$] {self.name} gains {money_made}")
+            # Checking the level first skips even packing the arguments when nobody listens
+            if self.events.level <= ev.INFO:
+                self.events.emit(ev.MONEY, ev.INFO, "[+$] {} gains {}", self.name, money_made)
             self.money_earned += money_made
         elif new_balance < self._money:
             money_spent = self._money - new_balance
-            print(f"[-$] {self.name} spends {money_spent}")
+            if self.events.level <= ev.INFO:
+                self.events.emit(ev.MONEY, ev.INFO, "[-$] {} spends {}", self.name, money_spent)
             self.money_lost += money_spent
             self.bet_this_game += money_spent
             self.bet_this_round += money_spent
@@ -59,92 +121,143 @@ class Player():
     def playing(self) -> bool:
         return len(self.cards) > 0
     
+    def hand_equity(self, table_cards: list[Card], num_opponents: int = 1, **kwargs):
+        """
+        Estimates the equity of the player's hole cards given the known table cards.
+
+        See ``equity.equity`` for the supported keyword arguments (ranges, margin, ...).
+        Without any, the estimate is shared by all isomorphic situations (see ``equity.cached_equity``).
+        """
+        # Imported here so console games do not require NumPy
+        from .equity import cached_equity, equity
+        if not kwargs:
+            return cached_equity(self.cards, table_cards, num_opponents)
+        return equity(self.cards, table_cards, num_opponents=num_opponents, **kwargs)
+
+    def preflop_equity(self, table_size: int) -> float:
+        """Looks up the precomputed preflop equity of the player's hole cards at a table of the given size."""
+        from .preflop import preflop_equity
+        return preflop_equity(self.cards[0], self.cards[1], table_size)
+
     def deal_card(self, card: Card) -> None:
         if len(self.cards) >= game_rules.MAX_POSSIBLE_CARDS_ON_HAND:
             raise ValueError(f"[E] Cannot have more than {game_rules.MAX_POSSIBLE_CARDS_ON_HAND} cards.")
 
         self.cards.append(card)
+        self.hand_state.add_card(card)
 
-        print("[D] " + self.name + " drew " + card.__str__())
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.DEAL, ev.INFO, "[D] {} drew {}", self.name, card)
     
-    def make_move(self, prev_raise: int = 0, can_re_raise: bool = True) -> int:
+    def make_move(self, prev_raise: int = 0, can_re_raise: bool = True, max_raise: int = None) -> int:
+        self.prepare_move(prev_raise)
+        action, amount = self.strategy(self, prev_raise, can_re_raise)
+        return self.apply_move(action, amount, prev_raise, can_re_raise, max_raise)
+
+    def prepare_move(self, prev_raise: int = 0) -> None:
+        """Announces the player's turn, whether the player may raise is up to the ``BettingRound``."""
         if prev_raise < 0:
             raise ValueError("[E] Previous raise cannot be smaller than 0!")
-        # Decide move
-        print(f"[M] {self.name}'s turn")
+        # Decide move
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {}'s turn", self.name)
         
-        can_re_raise = can_re_raise and self.money >= prev_raise + game_rules.BIG_BLIND
-
         if prev_raise > 0:
-            print(f"[i] Amount needed to Call {prev_raise} ({self._money} left)")
-            if can_re_raise:
-                action = input(f"[?] CALL / RAISE / FOLD")
-            else:
-                action = input(f"[?] CALL / FOLD")
-        else:
-            action = input(f"[?] CHECK / RAISE / FOLD")
+            if self.events.level <= ev.INFO:
+                self.events.emit(ev.MOVE, ev.INFO, "[i] Amount needed to Call {} ({} left)", prev_raise, self._money)
+
+    def apply_move(self, action: str, amount: int, prev_raise: int = 0, can_re_raise: bool = True, max_raise: int = None) -> int:
+        """
+        Carries out a decided move, returns the amount bet or None if the player folds.
 
+        ``can_re_raise`` and ``max_raise`` are the betting round's, see ``raise_error``.
+        """
         match action:
             case "CALL":
                 return self._call(previous_raise=prev_raise)
-            case "RAISE":
-                return self._raise(previous_raise=prev_raise)
-            case "CHECK":
+            case "RAISE" if can_re_raise:
+                return self._raise(previous_raise=prev_raise, amount_to_raise=amount, max_raise=max_raise)
+            case "CHECK" if prev_raise == 0:
                 return self._check()
             case "FOLD":
                 return self._fold()
             case _:
-                print("[E] Invalid action")
-                self.make_move(prev_raise=prev_raise, can_re_raise=can_re_raise)
+                raise ValueError(f"[E] Invalid action {action}")
     
-    def _raise(self, previous_raise: int = 0) -> int:
-        self.times_raised += 1
+    def raise_error(self, amount_to_raise: int, previous_raise: int = 0, max_raise: int = None) -> str:
+        """
+        Returns why raising by the given amount is not allowed or None if it is.
+
+        ``max_raise`` is the betting round's limit, without one it is worked out
+        from the player's money by the same rule.
+        """
+        if max_raise is None:
+            max_raise = betting.max_raise(self._money, previous_raise)
+        if amount_to_raise < 0:
+            return "[E] Amount needs to be positive integer"
+        elif amount_to_raise > max_raise:
+            return "[E] Player does not have enough money."
+        elif amount_to_raise < game_rules.MIN_BET:
+            return f"[E] Raised amount needs to be at least the min bet {game_rules.MIN_BET}."
+        return None
 
-        valid = False
-        while not valid:
-            amount_to_raise = input(f"[?] How much do you want to raise (at least {game_rules.MIN_BET})? ({self._money} left)")
-            if amount_to_raise < 0:
-                print("[E] Amount needs to be positive integer")
-            elif amount_to_raise + previous_raise > self._money:
-                print("[E] Player does not have enough money.")
-            elif amount_to_raise < game_rules.MIN_BET:
-                print(f"[E] Raised amount needs to be at least the min bet {game_rules.MIN_BET}.")
-            else:
-                valid = True
+    def _raise(self, previous_raise: int = 0, amount_to_raise: int = game_rules.MIN_BET, max_raise: int = None) -> int:
+        error = self.raise_error(amount_to_raise, previous_raise, max_raise)
+        if error is not None:
+            raise ValueError(error)
+        self.times_raised += 1
         
         self.money = self.money - amount_to_raise - previous_raise
-        print(f"[M] {self.name} raises for {amount_to_raise}. ({self._money} left)")
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {} raises for {}. ({} left)", self.name, amount_to_raise, self._money)
 
         return amount_to_raise
     
     def _call(self, previous_raise: int) -> int:
         self.times_called += 1
 
-        if previous_raise > self._money:
-            print("[E] Player does not have enough money.")
-            return self._fold()
+        if previous_raise >= self._money:
+            return self._all_in()
         
         self.money = self.money - previous_raise
-        print(f"[M] {self.name} calls {previous_raise}. ({self._money} left)")
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {} calls {}. ({} left)", self.name, previous_raise, self._money)
         
         return previous_raise
     
+    def _all_in(self) -> int:
+        """Puts the rest of the player's money in the pot, the player stays in the hand without acting again."""
+        amount = self._money
+        self.money_lost += amount
+        self.bet_this_game += amount
+        self.bet_this_round += amount
+        # Bypasses the money setter, a balance of 0 is only allowed until the hand is settled
+        self._money = 0
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {} goes all in with {}.", self.name, amount)
+
+        return amount
+
     def _fold(self) -> None:
         self.times_folded += 1
 
-        print(f"[M] {self.name} folds his cards")
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {} folds his cards", self.name)
         return None
     
     def _check(self) -> int:
         self.times_checked += 1
-        print(f"[M] {self.name} checks.")
+        if self.events.level <= ev.INFO:
+            self.events.emit(ev.MOVE, ev.INFO, "[M] {} checks.", self.name)
         return 0
     
     def pay_big_blind(self) -> bool:
         self.money = self.money - game_rules.BIG_BLIND
+        return True
             
     def pay_small_blind(self) -> bool:
         self.money = self.money - game_rules.SMALL_BLIND
+        return True
     
     def __str__(self) -> str:
         string = "--------------------------------------\n"
@@ -0,0 +1,105 @@
+"""
+Main and side pots.
+
+Every player's chips put in during a hand (``bet_this_game``) is all that is
+needed to settle it. Sorting the players by their contribution, each player
+still in the hand caps a pot at their contribution: it holds what everybody
+put in up to that level and can only be won by the players who put in at
+least as much. Folded players' chips stay in the pots they reached, but they
+cannot win them.
+
+``build_pots`` does this in one pass over the sorted contributions and
+``settle`` walks the pots back from the last side pot to the main pot,
+keeping the best hand seen so far, so a hand is settled in O(n log n).
+"""
+from typing import NamedTuple, Sequence
+
+
+class Pot(NamedTuple):
+    amount: int
+    # Players who can win the pot
+    eligible: tuple[int, ...]
+
+
+def _sorted_pots(contributions: Sequence[int], folded: Sequence[bool]) -> tuple[list[int], list[tuple[int, int]]]:
+    """
+    Returns the players still in the hand sorted by their contribution and the
+    pots as ``(amount, first)`` pairs, the pot can be won by ``contenders[first:]``.
+    """
+    num_players = len(contributions)
+    order = sorted(range(num_players), key=contributions.__getitem__)
+    contenders: list[int] = []
+    pots: list[tuple[int, int]] = []
+    level = 0
+    amount = 0
+    for i, player in enumerate(order):
+        contribution = contributions[player]
+        if contribution > level:
+            # Everybody from here on put in at least this much
+            amount += (contribution - level) * (num_players - i)
+            level = contribution
+        if not folded[player]:
+            if amount:
+                pots.append((amount, len(contenders)))
+                amount = 0
+            contenders.append(player)
+
+    # Chips of folded players above the last contender's level go to the last pot
+    if amount and pots:
+        last_amount, first = pots[-1]
+        pots[-1] = (last_amount + amount, first)
+    elif amount and contenders:
+        pots.append((amount, 0))
+    return contenders, pots
+
+
+def build_pots(contributions: Sequence[int], folded: Sequence[bool]) -> list[Pot]:
+    """
+    Splits the chips every player put in into the main pot followed by the side pots.
+
+    Players are identified by their index in ``contributions``.
+    """
+    contenders, pots = _sorted_pots(contributions, folded)
+    return [Pot(amount, tuple(contenders[first:])) for amount, first in pots]
+
+
+def settle(
+        contributions: Sequence[int],
+        folded: Sequence[bool],
+        strengths: Sequence[int],
+        positions: Sequence[int] = None
+        ) -> list[int]:
+    """
+    Returns how many chips every player wins.
+
+    Each pot is split evenly between the eligible players with the highest
+    strength (e.g. from ``evaluator.evaluate``). Chips that cannot be split
+    evenly go to the winners with the lowest position, one chip each, so pass
+    the positions relative to the small blind to hand them out from the left of
+    the dealer. The strengths of folded players are ignored.
+    """
+    contenders, pots = _sorted_pots(contributions, folded)
+    payouts = [0] * len(contributions)
+
+    best = -1
+    winners: list[int] = []
+    remaining = len(contenders)
+    for amount, first in reversed(pots):
+        while remaining > first:
+            remaining -= 1
+            player = contenders[remaining]
+            strength = strengths[player]
+            if strength > best:
+                best = strength
+                winners = [player]
+            elif strength == best:
+                winners.append(player)
+
+        share, odd_chips = divmod(amount, len(winners))
+        if odd_chips:
+            ordered = sorted(winners, key=positions.__getitem__ if positions is not None else None)
+            for player in ordered[:odd_chips]:
+                payouts[player] += 1
+        for player in winners:
+            payouts[player] += share
+    return payouts
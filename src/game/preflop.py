@@ -0,0 +1,135 @@
+"""
+Precomputed preflop equity of the 169 distinct starting hands.
+
+Starting hands only differ strategically by their ranks and whether they are
+suited, so they fall into 169 hand classes laid out as a 13x13 matrix: pairs
+on the diagonal, suited hands at ``[high][low]`` and offsuit hands at
+``[low][high]``.
+
+The table holds the equity of every class against 1 to 9 random opponents.
+It is generated offline (``python -m src.game.preflop``) into a small binary
+file, which is memory-mapped on first use so looking up a hand is O(1) and
+loading costs next to nothing.
+"""
+import argparse
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+
+from . import equity
+from .card import Card, Suit, Value
+
+NUM_RANKS = len(Value)
+NUM_CLASSES = NUM_RANKS * NUM_RANKS
+MAX_OPPONENTS = 9
+
+DEFAULT_PATH = Path(__file__).parent / "data" / "preflop_equity.bin"
+
+_MAGIC = b"PFEQ"
+_VERSION = 1
+# magic, version, number of hand classes, number of opponent counts, padded to 16 bytes
+_HEADER = struct.Struct("<4sHHH6x")
+
+_RANK_NAMES = [value.value if value != Value.TEN else "T" for value in Value]
+
+
+# region hand classes
+def hand_class(first: Card, second: Card) -> int:
+    """Returns the hand class (0-168) of two hole cards."""
+    high, low = first.index >> 2, second.index >> 2
+    if high < low:
+        high, low = low, high
+    if (first.index & 3) == (second.index & 3):
+        return high * NUM_RANKS + low
+    return low * NUM_RANKS + high
+
+
+def class_name(hand: int) -> str:
+    """Returns the common name of a hand class, e.g. ``"AKs"``, ``"72o"`` or ``"QQ"``."""
+    row, column = divmod(hand, NUM_RANKS)
+    if row == column:
+        return _RANK_NAMES[row] * 2
+    if row > column:
+        return _RANK_NAMES[row] + _RANK_NAMES[column] + "s"
+    return _RANK_NAMES[column] + _RANK_NAMES[row] + "o"
+
+
+def representative(hand: int) -> tuple[Card, Card]:
+    """Returns hole cards belonging to a hand class."""
+    row, column = divmod(hand, NUM_RANKS)
+    suits = list(Suit)
+    values = list(Value)
+    if row > column:
+        return Card(values[row], suits[0]), Card(values[column], suits[0])
+    return Card(values[column], suits[0]), Card(values[row], suits[1])
+# endregion
+
+
+# region table file
+def build_table(max_opponents: int = MAX_OPPONENTS, margin: float = 0.005, seed: int = 0, verbose: bool = False) -> np.ndarray:
+    """Simulates the equity of every hand class against 1 to ``max_opponents`` random opponents."""
+    rng = np.random.default_rng(seed)
+    table = np.zeros((NUM_CLASSES, max_opponents), dtype=np.float32)
+    for hand in range(NUM_CLASSES):
+        start = time.perf_counter()
+        for opponents in range(1, max_opponents + 1):
+            result = equity.equity(representative(hand), num_opponents=opponents, margin=margin, rng=rng)
+            table[hand, opponents - 1] = result.equity
+        if verbose:
+            print(f"[i] {class_name(hand):>3}: {' '.join(f'{e:.3f}' for e in table[hand])} ({time.perf_counter() - start:.1f}s)")
+    return table
+
+
+def write_table(table: np.ndarray, path: Path = DEFAULT_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, table.shape[0], table.shape[1]))
+        file.write(np.ascontiguousarray(table, dtype="<f4").tobytes())
+
+
+class PreflopTable():
+    """Read only, memory-mapped view of a preflop equity table file."""
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        with open(path, "rb") as file:
+            magic, version, classes, opponents = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION or classes != NUM_CLASSES:
+            raise ValueError(f"[E] {path} is not a preflop equity table.")
+        self.max_opponents: int = opponents
+        self.table = np.memmap(path, dtype="<f4", mode="r", offset=_HEADER.size, shape=(classes, opponents))
+
+    def equity(self, first: Card, second: Card, num_opponents: int) -> float:
+        if not 1 <= num_opponents <= self.max_opponents:
+            raise ValueError(f"[E] Number of opponents must be between 1 and {self.max_opponents}.")
+        return float(self.table[hand_class(first, second), num_opponents - 1])
+
+
+_table: PreflopTable = None
+
+
+def default_table() -> PreflopTable:
+    """The table at ``DEFAULT_PATH``, mapped on first use."""
+    global _table
+    if _table is None:
+        _table = PreflopTable()
+    return _table
+
+
+def preflop_equity(first: Card, second: Card, table_size: int) -> float:
+    """Equity of two hole cards at a table with ``table_size`` players (including the player)."""
+    return default_table().equity(first, second, table_size - 1)
+# endregion
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates the preflop equity table.")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--margin", type=float, default=0.005, help="95%% confidence margin per entry")
+    parser.add_argument("--opponents", type=int, default=MAX_OPPONENTS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_table(build_table(args.opponents, args.margin, args.seed, verbose=True), args.path)
+    print(f"[i] Written to {args.path}")
@@ -0,0 +1,218 @@
+"""
+Opt-in timing of the phases of a hand.
+
+Give an ``Environment`` (or a ``Game``) a ``HandProfiler`` and it records
+the wall and CPU time of every phase of every hand (dealing, blinds, each
+street, the showdown and the clean-up afterwards) and of every decision of
+every player. Without a profiler the only cost is an ``is not None`` check
+per phase.
+
+Reading the CPU clock costs a few hundred nanoseconds on most systems,
+``HandProfiler(cpu=False)`` records wall times only for about a third of
+the overhead.
+
+Times are kept in ``Histogram``s with four buckets per power of two, so
+recording is a handful of integer operations and percentiles are accurate
+to about 10%. Street times exclude the players' decisions made during the
+street, which are recorded per player instead; the ``hand`` phase includes
+everything. Decisions are only timed when the hand is driven by
+``start_game``, other drivers such as the table server count the wait for
+a move as part of the street.
+
+A profile is exported as a text table (``summary``), JSON (``write_json``)
+or a ``pstats`` file (``dump_stats``) that ``python -m pstats`` and other
+profile viewers open.
+"""
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# region phases
+DEAL = "deal"
+BLINDS = "blinds"
+PRE_FLOP = "pre_flop"
+FLOP = "flop"
+TURN = "turn"
+RIVER = "river"
+SHOWDOWN = "showdown"
+CLEANUP = "cleanup"
+HAND = "hand"
+STREETS = (PRE_FLOP, FLOP, TURN, RIVER)
+PHASES = (DEAL, BLINDS, *STREETS, SHOWDOWN, CLEANUP, HAND)
+# endregion
+
+_SUB_BUCKETS = 4
+_NUM_BUCKETS = 8 + 64 * _SUB_BUCKETS
+
+# Wall ns, CPU ns and the decision times recorded so far when a phase started
+Mark = tuple[int, int, int, int]
+
+
+def _no_clock() -> int:
+    return 0
+
+
+def _bucket(ns: int) -> int:
+    """Histogram bucket of a duration, exact below 8ns and with 4 buckets per power of two above."""
+    if ns < 8:
+        return max(ns, 0)
+    bits = ns.bit_length()
+    return 8 + (bits - 4) * _SUB_BUCKETS + ((ns >> (bits - 3)) & 3)
+
+
+def _bucket_start(bucket: int) -> int:
+    if bucket < 8:
+        return bucket
+    power, sub = divmod(bucket - 8, _SUB_BUCKETS)
+    return (4 + sub) << (power + 1)
+
+
+class Histogram():
+    __slots__ = ("count", "wall", "cpu", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.wall = 0
+        self.cpu = 0
+        self.max = 0
+        self.buckets = [0] * _NUM_BUCKETS
+
+    def add(self, wall: int, cpu: int) -> None:
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        if wall > self.max:
+            self.max = wall
+        self.buckets[_bucket(wall)] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        self.count += other.count
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    @property
+    def mean(self) -> float:
+        return self.wall / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimates the ``q``-th percentile wall time in ns from the middle of its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                start, end = _bucket_start(bucket), _bucket_start(bucket + 1)
+                return min((start + end) / 2, self.max)
+        return float(self.max)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "wall_ns": self.wall,
+            "cpu_ns": self.cpu,
+            "max_ns": self.max,
+            "p50_ns": self.percentile(50),
+            "p99_ns": self.percentile(99),
+            # Sparse, bucket start in ns to count
+            "buckets": {_bucket_start(bucket): count for bucket, count in enumerate(self.buckets) if count},
+        }
+
+
+class HandProfiler():
+    def __init__(self, cpu: bool = True) -> None:
+        self._cpu_clock = time.thread_time_ns if cpu else _no_clock
+        self.phases: dict[str, Histogram] = {}
+        self.decisions: dict[str, Histogram] = {}
+        # Decision time recorded so far, subtracted from the phase the decisions were made in
+        self._decision_wall = 0
+        self._decision_cpu = 0
+
+    # region recording
+    def start(self) -> Mark:
+        return time.perf_counter_ns(), self._cpu_clock(), self._decision_wall, self._decision_cpu
+
+    def lap(self, phase: str, start: Mark, exclusive: bool = True) -> Mark:
+        """Records the time since ``start`` for a phase and returns the start of the next one."""
+        now = self.start()
+        wall, cpu = now[0] - start[0], now[1] - start[1]
+        if exclusive:
+            wall -= now[2] - start[2]
+            cpu -= now[3] - start[3]
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram()
+        histogram.add(wall, cpu)
+        return now
+
+    def decision(self, name: str, start: Mark) -> None:
+        """Records a decision of the named player that started at ``start``."""
+        wall = time.perf_counter_ns() - start[0]
+        cpu = self._cpu_clock() - start[1]
+        self._decision_wall += wall
+        self._decision_cpu += cpu
+        histogram = self.decisions.get(name)
+        if histogram is None:
+            histogram = self.decisions[name] = Histogram()
+        histogram.add(wall, cpu)
+
+    def merge(self, other: "HandProfiler") -> None:
+        """Adds the times of another profiler, e.g. of a worker process."""
+        for own, theirs in ((self.phases, other.phases), (self.decisions, other.decisions)):
+            for name, histogram in theirs.items():
+                own.setdefault(name, Histogram()).merge(histogram)
+    # endregion
+
+    # region export
+    def _rows(self) -> list[tuple[str, Histogram]]:
+        phases = sorted(self.phases.items(), key=lambda item: PHASES.index(item[0]) if item[0] in PHASES else len(PHASES))
+        return phases + [(f"decision: {name}", histogram) for name, histogram in sorted(self.decisions.items())]
+
+    def summary(self) -> str:
+        """The profile as a text table, times per call in microseconds."""
+        hand = self.phases.get(HAND)
+        total = hand.wall if hand is not None and hand.wall else sum(h.wall for h in self.phases.values()) or 1
+        lines = [f"{'phase':<24} {'count':>9} {'total ms':>10} {'share':>7} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9} {'cpu':>5}"]
+        for name, histogram in self._rows():
+            lines.append(
+                f"{name:<24} {histogram.count:>9} {histogram.wall / 1e6:>10.1f} {histogram.wall / total:>7.1%} "
+                f"{histogram.mean / 1e3:>9.2f} {histogram.percentile(50) / 1e3:>9.2f} {histogram.percentile(99) / 1e3:>9.2f} "
+                f"{histogram.max / 1e3:>9.2f} {histogram.cpu / histogram.wall if histogram.wall else 0:>5.0%}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "phases": {name: histogram.to_dict() for name, histogram in self.phases.items()},
+            "decisions": {name: histogram.to_dict() for name, histogram in self.decisions.items()},
+        }
+
+    def write_json(self, path: "Path") -> None:
+        # Imported on use like ``marshal``, every table imports this module but few export a profile
+        import json
+        with open(path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def dump_stats(self, path: "Path") -> None:
+        """
+        Writes the profile in the format of ``cProfile``'s ``dump_stats``: every phase
+        and every player's decisions are a function called from ``hand``.
+        """
+        hand_key = ("environment", 0, HAND)
+        hand = self.phases.get(HAND, Histogram())
+        stats = {hand_key: (hand.count, hand.count, 0.0, hand.wall / 1e9, {})}
+        for name, histogram in self._rows():
+            if name == HAND:
+                continue
+            key = ("strategy" if name.startswith("decision") else "environment", 0, name)
+            seconds = histogram.wall / 1e9
+            stats[key] = (histogram.count, histogram.count, seconds, seconds, {hand_key: (histogram.count, histogram.count, seconds, seconds)})
+        import marshal
+        with open(path, "wb") as file:
+            marshal.dump(stats, file)
+    # endregion
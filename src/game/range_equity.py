@@ -0,0 +1,273 @@
+"""
+Equity of hands and ranges against a weighted range of opponent holdings.
+
+All 1326 two card combos are indexed once (``combo_index``). For a board
+every complete runout is evaluated for every combo in one NumPy pass: the
+rank and suit keys of the evaluator are sums over the cards, so the keys of
+board + combo are the board's keys plus the combo's. The result is a
+strength table with one row per combo and one column per runout, combos
+that share a card with the runout are marked -1.
+
+Equity queries are then weighted comparisons of the hero's row against the
+rows of the range. Combos blocked by the hero's cards or the board get no
+weight, so the opponent's holdings follow the range given the known cards.
+
+Enumerating is exact when the table is small enough (flop, turn and river
+boards), before the flop runouts are sampled instead. Tables are cached
+by the canonical board (see ``isomorphism``): boards that only differ by a
+renaming of the suits share one table, the query is renamed instead.
+They do not depend on the hero either, so every player at the table and
+every later street of the hand reuse the same flop table.
+"""
+from itertools import combinations
+from typing import Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+from . import evaluator, isomorphism
+from .cache import LruCache
+from .card import Card
+from .equity import BOARD_SIZE, EquityResult, HandRange, _get_tables
+
+NUM_COMBOS = evaluator.NUM_CARDS * (evaluator.NUM_CARDS - 1) // 2
+DEFAULT_SAMPLES = 10_000
+# Flop tables are about 3MB each
+CACHE_BYTES = 128 * 2 ** 20
+_BLOCKED = -1
+
+# region combos
+_COMBO_CARDS = np.asarray(list(combinations(range(evaluator.NUM_CARDS), 2)), dtype=np.int64)
+_COMBO_INDEX = np.zeros((evaluator.NUM_CARDS, evaluator.NUM_CARDS), dtype=np.int64)
+_COMBO_INDEX[_COMBO_CARDS[:, 0], _COMBO_CARDS[:, 1]] = np.arange(NUM_COMBOS)
+_COMBO_INDEX[_COMBO_CARDS[:, 1], _COMBO_CARDS[:, 0]] = np.arange(NUM_COMBOS)
+_COMBO_MASKS = (1 << _COMBO_CARDS[:, 0]) | (1 << _COMBO_CARDS[:, 1])
+# Combos holding each card
+_CARD_COMBOS = [np.flatnonzero((_COMBO_CARDS == card).any(axis=1)) for card in range(evaluator.NUM_CARDS)]
+
+# Every renaming of the suits as a map of card indices and of combo indices
+_CARD_PERMUTATIONS = np.asarray(
+    [isomorphism.rename(range(evaluator.NUM_CARDS), permutation) for permutation in range(len(isomorphism.SUIT_PERMUTATIONS))],
+    dtype=np.int64
+)
+_COMBO_PERMUTATIONS = _COMBO_INDEX[_CARD_PERMUTATIONS[:, _COMBO_CARDS[:, 0]], _CARD_PERMUTATIONS[:, _COMBO_CARDS[:, 1]]]
+
+
+def combo_index(first: Card, second: Card) -> int:
+    """Returns the index (0-1325) of a two card combo, independent of the order of the cards."""
+    return int(_COMBO_INDEX[evaluator.encode(first), evaluator.encode(second)])
+
+
+def range_weights(hand_range: HandRange | np.ndarray, dead: Sequence[int] = ()) -> np.ndarray:
+    """
+    The weight of every combo index in a range, combos holding a dead card get none.
+
+    A range that is queried often can be converted once and passed on as weights.
+    """
+    if isinstance(hand_range, np.ndarray):
+        weights = hand_range.astype(np.float64)
+    else:
+        items = list(hand_range.items()) if isinstance(hand_range, Mapping) else [(combo, 1.0) for combo in hand_range]
+        weights = np.zeros(NUM_COMBOS, dtype=np.float64)
+        if items:
+            cards = np.asarray([(first.index, second.index) for (first, second), _ in items], dtype=np.int64)
+            distinct = cards[:, 0] != cards[:, 1]
+            weights[_COMBO_INDEX[cards[distinct, 0], cards[distinct, 1]]] = np.asarray([weight for _, weight in items])[distinct]
+    for card in dead:
+        weights[_CARD_COMBOS[card]] = 0.0
+    return weights
+# endregion
+
+
+# region strength tables
+def _strengths(boards: np.ndarray, combos: np.ndarray = None) -> np.ndarray:
+    """
+    Evaluates every combo on every board, shape ``(combos, boards)``.
+
+    Combos that share a card with a board get ``_BLOCKED`` instead of a strength.
+    """
+    tables = _get_tables()
+    combo_cards = _COMBO_CARDS if combos is None else _COMBO_CARDS[combos]
+    masks = _COMBO_MASKS if combos is None else _COMBO_MASKS[combos]
+
+    keys = tables.rank_key[combo_cards].sum(axis=1)[:, None] + tables.rank_key[boards].sum(axis=1)
+    found = np.minimum(np.searchsorted(tables.count_keys, keys), len(tables.count_keys) - 1)
+    strengths = tables.count_values[found].astype(np.int16)
+
+    flush_suit = tables.flush_suit[tables.suit_key[combo_cards].sum(axis=1)[:, None] + tables.suit_key[boards].sum(axis=1)]
+    has_flush = flush_suit >= 0
+    if has_flush.any():
+        # Rank bits of the cards of each suit, OR-ed as a blocked combo may repeat a board card
+        suits = np.arange(evaluator.NUM_SUITS)
+        combo_suits = np.where((combo_cards[:, :, None] & 3) == suits, tables.rank_bit[combo_cards][:, :, None], 0).sum(axis=1)
+        board_suits = np.where((boards[:, :, None] & 3) == suits, tables.rank_bit[boards][:, :, None], 0).sum(axis=1)
+        combo, board = np.nonzero(has_flush)
+        suit = flush_suit[combo, board]
+        strengths[combo, board] = tables.flush[combo_suits[combo, suit] | board_suits[board, suit]]
+
+    board_masks = np.bitwise_or.reduce(np.left_shift(1, boards), axis=1)
+    strengths[(masks[:, None] & board_masks) != 0] = _BLOCKED
+    return strengths
+
+
+class _Runouts(NamedTuple):
+    """Every completion of a canonical board and the strength of every combo on it."""
+    cards: np.ndarray
+    strengths: np.ndarray
+
+
+_cache = LruCache("range_equity.tables", max_bytes=CACHE_BYTES)
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def _runouts(board: Sequence[int]) -> tuple[_Runouts, int]:
+    """
+    The strength table of a board and the suit renaming its cards are stored under.
+
+    A board that is missing from the cache is cut out of the table of its flop
+    if that one is cached, e.g. the turn after the flop was queried.
+    """
+    _, key, permutation = isomorphism.canonical((), board)
+    runouts = _cache.get(key)
+    if runouts is not None:
+        return runouts, permutation
+
+    if len(board) > 3:
+        _, flop_key, flop_permutation = isomorphism.canonical((), board[:3])
+        flop = _cache.get(flop_key)
+        if flop is not None:
+            later = _CARD_PERMUTATIONS[flop_permutation, board[3:]]
+            rows = (flop.cards[:, :, None] == later).any(axis=1).all(axis=1)
+            return _Runouts(flop.cards[rows], flop.strengths[:, rows]), flop_permutation
+
+    remaining = np.setdiff1d(np.arange(evaluator.NUM_CARDS), key)
+    cards = np.asarray(list(combinations(remaining, BOARD_SIZE - len(key))), dtype=np.int64).reshape(-1, BOARD_SIZE - len(key))
+    boards = np.concatenate([np.broadcast_to(np.asarray(key, dtype=np.int64), (len(cards), len(key))), cards], axis=1)
+    runouts = _Runouts(cards, _strengths(boards))
+    _cache.put(key, runouts)
+    return runouts, permutation
+
+
+def _sampled_boards(board: Sequence[int], dead: Sequence[int], samples: int, rng: np.random.Generator) -> np.ndarray:
+    keys = rng.random((samples, evaluator.NUM_CARDS))
+    keys[:, list(board) + list(dead)] = 2.0
+    drawn = np.argpartition(keys, BOARD_SIZE - len(board) - 1, axis=1)[:, :BOARD_SIZE - len(board)]
+    return np.concatenate([np.broadcast_to(np.asarray(board, dtype=np.int64), (samples, len(board))), drawn], axis=1)
+# endregion
+
+
+# region equity
+def _showdowns(hero: np.ndarray, villains: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Pot share won and weight of the valid villain combos on every runout."""
+    blocked = weights @ (villains == _BLOCKED)
+    # Blocked combos are -1, so the hero would beat them and take their whole weight
+    won = (weights @ np.sign(hero - villains) + weights.sum()) / 2 - blocked
+    valid = hero != _BLOCKED
+    return np.where(valid, won, 0.0), np.where(valid, weights.sum() - blocked, 0.0)
+
+
+def _result(won: np.ndarray, total: np.ndarray, exact: bool) -> EquityResult:
+    runouts = total > 0
+    if not runouts.any():
+        raise ValueError("[E] Range has no combos left after removing known cards.")
+    value = won.sum() / total.sum()
+    std_error = 0.0
+    if not exact and runouts.sum() > 1:
+        std_error = float(np.std(won[runouts] / total[runouts], ddof=1) / np.sqrt(runouts.sum()))
+    return EquityResult(float(value), std_error, int(runouts.sum()))
+
+
+def _known_cards(hole_cards: Sequence[Card], table_cards: Sequence[Card]) -> tuple[list[int], list[int]]:
+    if len(table_cards) > BOARD_SIZE or len(table_cards) in (1, 2):
+        raise ValueError("[E] The board must have 0, 3, 4 or 5 cards.")
+    hero = [evaluator.encode(card) for card in hole_cards]
+    board = [evaluator.encode(card) for card in table_cards]
+    if len(set(hero + board)) != len(hero) + len(board):
+        raise ValueError("[E] Hole cards and table cards must not contain duplicates.")
+    return hero, board
+
+
+def hand_vs_range(
+        hole_cards: Sequence[Card],
+        table_cards: Sequence[Card],
+        hand_range: HandRange,
+        samples: int = DEFAULT_SAMPLES,
+        rng: np.random.Generator = None
+        ) -> EquityResult:
+    """
+    The share of the pot two hole cards win at showdown against one opponent holding the range.
+
+    ``hand_range`` is a list of combos or a mapping of combos to weights, see ``equity.equity``.
+    Known cards remove the combos holding them. With three or more table cards every
+    runout is enumerated and ``trials`` counts the runouts, before the flop ``samples``
+    boards are drawn.
+    """
+    if len(hole_cards) != 2:
+        raise ValueError("[E] Equity needs exactly 2 hole cards.")
+    hero, board = _known_cards(hole_cards, table_cards)
+    weights = range_weights(hand_range, hero + board)
+    villains = np.flatnonzero(weights)
+
+    if len(board) >= 3:
+        runouts, permutation = _runouts(board)
+        renamed = _COMBO_PERMUTATIONS[permutation]
+        won, total = _showdowns(
+            runouts.strengths[renamed[_COMBO_INDEX[hero[0], hero[1]]]],
+            runouts.strengths[renamed[villains]],
+            weights[villains]
+        )
+        return _result(won, total, exact=True)
+
+    rng = rng if rng is not None else np.random.default_rng()
+    combos = np.append(villains, _COMBO_INDEX[hero[0], hero[1]])
+    strengths = _strengths(_sampled_boards(board, hero, samples, rng), combos)
+    won, total = _showdowns(strengths[-1], strengths[:-1], weights[villains])
+    return _result(won, total, exact=False)
+
+
+def range_vs_range(
+        hero_range: HandRange,
+        villain_range: HandRange,
+        table_cards: Sequence[Card],
+        samples: int = DEFAULT_SAMPLES,
+        rng: np.random.Generator = None
+        ) -> EquityResult:
+    """
+    The share of the pot the hero's range wins against the villain's range.
+
+    Every pair of combos that do not share a card counts with the product of their
+    weights, enumerated or sampled like ``hand_vs_range``.
+    """
+    _, board = _known_cards((), table_cards)
+    hero_weights = range_weights(hero_range, board)
+    villain_weights = range_weights(villain_range, board)
+    heroes = np.flatnonzero(hero_weights)
+    villains = np.flatnonzero(villain_weights)
+    if not len(heroes):
+        raise ValueError("[E] Range has no combos left after removing known cards.")
+
+    if len(board) >= 3:
+        runouts, permutation = _runouts(board)
+        renamed = _COMBO_PERMUTATIONS[permutation]
+        strengths = runouts.strengths[renamed[np.concatenate([heroes, villains])]]
+        exact = True
+    else:
+        rng = rng if rng is not None else np.random.default_rng()
+        strengths = _strengths(_sampled_boards(board, (), samples, rng), np.concatenate([heroes, villains]))
+        exact = False
+
+    won = np.zeros(strengths.shape[1])
+    total = np.zeros(strengths.shape[1])
+    villain_strengths = strengths[len(heroes):]
+    for row, (combo, weight) in enumerate(zip(heroes, hero_weights[heroes])):
+        # The villain cannot hold the hero's cards
+        weights = villain_weights.copy()
+        weights[_CARD_COMBOS[_COMBO_CARDS[combo, 0]]] = 0.0
+        weights[_CARD_COMBOS[_COMBO_CARDS[combo, 1]]] = 0.0
+        combo_won, combo_total = _showdowns(strengths[row], villain_strengths, weights[villains])
+        won += weight * combo_won
+        total += weight * combo_total
+    return _result(won, total, exact)
+# endregion
@@ -0,0 +1,202 @@
+"""
+Seating model shared by ``Environment`` and ``Game``.
+
+Players sit at fixed seat indices. The per-seat state that changes every
+hand (stacks, bets of the current round, contributions to the pot and the
+folded/all-in flags) is stored as one array per field instead of on the
+player objects, so resetting a hand is a handful of slice assignments.
+Seated players read and write their money and bets straight from these
+arrays.
+
+The occupied seats are kept in clockwise order and the small blind is a
+position in that order, so moving the blinds is O(1) and iterating the
+players from any position costs O(1) per player.
+
+As all of this is flat data, ``snapshot`` copies it into a single buffer
+of fixed size and ``restore`` writes it back in place.
+"""
+import struct
+from array import array
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+from . import game_rules
+
+if TYPE_CHECKING:
+    from .player import Player
+
+# Position of the small blind, players in the hand and seated players
+_HEADER = struct.Struct("<BBB")
+
+
+class Seating():
+    def __init__(self, max_seats: int = game_rules.MAX_PLAYERS) -> None:
+        self.max_seats = max_seats
+        self.players: list["Player"] = [None] * max_seats
+
+        self.stacks = array("q", bytes(8 * max_seats))
+        self.bets = array("q", bytes(8 * max_seats))
+        self.contributions = array("q", bytes(8 * max_seats))
+        self.folded = bytearray(max_seats)
+        self.all_in = bytearray(max_seats)
+        self._zeros = array("q", bytes(8 * max_seats))
+
+        # Occupied seats in clockwise order
+        self.order: list[int] = []
+        # Position of the small blind in ``order``
+        self.button: int = 0
+        self.num_active: int = 0
+
+    # region seats
+    def sit(self, player: "Player", seat: int = None) -> int:
+        """Seats a player at the given or the first free seat, keeping the player's money."""
+        if seat is None:
+            seat = next((i for i, p in enumerate(self.players) if p is None), None)
+            if seat is None:
+                raise ValueError(f"[E] Table is full ({self.max_seats} seats).")
+        elif self.players[seat] is not None:
+            raise ValueError(f"[E] Seat {seat} is already taken.")
+
+        self.players[seat] = player
+        self.stacks[seat] = player._money
+        self.bets[seat] = player.bet_this_round
+        self.contributions[seat] = player.bet_this_game
+        self.folded[seat] = 0
+        self.all_in[seat] = 0
+        player._bind(self, seat)
+
+        # Keep the clockwise order and the small blind in place
+        position = sum(1 for s in self.order if s < seat)
+        self.order.insert(position, seat)
+        if position <= self.button and len(self.order) > 1:
+            self.button += 1
+        return seat
+
+    def leave(self, player: "Player") -> None:
+        """Removes a player, the next player in order takes over the position (e.g. the small blind)."""
+        seat = player.seat
+        position = self.order.index(seat)
+        player._unbind()
+        self.players[seat] = None
+        self.order.pop(position)
+        self.fold(seat)
+
+        if position < self.button:
+            self.button -= 1
+        if self.button >= len(self.order):
+            self.button = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, player: "Player") -> bool:
+        return player.seat is not None and self.players[player.seat] is player
+    # endregion
+
+    # region positions
+    def seat_at(self, position: int) -> int:
+        """Seat index of the player at a position relative to the small blind (0 = small blind)."""
+        return self.order[(self.button + position) % len(self.order)]
+
+    def player_at(self, position: int) -> "Player":
+        return self.players[self.order[(self.button + position) % len(self.order)]]
+
+    def position_of(self, player: "Player") -> int:
+        return (self.order.index(player.seat) - self.button) % len(self.order)
+
+    @property
+    def small_blind(self) -> "Player":
+        return self.player_at(0) if self.order else None
+
+    @property
+    def big_blind(self) -> "Player":
+        return self.player_at(1) if len(self.order) > 1 else None
+
+    def rotate(self) -> None:
+        """Moves the blinds on by one seat."""
+        self.button = (self.button + 1) % len(self.order)
+
+    def __iter__(self) -> Iterator["Player"]:
+        """Iterates the players clockwise starting at the small blind."""
+        order = self.order
+        players = self.players
+        for i in range(self.button, len(order)):
+            yield players[order[i]]
+        for i in range(self.button):
+            yield players[order[i]]
+
+    def in_seat_order(self) -> list["Player"]:
+        return [self.players[seat] for seat in self.order]
+
+    def active(self, start: int = 0) -> Iterator["Player"]:
+        """Iterates once around the table from the given position, skipping folded players."""
+        folded = self.folded
+        for i in range(len(self.order)):
+            seat = self.seat_at(start + i)
+            if not folded[seat]:
+                yield self.players[seat]
+    # endregion
+
+    # region hand state
+    def new_hand(self) -> None:
+        self.bets[:] = self._zeros
+        self.contributions[:] = self._zeros
+        self.folded[:] = bytes(self.max_seats)
+        self.all_in[:] = bytes(self.max_seats)
+        self.num_active = len(self.order)
+
+    def new_round(self) -> None:
+        self.bets[:] = self._zeros
+
+    def fold(self, seat: int) -> None:
+        if not self.folded[seat]:
+            self.folded[seat] = 1
+            self.num_active -= 1
+    # endregion
+
+    # region snapshots
+    @property
+    def snapshot_size(self) -> int:
+        return _HEADER.size + self.max_seats * (1 + 3 * 8 + 2)
+
+    def snapshot(self) -> bytes:
+        """The seat order, the blinds and the per-seat arrays as one buffer of ``snapshot_size`` bytes."""
+        return b"".join((
+            _HEADER.pack(self.button, self.num_active, len(self.order)),
+            bytes(self.order).ljust(self.max_seats, b"\xff"),
+            self.stacks.tobytes(),
+            self.bets.tobytes(),
+            self.contributions.tobytes(),
+            self.folded,
+            self.all_in,
+        ))
+
+    def restore(self, state: bytes, players: Sequence["Player"]) -> None:
+        """
+        Puts back a ``snapshot`` together with the players that sat at each seat.
+
+        Players who left since are seated again and players who sat down since
+        are unseated. The arrays are written in place, so views of them stay valid.
+        """
+        seats = self.max_seats
+        view = memoryview(state)
+        self.button, self.num_active, seated = _HEADER.unpack_from(view)
+        offset = _HEADER.size
+        self.order = list(view[offset:offset + seated])
+        offset += seats
+
+        for seat, player in enumerate(players):
+            current = self.players[seat]
+            if current is not player:
+                if current is not None:
+                    current._unbind()
+                self.players[seat] = player
+                if player is not None:
+                    player._bind(self, seat)
+
+        size = 8 * seats
+        for values in (self.stacks, self.bets, self.contributions):
+            memoryview(values).cast("B")[:] = view[offset:offset + size]
+            offset += size
+        self.folded[:] = view[offset:offset + seats]
+        self.all_in[:] = view[offset + seats:offset + 2 * seats]
+    # endregion
@@ -0,0 +1,44 @@
+"""
+Seeds for reproducible simulations.
+
+Every source of randomness (decks, tables, bots, solver workers) owns a
+generator seeded with an int instead of drawing from the global ``random``
+module. Seeds for parallel shards are spawned from one root seed with NumPy's
+``SeedSequence``, so their streams are statistically independent and a run
+is reproduced from its root seed however the shards are spread over workers.
+
+An ``Environment`` seeds its deck with a fresh seed before every hand and
+records it (``env.hand_seed`` and the hand history), so any hand's cards can
+be dealt again with ``env.play_hand(seed)``.
+
+NumPy is only imported once seeds are spawned, so processes that are handed
+plain int seeds (e.g. tournament workers) never load it.
+"""
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def seed_sequence(seed: "int | np.random.SeedSequence" = None) -> "np.random.SeedSequence":
+    """The ``SeedSequence`` of a root seed, a random one if None."""
+    # Imported here, loading NumPy takes longer than the rest of a worker's imports
+    import numpy as np
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed: "int | np.random.SeedSequence", count: int) -> list[int]:
+    """
+    Spawns ``count`` independent 64 bit seeds from a root seed.
+
+    Spawning from the same ``SeedSequence`` again continues with new children,
+    so e.g. every round of a solver can spawn fresh seeds for its workers.
+    """
+    import numpy as np
+    return [int(child.generate_state(1, np.uint64)[0]) for child in seed_sequence(seed).spawn(count)]
+
+
+def spawn_rngs(seed: "int | np.random.SeedSequence", count: int) -> list[random.Random]:
+    """Independent ``random.Random`` generators, e.g. one per bot of a table."""
+    return [random.Random(child) for child in spawn_seeds(seed, count)]
@@ -0,0 +1,406 @@
+"""
+Asyncio table server.
+
+Many ``Environment`` tables run concurrently in one event loop. Every hand is
+played through ``Environment.play_hand``, which pauses at each decision, so a
+table only waits for the player to act while the other tables keep playing.
+
+Remote players connect over TCP and exchange one JSON message per line, or
+over WebSocket on the same port (one JSON message per text frame):
+
+- the client joins with ``{"type": "join", "name": "Alice"}`` and is seated
+  as soon as enough players are waiting for a table
+- the server asks for a move with ``{"type": "decision", "id": 3, ...}``
+  holding the cards, the board, the pot, the amount to call, the smallest
+  and largest raise and the legal actions, the client answers ``{"id": 3, "action": "RAISE", "amount": 10}``
+- after every hand the server sends ``{"type": "hand", ...}`` with the board
+  and the money of every player and ``{"type": "closed"}`` once the table is
+  done
+
+Players who do not answer within the action timeout, answer with an illegal
+move or disconnect check when possible and fold otherwise. Bots sit at the
+same tables as in-process agents, their strategies may be plain functions or
+coroutines.
+"""
+import asyncio
+import base64
+import hashlib
+import inspect
+import json
+import struct
+import time
+from typing import Awaitable, Callable, Union
+
+from .environment import Decision, Environment, NotEnoughPlayersError
+from .events import NULL
+from .headless import create_table
+from .player import Player
+from .strategies import check_fold_strategy
+
+AsyncStrategy = Callable[[Player, int, bool], Union[tuple[str, int], Awaitable[tuple[str, int]]]]
+
+DEFAULT_ACTION_TIMEOUT = 30.0
+
+
+# region connections
+_WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# WebSocket opcodes
+_CONTINUATION = 0x0
+_TEXT = 0x1
+_CLOSE = 0x8
+_PING = 0x9
+_PONG = 0xA
+
+
+def encode_frame(payload: bytes, opcode: int = _TEXT, mask: bytes = None) -> bytes:
+    """Encodes a single WebSocket frame, clients have to mask their frames with 4 random bytes."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    if mask is None:
+        return header + payload
+    header = bytes([header[0], header[1] | 0x80]) + header[2:]
+    return header + mask + _apply_mask(payload, mask)
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    length = len(payload)
+    key = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(length, "big")
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[bool, int, bytes]:
+    """Reads a single WebSocket frame and returns whether it is the final fragment, the opcode and the payload."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = _apply_mask(payload, mask)
+    return bool(first & 0x80), first & 0x0F, payload
+
+
+class Connection():
+    """A client connection sending and receiving one JSON message per line."""
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, first_line: bytes = b"") -> None:
+        self.reader = reader
+        self.writer = writer
+        self._first_line = first_line
+
+    async def receive(self) -> dict:
+        """Returns the next message or None once the client is gone."""
+        try:
+            line, self._first_line = self._first_line or await self.reader.readline(), b""
+            if not line:
+                return None
+            return json.loads(line)
+        except (ConnectionError, ValueError):
+            return None
+
+    async def send(self, message: dict) -> None:
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class WebSocketConnection(Connection):
+    """A client connection sending and receiving one JSON message per WebSocket text frame."""
+    async def receive(self) -> dict:
+        message = b""
+        try:
+            while True:
+                final, opcode, payload = await read_frame(self.reader)
+                if opcode == _CLOSE:
+                    self.writer.write(encode_frame(payload[:2], _CLOSE))
+                    return None
+                if opcode == _PING:
+                    self.writer.write(encode_frame(payload, _PONG))
+                elif opcode in (_TEXT, _CONTINUATION):
+                    message += payload
+                    if final:
+                        return json.loads(message)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            return None
+
+    async def send(self, message: dict) -> None:
+        self.writer.write(encode_frame(json.dumps(message).encode()))
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Connection:
+    """Performs the WebSocket handshake if the client starts with one and returns the connection."""
+    first_line = await reader.readline()
+    if not first_line.startswith(b"GET "):
+        return Connection(reader, writer, first_line)
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    accept_key = base64.b64encode(hashlib.sha1(headers.get("sec-websocket-key", "").encode() + _WEBSOCKET_GUID).digest())
+    writer.write(
+        b"HTTP/1.1 101 Switching Protocols\r\n"
+        b"Upgrade: websocket\r\n"
+        b"Connection: Upgrade\r\n"
+        b"Sec-WebSocket-Accept: " + accept_key + b"\r\n\r\n"
+    )
+    await writer.drain()
+    return WebSocketConnection(reader, writer)
+# endregion
+
+
+# region agents
+class BotAgent():
+    """Lets an in-process strategy decide, the strategy may return its move or a coroutine."""
+    def __init__(self, strategy: AsyncStrategy) -> None:
+        self.strategy = strategy
+
+    async def decide(self, decision: Decision, table: "Table") -> tuple[str, int]:
+        move = self.strategy(decision.player, decision.prev_raise, decision.can_re_raise)
+        if inspect.isawaitable(move):
+            move = await move
+        return move
+
+    async def send(self, message: dict) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class RemoteAgent():
+    """A player connected to the server deciding within the action timeout."""
+    def __init__(self, connection: Connection, latencies: list[float] = None) -> None:
+        self.connection = connection
+        self.latencies = latencies if latencies is not None else []
+        self.connected = True
+        self.closed = asyncio.Event()
+        self._decision_id = 0
+        # Messages are read in the background, so timing out never cuts a message in half
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._reader = asyncio.create_task(self._read_messages())
+
+    async def decide(self, decision: Decision, table: "Table") -> tuple[str, int]:
+        fallback = check_fold_strategy(decision.player, decision.prev_raise, decision.can_re_raise)
+        if not self.connected:
+            return fallback
+
+        self._decision_id += 1
+        start = time.perf_counter()
+        await self.send(table.decision_message(decision, self._decision_id))
+        try:
+            reply = await asyncio.wait_for(self._reply(), table.action_timeout)
+        except asyncio.TimeoutError:
+            reply = None
+        self.latencies.append(time.perf_counter() - start)
+
+        if reply is None:
+            return fallback
+        move = (reply.get("action"), reply.get("amount", 0))
+        return move if table.env.betting.is_legal(*move) else fallback
+
+    async def _read_messages(self) -> None:
+        while (message := await self.connection.receive()) is not None:
+            self._messages.put_nowait(message)
+        self._messages.put_nowait(None)
+        # Lets the server drop a player who leaves before the table starts
+        self.closed.set()
+
+    async def _reply(self) -> dict:
+        """Waits for the answer to the latest decision, late answers to earlier decisions are dropped."""
+        while True:
+            message = await self._messages.get()
+            if message is None:
+                self.connected = False
+                return None
+            if not isinstance(message, dict):
+                # Valid JSON but not an object, answers the decision with an illegal move
+                return {}
+            if message.get("id") == self._decision_id:
+                return message
+
+    async def send(self, message: dict) -> None:
+        if self.connected:
+            await self.connection.send(message)
+
+    def close(self) -> None:
+        self._reader.cancel()
+        self.connection.close()
+        self.closed.set()
+
+
+Agent = Union[BotAgent, RemoteAgent]
+
+
+# endregion
+
+
+# region tables
+class Table():
+    """An ``Environment`` whose players decide through agents."""
+    def __init__(self, table_id: int, env: Environment, agents: dict[Player, Agent], action_timeout: float = DEFAULT_ACTION_TIMEOUT) -> None:
+        self.table_id = table_id
+        self.env = env
+        self.agents = agents
+        self.action_timeout = action_timeout
+        self.hands_played = 0
+        self.decisions = 0
+
+    async def play(self, num_hands: int = None) -> int:
+        """Plays up to ``num_hands`` hands (until too few players are left if None) and closes the table."""
+        try:
+            while num_hands is None or self.hands_played < num_hands:
+                try:
+                    await self.play_hand()
+                except NotEnoughPlayersError:
+                    break
+                self.hands_played += 1
+                await self._broadcast(self.hand_message())
+                # Bots decide without waiting, let the other tables play as well
+                await asyncio.sleep(0)
+            await self._broadcast({"type": "closed", "table": self.table_id})
+        finally:
+            for agent in self.agents.values():
+                agent.close()
+        return self.hands_played
+
+    async def play_hand(self) -> None:
+        hand = self.env.play_hand()
+        try:
+            decision = next(hand)
+            while True:
+                move = await self.agents[decision.player].decide(decision, self)
+                self.decisions += 1
+                decision = hand.send(move)
+        except StopIteration:
+            pass
+
+    def decision_message(self, decision: Decision, decision_id: int) -> dict:
+        player = decision.player
+        betting = self.env.betting
+        return {
+            "type": "decision",
+            "id": decision_id,
+            "table": self.table_id,
+            "cards": [str(card) for card in player.cards],
+            "board": [str(card) for card in self.env.table_cards],
+            "pot": self.env.pot,
+            "money": player.money,
+            "to_call": betting.to_call,
+            "min_raise": betting.min_raise,
+            "max_raise": betting.max_raise,
+            "actions": betting.legal_actions,
+        }
+
+    def hand_message(self) -> dict:
+        return {
+            "type": "hand",
+            "table": self.table_id,
+            "hand": self.hands_played,
+            "board": [str(card) for card in self.env.table_cards],
+            "money": {player.name: player.money for player in self.agents},
+        }
+
+    async def _broadcast(self, message: dict) -> None:
+        await asyncio.gather(*(agent.send(message) for agent in self.agents.values()))
+
+
+class TableServer():
+    """
+    Seats connecting players at tables of ``players_per_table`` and plays the
+    tables concurrently.
+
+    ``bots`` fill the first seats of every table opened for remote players,
+    tables of bots only are opened with ``open_table``.
+    """
+    def __init__(
+            self,
+            players_per_table: int = 2,
+            bots: dict[str, AsyncStrategy] = None,
+            hands_per_table: int = None,
+            action_timeout: float = DEFAULT_ACTION_TIMEOUT,
+            starting_score: int = None,
+            ) -> None:
+        self.players_per_table = players_per_table
+        self.bots = bots if bots is not None else {}
+        self.hands_per_table = hands_per_table
+        self.action_timeout = action_timeout
+        self.starting_score = starting_score
+
+        self.tables: list[Table] = []
+        self.tasks: list[asyncio.Task] = []
+        # Seconds between asking a remote player for a move and receiving it
+        self.action_latencies: list[float] = []
+        self._waiting: dict[str, RemoteAgent] = {}
+        self._server: asyncio.Server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Starts listening and returns the port."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    async def wait_tables(self) -> None:
+        """Waits until all open tables are done."""
+        await asyncio.gather(*self.tasks)
+
+    def open_table(self, agents: dict[str, Agent]) -> Table:
+        """Seats the agents at a new table and starts playing it."""
+        # The players' own strategies are only used by ``Environment.start_game``
+        env = create_table({name: check_fold_strategy for name in agents}, starting_score=self.starting_score, events=NULL)
+        players = {player.name: player for player in env._players()}
+        table = Table(len(self.tables), env, {players[name]: agent for name, agent in agents.items()}, self.action_timeout)
+        self.tables.append(table)
+        self.tasks.append(asyncio.create_task(table.play(self.hands_per_table)))
+        return table
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = await accept(reader, writer)
+        message = await connection.receive()
+        name = message.get("name") if isinstance(message, dict) else None
+        if not isinstance(name, str) or name in self._waiting or name in self.bots:
+            await connection.send({"type": "error", "message": "[E] Join with an unused name."})
+            connection.close()
+            return
+
+        agent = RemoteAgent(connection, self.action_latencies)
+        self._waiting[name] = agent
+        await connection.send({"type": "joined", "name": name})
+        if len(self._waiting) + len(self.bots) >= self.players_per_table:
+            agents: dict[str, Agent] = {name: BotAgent(strategy) for name, strategy in self.bots.items()}
+            agents.update(self._waiting)
+            self._waiting = {}
+            self.open_table(agents)
+        # Keep the connection open until the table is done
+        try:
+            await agent.closed.wait()
+        finally:
+            # Left before the table filled up, the name is free again
+            if self._waiting.get(name) is agent:
+                del self._waiting[name]
+                agent.close()
+# endregion
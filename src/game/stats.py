@@ -0,0 +1,320 @@
+"""
+Columnar player statistics over many hands.
+
+A ``StatsStore`` listens to the hand events of one or more tables, like the
+``HandHistoryWriter`` does, and counts what every player did. Counters are
+NumPy columns indexed by a small player id, per street where that makes
+sense:
+
+- per street: how often the player saw the street and folded, checked,
+  called or raised on it, and the chips put in (blinds included)
+- per hand: hands dealt, hands with money put in voluntarily preflop (VPIP),
+  hands raised preflop (PFR), showdowns reached, hands won and chips won
+
+Events of a hand are collected as flat integer keys and only added to the
+columns in batches of ``batch_size`` hands with a few ``np.bincount`` calls,
+so recording costs a couple of list appends per action. ``report`` groups
+the players (e.g. by strategy) and derives VPIP, PFR, the postflop
+aggression factor, how often players go to showdown and the winnings in big
+blinds per 100 hands from the totals, which takes the same time for ten
+hands as for ten million. Stores are saved to a small binary file, merged
+across processes with ``merge`` and reports written as CSV.
+"""
+import csv
+import struct
+from array import array
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+import numpy as np
+
+from . import events as ev
+from . import game_rules
+from .events import Event
+from .history import CALL, CHECK, FOLD, RAISE
+from .names import pack_names, unpack_names
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+STREETS = ("pre_flop", "flop", "turn", "river")
+NUM_STREETS = len(STREETS)
+STREET_COLUMNS = ("seen", "folds", "checks", "calls", "raises", "chips")
+HAND_COLUMNS = ("hands", "vpip", "pfr", "showdowns", "wins", "won")
+# History action codes, blinds are only counted as chips
+_NUM_ACTIONS = 6
+_ACTION_COLUMNS = {FOLD: "folds", CHECK: "checks", CALL: "calls", RAISE: "raises"}
+# Street reached by the number of board cards
+_STREET_OF_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}
+
+# Hand flags
+_VPIP = 1
+_PFR = 2
+_SHOWDOWN = 4
+_WIN = 8
+_SEEN = 16          # shifted by the street
+
+_MAGIC = b"STAT"
+_VERSION = 2
+# magic, version, streets, players, length of the names (see ``names``)
+_HEADER = struct.Struct("<4sHHII")
+
+
+class Report(NamedTuple):
+    """Totals and derived stats of groups of players, one value per label in every column."""
+    labels: list[str]
+    columns: dict[str, np.ndarray]
+
+    def write_csv(self, path: "Path") -> None:
+        names = list(self.columns)
+        with open(path, "w", newline="") as file:
+            # Quotes labels that hold commas or line breaks
+            writer = csv.writer(file)
+            writer.writerow(["player"] + names)
+            for row, label in enumerate(self.labels):
+                values = (self.columns[name][row] for name in names)
+                writer.writerow([label] + [f"{value:.6g}" if isinstance(value, np.floating) else str(value) for value in values])
+
+    def __str__(self) -> str:
+        lines = [f"{'player':<16} {'hands':>10} {'VPIP':>6} {'PFR':>6} {'AF':>6} {'WTSD':>6} {'bb/100':>9}"]
+        columns = self.columns
+        for row, label in enumerate(self.labels):
+            lines.append(
+                f"{label:<16} {columns['hands'][row]:>10} {columns['vpip_rate'][row]:>6.1%} {columns['pfr_rate'][row]:>6.1%} "
+                f"{columns['aggression'][row]:>6.2f} {columns['wtsd'][row]:>6.1%} {columns['bb_per_100'][row]:>9.2f}"
+            )
+        return "\n".join(lines)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+class StatsStore():
+    """
+    Attach it with ``Environment(stats=store)``, which subscribes ``on_event`` to
+    the table's events. The columns are complete after ``flush``, which ``report``,
+    ``merge`` and ``save`` call.
+    """
+    def __init__(self, batch_size: int = 4096) -> None:
+        self.batch_size = batch_size
+        self.names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self.columns: dict[str, np.ndarray] = {}
+        self._resize(0)
+
+        # Hands not added to the columns yet
+        self._pending = 0
+        self._action_keys = array("q")
+        self._action_chips = array("q")
+        self._hand_ids = array("q")
+        self._hand_flags = array("q")
+        self._hand_won = array("q")
+
+        # Hand in progress
+        self._players: list = []
+        self._seats: dict[object, int] = {}
+        self._player_ids: list[int] = []
+        self._actions: list[int] = []
+        self._chips: list[int] = []
+        self._flags: list[int] = []
+        self._fold_street: list[int] = []
+        self._won: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def player_id(self, name: str) -> int:
+        player_id = self._ids.get(name)
+        if player_id is None:
+            player_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return player_id
+
+    # region recording
+    def on_event(self, event: Event) -> None:
+        kind = event.kind
+        if kind == ev.ACTION:
+            self.action(*event.args)
+        elif kind == ev.PAYOUT:
+            self.payout(*event.args)
+        elif kind == ev.HAND_START:
+            self.begin_hand(*event.args)
+        elif kind == ev.HAND_END:
+            self.end_hand(*event.args)
+
+    def begin_hand(self, players: list, stacks: list[int] = None, seed: int = 0) -> None:
+        self._players = players
+        self._seats = {player: seat for seat, player in enumerate(players)}
+        self._player_ids = [self.player_id(player.name) for player in players]
+        self._actions = []
+        self._chips = []
+        self._flags = [0] * len(players)
+        self._fold_street = [NUM_STREETS] * len(players)
+        self._won = [0] * len(players)
+
+    def action(self, street: int, player, action: int, amount: int = 0) -> None:
+        seat = self._seats[player]
+        self._actions.append((self._player_ids[seat] * NUM_STREETS + street) * _NUM_ACTIONS + action)
+        self._chips.append(amount)
+        if action == FOLD:
+            self._fold_street[seat] = street
+        elif street == 0 and action >= CALL:
+            # Calls and raises, the blinds are forced
+            self._flags[seat] |= _VPIP | (_PFR if action == RAISE else 0)
+
+    def payout(self, player, amount: int) -> None:
+        self._won[self._seats[player]] += amount
+
+    def end_hand(self, board: list) -> None:
+        reached = _STREET_OF_BOARD[len(board)]
+        # Players still holding cards were not folded or removed
+        holding = [bool(player.cards) for player in self._players]
+        showdown = _SHOWDOWN if sum(holding) > 1 else 0
+        for seat, player_id in enumerate(self._player_ids):
+            flags = self._flags[seat]
+            for street in range(min(reached, self._fold_street[seat]) + 1):
+                flags |= _SEEN << street
+            if holding[seat]:
+                flags |= showdown
+            if self._won[seat]:
+                flags |= _WIN
+            self._hand_ids.append(player_id)
+            self._hand_flags.append(flags)
+            self._hand_won.append(self._won[seat])
+        self._action_keys.extend(self._actions)
+        self._action_chips.extend(self._chips)
+        # Keeps no players alive between hands, so the store pickles e.g. from a worker process
+        self._players = []
+        self._seats = {}
+
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+    # endregion
+
+    # region columns
+    def _resize(self, num_players: int) -> None:
+        """Grows the columns to at least ``num_players`` rows, doubling the capacity."""
+        capacity = len(self.columns["hands"]) if self.columns else 0
+        if capacity >= num_players and self.columns:
+            return
+        capacity = max(16, 2 * capacity, num_players)
+        for name in STREET_COLUMNS:
+            column = np.zeros((capacity, NUM_STREETS), dtype=np.int64)
+            if name in self.columns:
+                column[:len(self.columns[name])] = self.columns[name]
+            self.columns[name] = column
+        for name in HAND_COLUMNS:
+            column = np.zeros(capacity, dtype=np.int64)
+            if name in self.columns:
+                column[:len(self.columns[name])] = self.columns[name]
+            self.columns[name] = column
+
+    def flush(self) -> None:
+        """Adds the recorded hands to the columns."""
+        self._resize(len(self.names))
+        columns = self.columns
+        capacity = len(columns["hands"])
+
+        keys = np.array(self._action_keys, dtype=np.int64)
+        if len(keys):
+            counts = np.bincount(keys, minlength=capacity * NUM_STREETS * _NUM_ACTIONS).reshape(capacity, NUM_STREETS, _NUM_ACTIONS)
+            for action, name in _ACTION_COLUMNS.items():
+                columns[name] += counts[:, :, action]
+            chips = np.array(self._action_chips, dtype=np.int64)
+            columns["chips"] += np.bincount(keys // _NUM_ACTIONS, weights=chips, minlength=capacity * NUM_STREETS).astype(np.int64).reshape(capacity, NUM_STREETS)
+
+        ids = np.array(self._hand_ids, dtype=np.int64)
+        if len(ids):
+            flags = np.array(self._hand_flags, dtype=np.int64)
+            columns["hands"] += np.bincount(ids, minlength=capacity)
+            for flag, name in ((_VPIP, "vpip"), (_PFR, "pfr"), (_SHOWDOWN, "showdowns"), (_WIN, "wins")):
+                columns[name] += np.bincount(ids, weights=flags & flag, minlength=capacity).astype(np.int64) // flag
+            won = np.array(self._hand_won, dtype=np.int64)
+            columns["won"] += np.bincount(ids, weights=won, minlength=capacity).astype(np.int64)
+            for street in range(NUM_STREETS):
+                seen = (flags >> street) & _SEEN
+                columns["seen"][:, street] += np.bincount(ids, weights=seen, minlength=capacity).astype(np.int64) // _SEEN
+
+        for buffer in (self._action_keys, self._action_chips, self._hand_ids, self._hand_flags, self._hand_won):
+            del buffer[:]
+        self._pending = 0
+
+    def totals(self) -> dict[str, np.ndarray]:
+        """The columns of the players in ``names``, recorded hands included."""
+        self.flush()
+        return {name: column[:len(self.names)] for name, column in self.columns.items()}
+
+    def merge(self, other: "StatsStore") -> None:
+        """Adds the counters of another store, e.g. of a worker process, matching players by name."""
+        rows = np.array([self.player_id(name) for name in other.names], dtype=np.int64)
+        self.flush()
+        for name, column in other.totals().items():
+            self.columns[name][rows] += column
+    # endregion
+
+    # region reports
+    def report(self, group: Callable[[str], str] = None) -> Report:
+        """
+        Sums the players up by ``group(name)`` (by default every player on their own)
+        and derives the usual rates, sorted by label.
+        """
+        totals = self.totals()
+        labels = [group(name) if group is not None else name for name in self.names]
+        groups, rows = np.unique(np.array(labels, dtype=object), return_inverse=True)
+        columns = {}
+        for name, column in totals.items():
+            summed = np.zeros((len(groups),) + column.shape[1:], dtype=np.int64)
+            np.add.at(summed, rows, column)
+            if summed.ndim == 1:
+                columns[name] = summed
+            else:
+                for street, street_name in enumerate(STREETS):
+                    columns[f"{name}_{street_name}"] = summed[:, street]
+
+        hands = columns["hands"]
+        postflop = STREETS[1:]
+        columns["vpip_rate"] = _ratio(columns["vpip"], hands)
+        columns["pfr_rate"] = _ratio(columns["pfr"], hands)
+        columns["aggression"] = _ratio(
+            sum(columns[f"raises_{street}"] for street in postflop),
+            sum(columns[f"calls_{street}"] for street in postflop)
+        )
+        columns["wtsd"] = _ratio(columns["showdowns"], columns["seen_flop"])
+        net = columns["won"] - sum(columns[f"chips_{street}"] for street in STREETS)
+        columns["net"] = net
+        columns["bb_per_100"] = _ratio(net / game_rules.BIG_BLIND * 100, hands)
+        return Report(list(groups), columns)
+    # endregion
+
+    # region files
+    def save(self, path: "Path") -> None:
+        """Writes the players and their columns, one column after the other."""
+        totals = self.totals()
+        names = pack_names(self.names)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, NUM_STREETS, len(self.names), len(names)))
+            file.write(names)
+            for name in STREET_COLUMNS + HAND_COLUMNS:
+                file.write(np.ascontiguousarray(totals[name], dtype="<i8").tobytes())
+
+    @classmethod
+    def load(cls, path: "Path") -> "StatsStore":
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, streets, num_players, names_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION or streets != NUM_STREETS:
+            raise ValueError(f"[E] {path} is not a player stats file.")
+        store = cls()
+        offset = _HEADER.size
+        for name in unpack_names(data[offset:offset + names_size], num_players):
+            store.player_id(name)
+        offset += names_size
+        store._resize(num_players)
+        for name in STREET_COLUMNS + HAND_COLUMNS:
+            shape = (num_players, NUM_STREETS) if name in STREET_COLUMNS else (num_players,)
+            size = int(np.prod(shape))
+            store.columns[name][:num_players] = np.frombuffer(data, dtype="<i8", count=size, offset=offset).reshape(shape)
+            offset += 8 * size
+        return store
+    # endregion
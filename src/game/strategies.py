@@ -0,0 +1,66 @@
+"""
+Decision callbacks for ``Player.make_move``.
+
+A strategy is called with the player to act, the amount the player needs to
+call and whether the player may raise. It returns the action (``"CALL"``,
+``"RAISE"``, ``"CHECK"`` or ``"FOLD"``) and the amount to raise by, which is
+ignored for every action except ``"RAISE"``.
+"""
+import random
+from typing import TYPE_CHECKING, Callable
+
+from . import game_rules
+from .betting import legal_actions
+
+if TYPE_CHECKING:
+    from .player import Player
+
+Strategy = Callable[["Player", int, bool], tuple[str, int]]
+
+
+def console_strategy(player: "Player", prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+    """Asks a human for the move on the console."""
+    actions = legal_actions(prev_raise, can_re_raise)
+    while True:
+        action = input(f"[?] {' / '.join(actions)}")
+        if action not in actions:
+            print("[E] Invalid action")
+            continue
+        if action != "RAISE":
+            return action, 0
+
+        while True:
+            try:
+                amount = int(input(f"[?] How much do you want to raise (at least {game_rules.MIN_BET})? ({player.money} left)"))
+            except ValueError:
+                print("[E] Amount needs to be positive integer")
+                continue
+            error = player.raise_error(amount, prev_raise)
+            if error is None:
+                return action, amount
+            print(error)
+
+
+def check_fold_strategy(player: "Player", prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+    """Checks when possible and folds otherwise, used for players who do not decide in time."""
+    return ("FOLD", 0) if prev_raise > 0 else ("CHECK", 0)
+
+
+def passive_strategy(player: "Player", prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+    """Never raises and never folds."""
+    return ("CALL", 0) if prev_raise > 0 else ("CHECK", 0)
+
+
+def random_strategy(rng: random.Random = None, fold_chance: float = 0.1, raise_chance: float = 0.2) -> Strategy:
+    """Returns a strategy that picks a legal action at random and always raises by the minimum bet."""
+    rng = rng if rng is not None else random.Random()
+
+    def strategy(player: "Player", prev_raise: int, can_re_raise: bool) -> tuple[str, int]:
+        roll = rng.random()
+        if prev_raise > 0 and roll < fold_chance:
+            return "FOLD", 0
+        if can_re_raise and roll > 1 - raise_chance:
+            return "RAISE", game_rules.MIN_BET
+        return passive_strategy(player, prev_raise, can_re_raise)
+
+    return strategy
@@ -0,0 +1,147 @@
+"""
+Self-play tournaments over many independent tables.
+
+Every table is played headless by bots in its own worker process. Each table
+gets its own seed spawned from the tournament seed (see ``seeding``) for its
+bots and its hands, so a tournament with the same seed and table layout is reproducible no
+matter how the tables are distributed over the workers. The stats of all players with the same name
+are merged at the end. With ``player_stats`` every table also counts its players'
+actions into a ``StatsStore`` and the stores are merged into one.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, NamedTuple
+
+from . import headless, seeding
+from .profiling import HandProfiler
+from .strategies import random_strategy
+
+if TYPE_CHECKING:
+    from .stats import StatsStore
+
+STATS = ("money_earned", "money_lost", "times_folded", "times_raised", "times_checked", "times_called")
+
+
+class TableTask(NamedTuple):
+    # Spawned in the tournament process, workers only get plain ints
+    seed: int
+    bot_seeds: tuple[int, ...]
+    num_hands: int
+    starting_score: int
+    profile: bool = False
+    player_stats: bool = False
+
+
+class TableResult(NamedTuple):
+    hands: int
+    stats: dict[str, dict[str, int]]
+    profile: HandProfiler = None
+    player_stats: "StatsStore" = None
+
+
+class TournamentResult(NamedTuple):
+    hands: int
+    tables: int
+    workers: int
+    elapsed: float
+    stats: dict[str, dict[str, int]]
+    # Phase timings of all tables, if profiled
+    profile: HandProfiler = None
+    # Action counts of all tables, if recorded
+    player_stats: "StatsStore" = None
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def play_table(task: TableTask) -> TableResult:
+    """Plays one table with random bots and returns the stats of its players."""
+    store = None
+    if task.player_stats:
+        # Imported here so tournaments without stats do not load NumPy in every worker
+        from .stats import StatsStore
+        store = StatsStore()
+    env = headless.create_table(
+        {f"Bot {i}": random_strategy(random.Random(bot_seed)) for i, bot_seed in enumerate(task.bot_seeds)},
+        starting_score=task.starting_score,
+        seed=task.seed,
+        profiler=HandProfiler() if task.profile else None,
+        stats=store
+    )
+    players = list(env._players())
+    hands = headless.play_hands(env, task.num_hands)
+
+    stats = {}
+    for player in players:
+        stats[player.name] = {stat: getattr(player, stat) for stat in STATS}
+        stats[player.name]["hands"] = hands
+    if store is not None:
+        store.flush()
+    return TableResult(hands, stats, env.profiler, store)
+
+
+def merge_stats(results: list[TableResult]) -> dict[str, dict[str, int]]:
+    merged: dict[str, dict[str, int]] = {}
+    for result in results:
+        for name, stats in result.stats.items():
+            totals = merged.setdefault(name, dict.fromkeys(stats, 0))
+            for stat, value in stats.items():
+                totals[stat] += value
+    return merged
+
+
+def run_tournament(
+        num_tables: int,
+        hands_per_table: int,
+        players_per_table: int = 6,
+        workers: int = None,
+        seed: int = 0,
+        starting_score: int = 1_000_000,
+        profile: bool = False,
+        player_stats: bool = False
+        ) -> TournamentResult:
+    """
+    Plays ``num_tables`` tables of ``hands_per_table`` hands each.
+
+    With ``workers == 1`` the tables are played in this process, otherwise they are
+    sharded over a process pool (``None`` uses one worker per core). With ``profile``
+    the phases of every hand are timed and merged into ``result.profile``, with
+    ``player_stats`` the actions of every player are counted into ``result.player_stats``.
+    """
+    tasks = []
+    for table_seed in seeding.spawn_seeds(seed, num_tables):
+        hand_seed, *bot_seeds = seeding.spawn_seeds(table_seed, players_per_table + 1)
+        tasks.append(TableTask(hand_seed, tuple(bot_seeds), hands_per_table, starting_score, profile, player_stats))
+
+    workers = workers if workers is not None else os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        results = [play_table(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, num_tables // (4 * workers))
+            results = list(pool.map(play_table, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    merged = None
+    if profile:
+        merged = HandProfiler()
+        for result in results:
+            merged.merge(result.profile)
+    store = None
+    if player_stats:
+        store = results[0].player_stats
+        for result in results[1:]:
+            store.merge(result.player_stats)
+    return TournamentResult(
+        hands=sum(result.hands for result in results),
+        tables=num_tables,
+        workers=workers,
+        elapsed=elapsed,
+        stats=merge_stats(results),
+        profile=merged,
+        player_stats=store
+    )
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from src.game import batch, game_rules
+from src.game.batch import BatchEnvironment
+from src.game.card import Card
+from src.game.environment import Environment
+from src.game.events import NULL
+from src.game.history import StackedDeck
+from src.game.player import Player
+
+
+def _replay(deck: np.ndarray, decisions: list, num_players: int, starting_score: int, test: unittest.TestCase) -> list[int]:
+    """Plays a hand of the batch environment through an ``Environment`` and returns the chips every player won or lost."""
+    moves = iter(decisions)
+
+    def strategy(player, prev_raise, can_re_raise):
+        position, to_call, can_raise, action, amount = next(moves)
+        test.assertEqual((env.seating.position_of(player), prev_raise, can_re_raise), (position, to_call, can_raise))
+        if action == batch.FOLD:
+            return "FOLD", 0
+        if action == batch.RAISE:
+            return "RAISE", amount
+        return ("CALL", 0) if prev_raise > 0 else ("CHECK", 0)
+
+    env = Environment(events=NULL, deck=StackedDeck([Card.from_index(i) for i in deck]))
+    env.starting_score = starting_score
+    players = [Player(f"Player {i}", strategy=strategy, events=NULL) for i in range(num_players)]
+    for player in players:
+        env.add_player(player)
+    env.start_game()
+    test.assertIsNone(next(moves, None))
+    return [player.money - starting_score for player in players]
+
+
+class BatchEnvironmentTestCase(unittest.TestCase):
+    def _differential(self, num_players: int, starting_score: int, seed: int, steps: int = 300) -> int:
+        rng = np.random.default_rng(seed)
+        env = BatchEnvironment(48, num_players, starting_score, seed=seed)
+        rows = np.arange(env.num_tables)
+        _, info = env.reset()
+        decks = env.deck.copy()
+        decisions = [[] for _ in rows]
+        hands = 0
+        for _ in range(steps):
+            seat = info["player"]
+            stack = env.stacks[rows, seat]
+            to_call = env.current_bet - env.bets[rows, seat]
+            legal = info["legal"]
+            actions = np.where(legal[:, batch.RAISE] & (rng.random(len(rows)) < 0.4), batch.RAISE,
+                               np.where(rng.random(len(rows)) < 0.15, batch.FOLD, batch.CALL))
+            high = np.maximum(stack - to_call, game_rules.MIN_BET + 1)
+            amounts = rng.integers(game_rules.MIN_BET, high)
+            for i in rows:
+                decisions[i].append((seat[i], to_call[i], legal[i, batch.RAISE], actions[i], amounts[i]))
+
+            _, rewards, done, info = env.step(actions, amounts)
+            for i in np.flatnonzero(done):
+                self.assertEqual(rewards[i].sum(), 0)
+                self.assertEqual(list(rewards[i]), _replay(decks[i], decisions[i], num_players, starting_score, self))
+                decks[i] = env.deck[i]
+                decisions[i] = []
+                hands += 1
+        self.assertEqual(hands, env.hands_played)
+        return hands
+
+    def test_matches_environment_heads_up(self):
+        self.assertGreater(self._differential(2, 200, seed=0), 100)
+
+    def test_matches_environment_with_side_pots(self):
+        # Short stacks go all in often and leave side pots behind
+        self.assertGreater(self._differential(4, 60, seed=1), 100)
+        self.assertGreater(self._differential(6, 45, seed=2), 100)
+
+    def test_observations(self):
+        env = BatchEnvironment(8, 3, seed=3)
+        obs, info = env.reset()
+        self.assertEqual(obs.shape, (8, env.observation_size))
+        self.assertEqual(obs.dtype, np.float32)
+        # Two hole cards, no board before the flop, the player after the big blind acts
+        np.testing.assert_array_equal(obs[:, :52].sum(axis=1), 2)
+        np.testing.assert_array_equal(obs[:, 52:104].sum(axis=1), 0)
+        np.testing.assert_array_equal(info["player"], 2)
+
+        obs, _, _, _ = env.step(np.full(8, batch.CALL))
+        obs, _, _, _ = env.step(np.full(8, batch.CALL))
+        obs, _, _, info = env.step(np.full(8, batch.CALL))
+        # Everybody called, the small blind opens the flop
+        np.testing.assert_array_equal(obs[:, 52:104].sum(axis=1), 3)
+        np.testing.assert_array_equal(info["player"], 0)
+
+    def test_illegal_raise(self):
+        env = BatchEnvironment(2, 2, starting_score=20, seed=4)
+        env.reset()
+        with self.assertRaises(ValueError):
+            env.step(np.full(2, batch.RAISE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import random
+import unittest
+
+from benchmarks import suite
+
+
+def _results(commit: str, samples: dict[str, list[float]]) -> dict:
+    return {
+        "commit": commit,
+        "benchmarks": {name: {"samples_us": values, "median_us": sorted(values)[len(values) // 2]} for name, values in samples.items()},
+    }
+
+
+class BenchmarkSuiteTestCase(unittest.TestCase):
+    def test_run_records_samples_and_memory(self):
+        results = suite.run(["array_deck.construct", "card.format"], repeat=3)
+
+        self.assertEqual(set(results["benchmarks"]), {"array_deck.construct", "card.format_52"})
+        deck = results["benchmarks"]["array_deck.construct"]
+        self.assertEqual(len(deck["samples_us"]), 3)
+        self.assertGreater(deck["peak_bytes"], 0)
+        self.assertNotIn("peak_bytes", results["benchmarks"]["card.format_52"])
+
+    def test_compare_flags_significant_regressions(self):
+        rng = random.Random(0)
+        noise = lambda mean: [rng.gauss(mean, mean * 0.02) for _ in range(15)]
+        base = _results("a", {"same": noise(10), "slower": noise(10), "faster": noise(10), "new_only": noise(1)})
+        new = _results("b", {"same": noise(10), "slower": noise(12), "faster": noise(8)})
+
+        comparisons = {comparison.name: comparison for comparison in suite.compare(base, new)}
+        self.assertEqual(set(comparisons), {"same", "slower", "faster"})
+        self.assertTrue(comparisons["slower"].regression)
+        self.assertLess(comparisons["slower"].p_value, 0.01)
+        self.assertFalse(comparisons["same"].regression)
+        self.assertFalse(comparisons["faster"].regression)
+
+    def test_small_slowdowns_are_tolerated(self):
+        base = _results("a", {"bench": [10.0 + i * 0.001 for i in range(15)]})
+        new = _results("b", {"bench": [10.2 + i * 0.001 for i in range(15)]})
+        (comparison,) = suite.compare(base, new, threshold=0.05)
+        self.assertLess(comparison.p_value, 0.01)
+        self.assertFalse(comparison.regression)
+
+
+if __name__ == '__main__':
+    unittest.main()
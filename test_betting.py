@@ -0,0 +1,101 @@
+import random
+import unittest
+
+from src.game import betting, game_rules, headless
+from src.game.betting import BettingRound
+from src.game.player import Player
+from src.game.seating import Seating
+from src.game.strategies import random_strategy
+
+
+class BettingRoundTestCase(unittest.TestCase):
+    def setUp(self):
+        self.seating = Seating(max_seats=6)
+        self.players = [Player(name) for name in ("Alice", "Bob", "Charlie", "Dave")]
+        for player in self.players:
+            self.seating.sit(player)
+            player._money = 100
+        self.seating.new_hand()
+
+    def bet(self, player: Player, amount: int, street: BettingRound) -> None:
+        self.assertEqual(street.seat, player.seat)
+        player._money -= amount
+        player.bet_this_round += amount
+        street.record()
+
+    def test_raises_and_round_completion(self):
+        alice, bob, charlie, dave = self.players
+        street = BettingRound(self.seating, 0, 0)
+        self.assertEqual(street.legal_actions, ("CHECK", "RAISE", "FOLD"))
+        self.assertEqual((street.min_raise, street.max_raise), (game_rules.MIN_BET, 99))
+        self.assertTrue(street.is_legal("RAISE", 99))
+        self.assertFalse(street.is_legal("RAISE", 100))
+        self.assertFalse(street.is_legal("RAISE", game_rules.MIN_BET - 1))
+        self.assertFalse(street.is_legal("CALL"))
+
+        # Both raises allowed per street
+        for raiser in (alice, bob):
+            self.bet(raiser, street.to_call + game_rules.MIN_BET, street)
+        self.assertEqual(street.to_call, street.current_bet)
+        self.assertFalse(street.can_raise)
+        self.assertEqual(street.legal_actions, ("CALL", "FOLD"))
+
+        street.record(folded=True)
+        self.seating.fold(charlie.seat)
+        self.bet(dave, street.to_call, street)
+        # Alice still has to call Bob's raise, Charlie's seat is skipped from now on
+        self.assertIs(self.seating.players[street.seat], alice)
+        self.bet(alice, street.to_call, street)
+        self.assertTrue(street.complete)
+        self.assertEqual(street.legal_actions, ())
+
+    def test_lone_player_only_calls_all_ins(self):
+        alice, bob, charlie, dave = self.players
+        for player in (charlie, dave):
+            self.seating.fold(player.seat)
+        street = BettingRound(self.seating, 0, 0)
+        self.bet(alice, alice.money, street)
+        self.assertEqual(self.seating.all_in[alice.seat], 1)
+        self.assertEqual(street.to_call, 100)
+        self.assertEqual(street.legal_actions, ("CALL", "FOLD"))
+        self.bet(bob, street.to_call, street)
+        self.assertTrue(street.complete)
+
+        # The next street has nobody left to bet against
+        self.assertTrue(BettingRound(self.seating, 0, 0).complete)
+
+    def test_players_raise_within_the_round(self):
+        alice = self.players[0]
+        street = BettingRound(self.seating, 0, 0)
+        self.assertIsNone(alice.raise_error(street.max_raise, street.to_call, street.max_raise))
+        self.assertIsNotNone(alice.raise_error(street.max_raise + 1, street.to_call, street.max_raise))
+        # Without the round's limit the player works it out by the same rule
+        self.assertIsNone(alice.raise_error(street.max_raise, street.to_call))
+        self.assertIsNotNone(alice.raise_error(street.max_raise + 1, street.to_call))
+        with self.assertRaises(ValueError):
+            alice.apply_move("RAISE", 50, street.to_call, street.can_raise, max_raise=40)
+        self.assertEqual(alice.money, 100)
+
+    def test_environment_decisions_match_the_round(self):
+        rng = random.Random(0)
+        env = headless.create_table({f"Bot {i}": random_strategy(rng) for i in range(5)}, starting_score=200, seed=0)
+        for _ in range(50):
+            if env.num_players < env.min_players:
+                break
+            hand = env.play_hand()
+            try:
+                decision = next(hand)
+                while True:
+                    street = env.betting
+                    self.assertIs(env.seating.players[street.seat], decision.player)
+                    self.assertEqual(street.legal_actions, betting.legal_actions(decision.prev_raise, decision.can_re_raise))
+                    move = decision.player.strategy(decision.player, decision.prev_raise, decision.can_re_raise)
+                    self.assertTrue(street.is_legal(*move))
+                    decision = hand.send(move)
+            except StopIteration:
+                pass
+            self.assertIsNone(env.betting)
+
+
+if __name__ == '__main__':
+    unittest.main()
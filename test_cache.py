@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from src.game import cache
+from src.game.cache import LruCache
+
+
+class LruCacheTestCase(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LruCache("test.entries", max_entries=2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        self.assertEqual(lru.get("a"), 1)
+        lru.put("c", 3)
+        self.assertNotIn("b", lru)
+        self.assertEqual((lru.get("a"), lru.get("c")), (1, 3))
+        self.assertEqual(lru.stats().evictions, 1)
+
+    def test_bounded_by_memory(self):
+        lru = LruCache("test.bytes", max_bytes=10_000)
+        for i in range(5):
+            lru.put(i, np.zeros(300, dtype=np.int64))
+        self.assertEqual(len(lru), 4)
+        self.assertEqual(lru.bytes, 4 * 2400)
+        # Too large to be cached at all
+        lru.put("large", np.zeros(2000, dtype=np.int64))
+        self.assertNotIn("large", lru)
+        self.assertEqual(len(lru), 4)
+
+    def test_stats(self):
+        lru = LruCache("test.stats")
+        calls = []
+        for key in (1, 2, 1, 1, 3, 2):
+            lru.get_or_compute(key, lambda: calls.append(key) or key * 10)
+        self.assertEqual(calls, [1, 2, 3])
+        stats = lru.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (3, 3, 3))
+        self.assertAlmostEqual(stats.hit_rate, 0.5)
+        self.assertIn(stats, cache.stats())
+        self.assertIn("test.stats", cache.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import copy
+import pickle
+import unittest
+
+from src.game.card import Card, Suit, Value
+
+
+class CardTestCase(unittest.TestCase):
+    def test_interned(self):
+        self.assertIs(Card(Value.ACE, Suit.SPADES), Card("ACE", "SPADES"))
+        self.assertIs(copy.deepcopy(Card(Value.TWO, Suit.HEARTS)), Card(Value.TWO, Suit.HEARTS))
+        self.assertIs(pickle.loads(pickle.dumps(Card(Value.TEN, Suit.CLUBS))), Card(Value.TEN, Suit.CLUBS))
+
+    def test_immutable(self):
+        card = Card(Value.ACE, Suit.SPADES)
+        with self.assertRaises(AttributeError):
+            card.value = Value.KING
+        with self.assertRaises(AttributeError):
+            card.other = 1
+
+    def test_index_and_mask(self):
+        seen = set()
+        for index in range(52):
+            card = Card.from_index(index)
+            self.assertEqual(card.index, index)
+            self.assertEqual(card.mask, 1 << index)
+            self.assertIs(Card.from_mask(card.mask), card)
+            seen.add(card)
+        self.assertEqual(len(seen), 52)
+        self.assertEqual(Card(Value.TWO, Suit.HEARTS).index, 0)
+        self.assertEqual(Card(Value.ACE, Suit.SPADES).index, 51)
+
+    def test_str(self):
+        self.assertEqual(Card(Value.TEN, Suit.HEARTS).__str__(), "|10♥️|")
+
+    def test_invalid_card(self):
+        with self.assertRaises(ValueError):
+            Card("ONE", "HEARTS")
+        for mask in (0, 0b11, 1 << 52, -1):
+            with self.assertRaises(ValueError):
+                Card.from_mask(mask)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.game import cfr, game_rules, headless
+from src.game.cfr import BettingTree, CFRPlayer, Solver, StrategyTable
+from src.game.events import NULL
+from src.game.strategies import passive_strategy
+
+
+class BettingTreeTestCase(unittest.TestCase):
+    def test_structure(self):
+        tree = BettingTree()
+        self.assertEqual(tree.bets[0], (game_rules.SMALL_BLIND, game_rules.BIG_BLIND))
+        for node in range(len(tree)):
+            children = tree.children[node]
+            if tree.kind[node] != cfr.DECISION:
+                self.assertEqual(children, (-1, -1, -1))
+                continue
+            player = tree.player[node]
+            bets = tree.bets[node]
+            facing_bet = bets[1 - player] > bets[player]
+            self.assertEqual(children[cfr.FOLD] >= 0, facing_bet)
+            self.assertGreaterEqual(children[cfr.CALL], 0)
+            if children[cfr.RAISE] >= 0:
+                raised = tree.bets[children[cfr.RAISE]]
+                self.assertEqual(raised[player], bets[1 - player] + game_rules.MIN_BET)
+        # Showdowns are only reached with matched bets
+        for node in range(len(tree)):
+            if tree.kind[node] == cfr.SHOWDOWN:
+                self.assertEqual(tree.bets[node][0], tree.bets[node][1])
+
+    def test_raises_per_street(self):
+        tree = BettingTree()
+        max_bet = max(max(bets) for bets in tree.bets)
+        self.assertEqual(max_bet, game_rules.BIG_BLIND + cfr.NUM_STREETS * cfr.MAX_RAISES * game_rules.MIN_BET)
+
+
+class SolverTestCase(unittest.TestCase):
+    def test_exploitability_decreases(self):
+        solver = Solver(num_buckets=4, rollouts=8)
+        deals = cfr.deal(500, 4, 8, np.random.default_rng(1))
+        uniform = solver.exploitability(deals)
+        solver.run(1500, np.random.default_rng(0))
+        self.assertLess(solver.exploitability(deals), uniform)
+
+        strategy = solver.average_strategy()
+        np.testing.assert_allclose(strategy.sum(axis=1), 1, rtol=1e-6)
+        self.assertTrue((strategy[~solver.legal] == 0).all())
+
+    def test_workers(self):
+        solver, reports = cfr.solve(200, num_buckets=4, workers=2, report_every=100, rollouts=4, eval_deals=100)
+        self.assertEqual(solver.iterations, 200)
+        self.assertEqual([report.iterations for report in reports], [100, 200])
+        self.assertTrue((solver.regrets >= 0).all())
+        self.assertGreater(solver.strategy_sum.sum(), 0)
+
+
+class StrategyFileTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        solver = Solver(num_buckets=4, rollouts=4)
+        solver.run(100, np.random.default_rng(0))
+        strategy = solver.average_strategy()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "strategy.bin")
+            cfr.write_strategy(strategy, 4, path)
+            table = StrategyTable(path)
+            self.assertEqual(table.num_buckets, 4)
+            np.testing.assert_allclose(table.table, strategy, atol=1e-3)
+            situation = cfr.situation(1, 1, 1, True)
+            np.testing.assert_allclose(table.probabilities(1, 1, 1, True, 3), strategy[situation * 4 + 3], atol=1e-3)
+            del table
+
+
+class CFRPlayerTestCase(unittest.TestCase):
+    def test_plays_multiway(self):
+        rng = random.Random(0)
+        env = headless.create_table({"Caller": passive_strategy}, starting_score=100_000)
+        for i in range(3):
+            env.add_player(CFRPlayer(f"CFR {i}", events=NULL, rng=rng, rollouts=16))
+        money = sum(player.money for player in env.seating)
+        self.assertEqual(headless.play_hands(env, 30), 30)
+        self.assertEqual(sum(player.money for player in env.seating), money)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from src.game.deck import ArrayDeck, Deck
+
+
+class ArrayDeckTestCase(unittest.TestCase):
+    def test_draws_every_card_once(self):
+        deck = ArrayDeck(seed=1)
+        for _ in range(3):
+            deck.reset()
+            drawn = [deck.draw() for _ in range(52)]
+            self.assertEqual(len(set(map(id, drawn))), 52)
+            self.assertEqual(len(deck), 0)
+            with self.assertRaises(IndexError):
+                deck.draw()
+
+    def test_same_cards_as_deck(self):
+        self.assertEqual(
+            sorted(card.__str__() for card in ArrayDeck().cards),
+            sorted(card.__str__() for card in Deck().cards)
+        )
+
+    def test_seeded_decks_are_reproducible(self):
+        first = ArrayDeck(seed=42)
+        second = ArrayDeck(seed=42)
+        for _ in range(5):
+            first.reset()
+            second.reset()
+            self.assertEqual([first.draw() for _ in range(20)], [second.draw() for _ in range(20)])
+
+    def test_draw_below_top_keeps_order(self):
+        deck = ArrayDeck(seed=3)
+        deck.reset()
+        cards = deck.cards
+        self.assertIs(deck.draw(2), cards[2])
+        self.assertEqual(deck.cards, cards[:2] + cards[3:])
+
+    def test_shuffle_keeps_drawn_cards_out(self):
+        deck = ArrayDeck(seed=4)
+        deck.reset()
+        drawn = [deck.draw() for _ in range(10)]
+        deck.shuffle()
+        remaining = deck.cards
+        self.assertEqual(len(remaining), 42)
+        self.assertTrue(all(card not in remaining for card in drawn))
+
+    def test_snapshot_keeps_the_cards_to_come(self):
+        deck = ArrayDeck(seed=5)
+        reference = ArrayDeck(seed=5)
+        deck.reset()
+        reference.reset()
+        for _ in range(4):
+            deck.draw()
+            reference.draw()
+
+        snapshot = deck.snapshot()
+        self.assertEqual(len(snapshot), 53)
+        expected = [reference.draw() for _ in range(10)]
+        for _ in range(3):
+            self.assertEqual([deck.draw() for _ in range(10)], expected)
+            deck.restore(snapshot)
+        deck.shuffle()
+        self.assertEqual(sorted(card.index for card in deck.cards), sorted(card.index for card in reference.cards + expected))
+
+    def test_deck_snapshot(self):
+        deck = Deck(seed=6)
+        deck.reset()
+        deck.draw()
+        snapshot = deck.snapshot()
+        cards = [deck.draw() for _ in range(5)]
+        deck.restore(snapshot)
+        self.assertEqual([deck.draw() for _ in range(5)], cards)
+
+
+if __name__ == '__main__':
+    unittest.main()
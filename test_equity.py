@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from src.game import equity, evaluator
+from src.game.player import Player
+from test_evaluator import cards
+
+
+class EvaluateBatchTestCase(unittest.TestCase):
+    def test_matches_scalar_evaluator(self):
+        rng = np.random.default_rng(7)
+        for num_cards in (5, 6, 7):
+            hands = rng.random((3000, evaluator.NUM_CARDS)).argsort(axis=1)[:, :num_cards]
+            strengths = equity.evaluate_batch(hands)
+            for hand, strength in zip(hands.tolist(), strengths.tolist()):
+                self.assertEqual(strength, evaluator.evaluate_indices(hand))
+
+
+class EquityTestCase(unittest.TestCase):
+    def test_aces_against_random_hand(self):
+        result = equity.equity(cards("AH AD"), margin=0.01, rng=np.random.default_rng(1))
+        self.assertAlmostEqual(result.equity, 0.852, delta=0.015)
+        low, high = result.interval()
+        self.assertLessEqual(high - low, 0.02 + 1e-9)
+
+    def test_aces_against_kings_range(self):
+        kings = [tuple(cards("KH KD")), tuple(cards("KS KC"))]
+        result = equity.equity(cards("AH AD"), ranges=[kings], margin=0.01, rng=np.random.default_rng(2))
+        self.assertAlmostEqual(result.equity, 0.82, delta=0.015)
+
+    def test_complete_board(self):
+        # The nut straight flush cannot lose
+        result = equity.equity(cards("AH KH"), cards("QH JH 10H 2C 3D"), num_opponents=3, rng=np.random.default_rng(3))
+        self.assertEqual(result.equity, 1.0)
+        self.assertEqual(result.std_error, 0.0)
+
+    def test_split_board(self):
+        # Everybody plays the royal flush on the board
+        result = equity.equity(cards("2C 3D"), cards("AH KH QH JH 10H"), num_opponents=2, rng=np.random.default_rng(4))
+        self.assertAlmostEqual(result.equity, 1 / 3)
+
+    def test_early_stop(self):
+        result = equity.equity(cards("7H 2D"), margin=0.05, batch_size=1000, rng=np.random.default_rng(5))
+        self.assertLess(result.trials, 10_000)
+
+    def test_blocked_range(self):
+        with self.assertRaises(ValueError):
+            equity.equity(cards("AH AD"), ranges=[[tuple(cards("AH KD"))]])
+
+    def test_player_hand_equity(self):
+        player = Player("Alice")
+        player.cards = cards("AH AD")
+        result = player.hand_equity(cards("2C 7D 9S"), margin=0.02, rng=np.random.default_rng(6))
+        self.assertGreater(result.equity, 0.8)
+
+    def test_cached_equity_of_isomorphic_hands(self):
+        hits = equity._cache.hits
+        first = equity.cached_equity(cards("AH KH"), cards("2H 7D 9S"), margin=0.02)
+        second = equity.cached_equity(cards("AS KS"), cards("2S 7C 9D"), margin=0.02)
+        self.assertIs(first, second)
+        self.assertEqual(equity._cache.hits, hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
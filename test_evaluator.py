@@ -0,0 +1,136 @@
+import random
+import unittest
+
+from src.game import evaluator
+from src.game.card import Card
+from src.game.environment import Environment
+from src.game.player import Player
+
+
+def cards(text: str) -> list[Card]:
+    """Builds cards from a short notation like ``"AS KH 10D"``."""
+    values = {"2": "TWO", "3": "THREE", "4": "FOUR", "5": "FIVE", "6": "SIX", "7": "SEVEN", "8": "EIGHT",
+              "9": "NINE", "10": "TEN", "J": "JACK", "Q": "QUEEN", "K": "KING", "A": "ACE"}
+    suits = {"H": "HEARTS", "D": "DIAMONDS", "C": "CLUBS", "S": "SPADES"}
+    return [Card(values[c[:-1]], suits[c[-1]]) for c in text.split()]
+
+
+class EvaluatorTestCase(unittest.TestCase):
+    def test_hand_classes(self):
+        self.assertEqual(evaluator.HAND_CLASSES, 7462)
+
+    def test_encode_decode(self):
+        for index in range(evaluator.NUM_CARDS):
+            self.assertEqual(evaluator.encode(evaluator.decode(index)), index)
+
+    def test_categories(self):
+        hands = [
+            ("2H 7D 9C JS KH 3C 4D", evaluator.HIGH_CARD),
+            ("2H 2D 9C JS KH 3C 4D", evaluator.ONE_PAIR),
+            ("2H 2D 9C 9S KH 3C 4D", evaluator.TWO_PAIR),
+            ("2H 2D 2C JS KH 3C 4D", evaluator.THREE_OF_A_KIND),
+            ("AH 2D 3C 4S 5H 9C KD", evaluator.STRAIGHT),
+            ("2H 7H 9H JH KH 3C 4D", evaluator.FLUSH),
+            ("2H 2D 2C JS JH 3C 4D", evaluator.FULL_HOUSE),
+            ("2H 2D 2C 2S KH 3C 4D", evaluator.FOUR_OF_A_KIND),
+            ("AH 2H 3H 4H 5H 9C KD", evaluator.STRAIGHT_FLUSH),
+        ]
+        for hand, category in hands:
+            self.assertEqual(evaluator.category(evaluator.evaluate(cards(hand))), category, hand)
+
+    def test_ordering(self):
+        wheel = evaluator.evaluate(cards("AH 2D 3C 4S 5H"))
+        six_high = evaluator.evaluate(cards("6H 2D 3C 4S 5H"))
+        self.assertLess(wheel, six_high)
+
+        kicker_low = evaluator.evaluate(cards("AH AD 9C 8S 3H"))
+        kicker_high = evaluator.evaluate(cards("AS AC 10C 8D 3D"))
+        self.assertLess(kicker_low, kicker_high)
+
+        # The sixth and seventh card cannot improve on the best five
+        self.assertEqual(evaluator.evaluate(cards("AH AD KC KS QH 2C 3D")), evaluator.evaluate(cards("AH AD KC KS QH")))
+
+    def test_matches_naive_evaluator(self):
+        rng = random.Random(42)
+        for num_cards in (5, 6, 7):
+            for _ in range(2000):
+                hand = [evaluator.decode(i) for i in rng.sample(range(evaluator.NUM_CARDS), num_cards)]
+                self.assertEqual(evaluator.evaluate(hand), evaluator.evaluate_naive(hand))
+
+    def test_invalid_number_of_cards(self):
+        with self.assertRaises(ValueError):
+            evaluator.evaluate(cards("AH AD KC KS"))
+
+
+class ShowdownTestCase(unittest.TestCase):
+    def setUp(self):
+        self.env = Environment()
+        self.player1 = Player("Alice")
+        self.player2 = Player("Bob")
+        self.player3 = Player("Charlie")
+        for player in (self.player1, self.player2, self.player3):
+            self.env.add_player(player)
+        self.env.the_flop = cards("2H 7D 9C")
+        self.env.turn_card = cards("JS")[0]
+        self.env.the_river = cards("KH")[0]
+        self.env.seating.new_hand()
+
+    def bet(self, *amounts: int) -> None:
+        for player, amount in zip((self.player1, self.player2, self.player3), amounts):
+            if amount == 0:
+                continue
+            player.money = player.money - amount
+            self.env.pot += amount
+
+    def test_single_winner(self):
+        self.player1.cards = cards("KD KC")
+        self.player2.cards = cards("AH AD")
+        self.player3.cards = cards("3C 4D")
+        self.bet(10, 10, 10)
+        self.env.showdown_round()
+
+        self.assertEqual(self.player1.money, self.env.starting_score + 20)
+        self.assertEqual(self.player2.money, self.env.starting_score - 10)
+        self.assertEqual(self.env.pot, 0)
+
+    def test_split_pot_odd_chip(self):
+        self.player1.cards = cards("3C 4D")
+        self.player2.cards = cards("AH QD")
+        self.player3.cards = cards("AC QS")
+        self.bet(11, 10, 10)
+        self.env._muck(self.player1)
+        self.env.showdown_round()
+
+        self.assertEqual(self.player1.money, self.env.starting_score - 11)
+        self.assertEqual(self.player2.money, self.env.starting_score + 6)
+        self.assertEqual(self.player3.money, self.env.starting_score + 5)
+
+    def test_folded_players_are_ignored(self):
+        self.player1.cards = cards("AH AD")
+        self.player2.cards = cards("3C 4D")
+        self.player3.cards = cards("5C 6D")
+        self.bet(10, 5, 5)
+        self.env._muck(self.player1)
+        self.env.showdown_round()
+
+        self.assertEqual(self.player1.money, self.env.starting_score - 10)
+        self.assertEqual(self.player3.money, self.env.starting_score + 15)
+
+    def test_side_pot(self):
+        self.player1.cards = cards("AH AD")
+        self.player2.cards = cards("QD QC")
+        self.player3.cards = cards("3C 4D")
+        # Alice is all in with 20
+        self.player1._money = 20
+        self.player1._all_in()
+        self.bet(0, 50, 50)
+        self.env.pot += 20
+        self.env.showdown_round()
+
+        self.assertEqual(self.player1.money, 60)
+        self.assertEqual(self.player2.money, self.env.starting_score - 50 + 60)
+        self.assertEqual(self.player3.money, self.env.starting_score - 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from src.game import events as ev
+from src.game import headless
+from src.game.events import EventBus, EventCounter
+from src.game.player import Player
+from src.game.strategies import passive_strategy
+
+
+class CountingName(str):
+    """A name counting how often it is formatted."""
+    formatted = 0
+
+    def __format__(self, spec: str) -> str:
+        CountingName.formatted += 1
+        return str.__format__(self, spec)
+
+
+class EventBusTestCase(unittest.TestCase):
+    def test_levels_and_kinds(self):
+        bus = EventBus()
+        everything, money, warnings = [], [], []
+        bus.subscribe(everything.append, ev.DEBUG)
+        bus.subscribe(money.append, ev.INFO, kinds=[ev.MONEY])
+        bus.subscribe(warnings.append, ev.WARNING)
+
+        bus.emit(ev.ACTION, ev.DEBUG, "[H] {}", 1)
+        bus.emit(ev.MONEY, ev.INFO, "[+$] {} gains {}", "Alice", 5)
+        bus.emit(ev.GAME, ev.WARNING, "[!] {} is out", "Bob")
+
+        self.assertEqual([e.kind for e in everything], [ev.ACTION, ev.MONEY, ev.GAME])
+        self.assertEqual([e.message for e in money], ["[+$] Alice gains 5"])
+        self.assertEqual(warnings[0].args, ("Bob",))
+
+        bus.unsubscribe(everything.append)
+        self.assertFalse(bus.enabled(ev.DEBUG))
+        self.assertTrue(bus.enabled(ev.INFO))
+
+    def test_events_are_forwarded_to_parent(self):
+        parent = EventBus()
+        child = EventBus(parent=parent)
+        self.assertFalse(child.enabled(ev.INFO))
+
+        received = []
+        parent.subscribe(received.append, ev.INFO)
+        self.assertTrue(child.enabled(ev.INFO))
+        child.emit(ev.BOARD, ev.INFO, "[T] Turn: {}", "x")
+        self.assertEqual(len(received), 1)
+
+    def test_formatting_is_lazy(self):
+        CountingName.formatted = 0
+        player = Player(CountingName("Alice"), strategy=passive_strategy, events=ev.NULL)
+        player.money = 100
+        player.money = 90
+        self.assertEqual(CountingName.formatted, 0)
+
+        bus = EventBus()
+        counter = EventCounter()
+        bus.subscribe(counter, ev.INFO)
+        player.events = bus
+        player.money = 80
+        # Counting events does not format them either
+        self.assertEqual(CountingName.formatted, 0)
+        self.assertEqual(counter.counts[ev.MONEY], 1)
+
+    def test_null_refuses_subscribers(self):
+        with self.assertRaises(ValueError):
+            ev.NULL.subscribe(print)
+
+    def test_table_subscribers(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            env = headless.create_table({"Alice": passive_strategy, "Bob": passive_strategy})
+            counter = EventCounter()
+            env.events.subscribe(counter, ev.DEBUG)
+            headless.play_hands(env, 2)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(counter.counts[ev.HAND_START], 2)
+        self.assertEqual(counter.counts[ev.HAND_END], 2)
+        self.assertEqual(counter.counts[ev.BLIND], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
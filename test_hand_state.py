@@ -0,0 +1,73 @@
+import random
+import unittest
+
+from src.game import evaluator, headless
+from src.game.card import Card
+from src.game.hand_state import HandState
+from src.game.strategies import passive_strategy
+from test_evaluator import cards
+
+
+def _has_flush(hand: list[Card]) -> bool:
+    return any(sum(1 for card in hand if card.suit == suit) >= 5 for suit in {card.suit for card in hand})
+
+
+def _has_straight(hand: list[Card]) -> bool:
+    ranks = {card.index >> 2 for card in hand}
+    mask = sum(1 << rank for rank in ranks)
+    return evaluator._straight_high(mask) >= 0
+
+
+class HandStateTestCase(unittest.TestCase):
+    def test_matches_full_evaluation(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            hand = [Card.from_index(i) for i in rng.sample(range(52), 7)]
+            state = HandState()
+            for i, card in enumerate(hand):
+                state.add_card(card)
+                if i >= 4:
+                    self.assertEqual(state.strength, evaluator.evaluate(hand[:i + 1]))
+                    self.assertEqual(state.category, evaluator.category(state.strength))
+                else:
+                    self.assertEqual(state.strength, 0)
+
+    def test_outs_match_brute_force(self):
+        rng = random.Random(4)
+        for _ in range(300):
+            num_cards = rng.choice((5, 6))
+            hand = [Card.from_index(i) for i in rng.sample(range(52), num_cards)]
+            state = HandState(hand)
+
+            flush, straight = _has_flush(hand), _has_straight(hand)
+            expected = 0
+            for card in (Card.from_index(i) for i in range(52)):
+                if card in hand:
+                    continue
+                improved = hand + [card]
+                if (not flush and _has_flush(improved)) or (not straight and _has_straight(improved)):
+                    expected += 1
+            self.assertEqual(state.outs, expected, hand)
+
+    def test_draws(self):
+        open_ended = HandState(cards("8H 9D 10C JS 2H"))
+        self.assertEqual(open_ended.straight_draw, 2)
+        self.assertEqual(open_ended.outs, 8)
+
+        gutshot = HandState(cards("8H 9D JC QS 2H"))
+        self.assertEqual(gutshot.straight_draw, 1)
+
+        flush_draw = HandState(cards("2H 7H 9H KH AS"))
+        self.assertTrue(flush_draw.flush_draw)
+        self.assertEqual(flush_draw.outs, 9)
+
+    def test_environment_keeps_states_up_to_date(self):
+        env = headless.create_table({"Alice": passive_strategy, "Bob": passive_strategy})
+        env.start_game()
+        for player in env._players():
+            self.assertEqual(player.hand_state.num_cards, 7)
+            self.assertEqual(player.hand_state.strength, evaluator.evaluate(player.cards + env.table_cards))
+
+
+if __name__ == '__main__':
+    unittest.main()
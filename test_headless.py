@@ -0,0 +1,63 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from src.game import headless
+from src.game.strategies import passive_strategy, random_strategy
+
+
+def fold_strategy(player, prev_raise, can_re_raise):
+    return ("FOLD", 0) if prev_raise > 0 else ("CHECK", 0)
+
+
+class HeadlessTestCase(unittest.TestCase):
+    def test_no_console_output(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            rng = random.Random(1)
+            env = headless.create_table({name: random_strategy(rng) for name in ("Alice", "Bob", "Charlie")})
+            headless.play_hands(env, 50)
+        self.assertEqual(output.getvalue(), "")
+
+    def test_money_is_conserved(self):
+        rng = random.Random(2)
+        env = headless.create_table({f"Bot {i}": random_strategy(rng) for i in range(5)}, starting_score=10_000)
+        players = list(env._players())
+        played = headless.play_hands(env, 200)
+
+        self.assertEqual(played, 200)
+        self.assertEqual(sum(p.money for p in players), 5 * 10_000)
+        self.assertEqual(env.pot, 0)
+
+    def test_complete_hand_reaches_showdown(self):
+        env = headless.create_table({"Alice": passive_strategy, "Bob": passive_strategy})
+        headless.play_hands(env, 1)
+
+        self.assertEqual(len(env.table_cards), 5)
+        self.assertTrue(all(p.playing for p in env._players()))
+
+    def test_everybody_folds_to_big_blind(self):
+        env = headless.create_table({"Alice": fold_strategy, "Bob": fold_strategy, "Charlie": fold_strategy})
+        alice, bob, charlie = env._players()
+        headless.play_hands(env, 1)
+
+        self.assertEqual(env.table_cards, [])
+        self.assertEqual(bob.money, env.starting_score + 5)
+        self.assertEqual(alice.money, env.starting_score - 5)
+        self.assertEqual(charlie.money, env.starting_score)
+        # Blinds moved on by one seat
+        self.assertIs(env.small_blind, bob)
+        self.assertIs(env.big_blind, charlie)
+
+    def test_stops_when_players_run_out_of_money(self):
+        rng = random.Random(3)
+        env = headless.create_table({"Alice": random_strategy(rng), "Bob": random_strategy(rng)}, starting_score=30)
+        played = headless.play_hands(env, 10_000)
+
+        self.assertLess(played, 10_000)
+        self.assertEqual(env.num_players, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
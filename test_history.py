@@ -0,0 +1,70 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.game import headless, history
+from src.game.strategies import random_strategy
+
+
+class HandHistoryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "hands.bin"
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _play(self, num_hands: int, buffer_size: int = 1 << 20) -> list:
+        rng = random.Random(1)
+        with history.HandHistoryWriter(self.path, buffer_size=buffer_size) as writer:
+            env = headless.create_table({f"Bot {i}": random_strategy(rng) for i in range(4)}, starting_score=1000, history=writer, seed=0)
+            headless.play_hands(env, num_hands)
+        return list(env._players())
+
+    def test_round_trip(self):
+        players = self._play(50, buffer_size=256)
+        hands = list(history.read_hands(self.path))
+
+        self.assertEqual([hand.hand_id for hand in hands], list(range(50)))
+        for hand in hands:
+            self.assertEqual(sorted(hand.players), sorted(p.name for p in players))
+            self.assertTrue(all(len(cards) == 2 for cards in hand.hole_cards))
+            self.assertIn(len(hand.board), (0, 3, 4, 5))
+            blinds = [action.action for action in hand.actions[:2]]
+            self.assertEqual(blinds, [history.SMALL_BLIND, history.BIG_BLIND])
+
+            # Everything that was put in is paid out again
+            self.assertEqual(sum(action.amount for action in hand.actions), sum(hand.payouts))
+
+        # The last hand's stacks plus its result are the final stacks
+        last = hands[-1]
+        final = {p.name: p.money for p in players}
+        for seat, name in enumerate(last.players):
+            spent = sum(action.amount for action in last.actions if action.seat == seat)
+            self.assertEqual(last.stacks[seat] - spent + last.payouts[seat], final[name])
+
+    def test_replay(self):
+        self._play(30)
+        for hand in history.read_hands(self.path):
+            env = history.replay(hand)
+            players = list(env._players())
+            # The blinds moved on by one seat after the hand, undo that to match the seats
+            players = players[-1:] + players[:-1]
+            for seat, player in enumerate(players):
+                self.assertEqual(player.name, hand.players[seat])
+            self.assertEqual(env.table_cards, hand.board)
+
+    def test_replay_is_recorded_identically(self):
+        self._play(20)
+        copy_path = Path(self.directory.name) / "copy.bin"
+        with history.HandHistoryWriter(copy_path) as writer:
+            for hand in history.read_hands(self.path):
+                history.replay(hand, history=writer)
+
+        for original, replayed in zip(history.read_hands(self.path), history.read_hands(copy_path), strict=True):
+            self.assertEqual(original._replace(hand_id=0), replayed._replace(hand_id=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import random
+import unittest
+from itertools import combinations
+
+from src.game import isomorphism, preflop
+from src.game.card import Card
+
+
+class IsomorphismTestCase(unittest.TestCase):
+    def test_state_space_reduction(self):
+        flops = {isomorphism.canonical_index((), flop) for flop in combinations(range(52), 3)}
+        self.assertEqual(len(flops), 1755)
+        hands = {isomorphism.canonical_index(hole) for hole in combinations(range(52), 2)}
+        self.assertEqual(len(hands), preflop.NUM_CLASSES)
+
+    def test_preflop_classes(self):
+        classes = {}
+        for first, second in combinations(range(52), 2):
+            index = isomorphism.canonical_index((first, second))
+            hand_class = preflop.hand_class(Card.from_index(first), Card.from_index(second))
+            self.assertEqual(classes.setdefault(index, hand_class), hand_class)
+
+    def test_renamed_suits_are_equal(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            cards = rng.sample(range(52), rng.choice((2, 5, 6, 7)))
+            hole, board = cards[:2], cards[2:]
+            permutation = rng.randrange(len(isomorphism.SUIT_PERMUTATIONS))
+            renamed_hole, renamed_board = isomorphism.rename(hole, permutation), isomorphism.rename(board, permutation)
+            self.assertEqual(isomorphism.canonical_index(hole, board), isomorphism.canonical_index(renamed_hole, renamed_board))
+            self.assertEqual(isomorphism.canonical(hole, board)[:2], isomorphism.canonical(renamed_hole, renamed_board)[:2])
+
+            canonical_hole, canonical_board, used = isomorphism.canonical(hole, board)
+            self.assertEqual(canonical_hole, tuple(sorted(isomorphism.rename(hole, used))))
+            self.assertEqual(canonical_board, tuple(sorted(isomorphism.rename(board, used))))
+
+    def test_hole_cards_and_board_differ(self):
+        # The same cards in the hole or on the board are different situations
+        self.assertNotEqual(isomorphism.canonical_index((0, 4), (8, 12, 16)), isomorphism.canonical_index((8, 12), (0, 4, 16)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.game import headless, history, opponents
+from src.game.opponents import OpponentModel
+from src.game.strategies import passive_strategy, random_strategy
+
+
+def fold_strategy(player, prev_raise, can_re_raise):
+    return ("FOLD", 0) if prev_raise > 0 else ("CHECK", 0)
+
+
+def raise_strategy(player, prev_raise, can_re_raise):
+    return ("RAISE", 10) if can_re_raise else ("CALL", 0) if prev_raise > 0 else ("CHECK", 0)
+
+
+class OpponentModelTestCase(unittest.TestCase):
+    def test_observe(self):
+        model = OpponentModel(capacity=1)
+        model.new_hand(["Alice", "Bob"])
+        model.observe("Alice", history.PRE_FLOP, history.SMALL_BLIND)
+        model.observe("Alice", history.PRE_FLOP, history.RAISE)
+        model.observe("Alice", history.PRE_FLOP, history.CALL)
+        model.observe("Bob", history.PRE_FLOP, history.FOLD)
+
+        alice, bob = model.features(model.rows_of(["Alice", "Bob"]))
+        np.testing.assert_allclose(alice, [1, 1, 1, 0.5, 0, 0])
+        np.testing.assert_allclose(bob, [1, 0, 0, 0, 1, 0])
+
+    def test_learns_from_tables(self):
+        model = OpponentModel()
+        env = headless.create_table({"Folder": fold_strategy, "Caller": passive_strategy, "Raiser": raise_strategy}, starting_score=10_000, seed=0)
+        model.attach(env)
+        headless.play_hands(env, 30)
+
+        features = model.features(model.rows_of(["Folder", "Caller", "Raiser"]))
+        hands = features[:, 0]
+        self.assertTrue((hands > 0).all())
+        folder, caller, raiser = features
+        self.assertEqual(folder[1], 0)
+        self.assertEqual(caller[3], 0)
+        self.assertGreater(raiser[2], 0.5)
+        self.assertGreater(raiser[3], caller[3])
+
+        probabilities = model.action_probabilities(model.rows_of(["Folder", "Raiser"]), [0, 0], [True, True])
+        self.assertGreater(probabilities[0, 0], 0.5)
+        self.assertGreater(probabilities[1, 2], 0.5)
+
+    def test_batch_matches_single_rows(self):
+        rng = random.Random(1)
+        model = OpponentModel()
+        for _ in range(2000):
+            name = f"Bot {rng.randrange(100)}"
+            model.observe(name, rng.randrange(4), rng.choice((history.FOLD, history.CHECK, history.CALL, history.RAISE)))
+
+        rows = np.arange(len(model))
+        streets = np.array([rng.randrange(4) for _ in rows])
+        facing = np.array([rng.random() < 0.5 for _ in rows])
+        batch = model.action_probabilities(rows, streets, facing)
+        for row in rows:
+            single = model.action_probabilities([row], [streets[row]], [facing[row]])[0]
+            np.testing.assert_allclose(batch[row], single)
+        np.testing.assert_allclose(batch.sum(axis=1), 1.0)
+        self.assertTrue((batch[~facing, 0] == 0).all())
+
+    def test_unknown_players_get_the_prior(self):
+        model = OpponentModel()
+        probabilities = model.action_probabilities(model.rows_of(["Nobody"]), [0], [True])[0]
+        np.testing.assert_allclose(probabilities, opponents.PRIOR / opponents.PRIOR.sum())
+
+    def test_save_and_load(self):
+        model = OpponentModel()
+        env = headless.create_table({f"Bot {i}": random_strategy(random.Random(i)) for i in range(4)})
+        model.attach(env)
+        headless.play_hands(env, 20)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profiles.bin")
+            model.save(path)
+
+            loaded = OpponentModel.load(path)
+            self.assertEqual(loaded.names, model.names)
+            np.testing.assert_array_equal(loaded.counts[:len(loaded)], model.counts[:len(model)])
+
+            subset = OpponentModel.load(path, ["Bot 2", "Stranger"])
+            self.assertEqual(subset.names, ["Bot 2", "Stranger"])
+            np.testing.assert_array_equal(subset.counts[0], model.counts[model.rows["Bot 2"]])
+            self.assertEqual(subset.counts[1].sum(), 0)
+
+            # Names are stored with their length, any character is kept
+            model.rows_of(["Line\nbreak", "", "Zoë"])
+            model.save(path)
+            self.assertEqual(OpponentModel.load(path).names, model.names)
+
+
+if __name__ == '__main__':
+    unittest.main()
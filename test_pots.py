@@ -0,0 +1,90 @@
+import random
+import unittest
+
+from src.game import headless, pots
+from src.game.strategies import random_strategy
+
+
+def reference_settle(contributions, folded, strengths, positions):
+    """Straightforward settlement: one pot per distinct all-in level, winners searched per pot."""
+    contenders = [p for p in range(len(contributions)) if not folded[p]]
+    levels = sorted({contributions[p] for p in contenders})
+    payouts = [0] * len(contributions)
+    pot_list = []
+    previous = 0
+    for level in levels:
+        amount = sum(min(c, level) - min(c, previous) for c in contributions)
+        eligible = [p for p in contenders if contributions[p] >= level]
+        if amount:
+            pot_list.append([amount, eligible])
+        previous = level
+    leftover = sum(contributions) - sum(amount for amount, _ in pot_list)
+    if leftover and pot_list:
+        pot_list[-1][0] += leftover
+    elif leftover:
+        pot_list.append([leftover, contenders])
+
+    for amount, eligible in pot_list:
+        best = max(strengths[p] for p in eligible)
+        winners = sorted((p for p in eligible if strengths[p] == best), key=lambda p: positions[p])
+        share, odd_chips = divmod(amount, len(winners))
+        for i, p in enumerate(winners):
+            payouts[p] += share + (1 if i < odd_chips else 0)
+    return payouts
+
+
+def random_hand(rng: random.Random):
+    num_players = rng.randint(2, 10)
+    contributions = [rng.choice((0, 5, 10, 10, 25, 40, 40, 100, rng.randint(1, 200))) for _ in range(num_players)]
+    folded = [rng.random() < 0.3 for _ in range(num_players)]
+    if all(folded):
+        folded[rng.randrange(num_players)] = False
+    # Few distinct strengths so ties are common
+    strengths = [rng.randint(1, 4) for _ in range(num_players)]
+    positions = rng.sample(range(num_players), num_players)
+    return contributions, folded, strengths, positions
+
+
+class PotsTestCase(unittest.TestCase):
+    def test_main_and_side_pots(self):
+        # Player 0 all in with 20, player 3 folded after putting in 30
+        result = pots.build_pots([20, 50, 100, 30], [False, False, False, True])
+        self.assertEqual(result, [
+            pots.Pot(80, (0, 1, 2)),
+            pots.Pot(70, (1, 2)),
+            pots.Pot(50, (2,)),
+        ])
+
+    def test_equal_all_ins_share_a_pot(self):
+        result = pots.build_pots([20, 20, 60], [False, False, False])
+        self.assertEqual(result, [pots.Pot(60, (0, 1, 2)), pots.Pot(40, (2,))])
+
+    def test_odd_chips_go_to_lowest_position(self):
+        payouts = pots.settle([7, 7, 7], [False, False, False], [3, 3, 3], positions=[2, 0, 1])
+        self.assertEqual(payouts, [7, 7, 7])
+        payouts = pots.settle([5, 5, 1], [False, False, True], [3, 3, 0], positions=[1, 0, 2])
+        self.assertEqual(payouts, [5, 6, 0])
+
+    def test_matches_reference(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            contributions, folded, strengths, positions = random_hand(rng)
+            expected = reference_settle(contributions, folded, strengths, positions)
+            self.assertEqual(pots.settle(contributions, folded, strengths, positions), expected, (contributions, folded, strengths, positions))
+            self.assertEqual(sum(expected), sum(contributions))
+            self.assertEqual(sum(amount for amount, _ in pots.build_pots(contributions, folded)), sum(contributions))
+
+    def test_uneven_stacks_conserve_money(self):
+        rng = random.Random(4)
+        env = headless.create_table({f"Bot {i}": random_strategy(rng, raise_chance=0.5) for i in range(6)})
+        players = list(env._players())
+        for i, player in enumerate(players):
+            player._money = 15 + 20 * i
+        headless.play_hands(env, 500)
+
+        self.assertEqual(sum(p.money for p in players), sum(15 + 20 * i for i in range(6)))
+        self.assertTrue(all(p.money > 0 for p in env._players()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.game import preflop
+from src.game.player import Player
+from test_evaluator import cards
+
+
+class HandClassTestCase(unittest.TestCase):
+    def test_classes(self):
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("AH KH"))), "AKs")
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("2C 7D"))), "72o")
+        self.assertEqual(preflop.class_name(preflop.hand_class(*cards("QS QD"))), "QQ")
+        self.assertEqual(len({preflop.class_name(hand) for hand in range(preflop.NUM_CLASSES)}), 169)
+
+    def test_representatives(self):
+        for hand in range(preflop.NUM_CLASSES):
+            first, second = preflop.representative(hand)
+            self.assertEqual(preflop.hand_class(first, second), hand)
+            self.assertEqual(preflop.hand_class(second, first), hand)
+
+
+class PreflopTableTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        table = np.random.default_rng(0).random((preflop.NUM_CLASSES, 3)).astype(np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "table.bin"
+            preflop.write_table(table, path)
+            loaded = preflop.PreflopTable(path)
+
+            hand = cards("AH KH")
+            self.assertEqual(loaded.max_opponents, 3)
+            self.assertAlmostEqual(loaded.equity(*hand, 2), float(table[preflop.hand_class(*hand), 1]))
+            with self.assertRaises(ValueError):
+                loaded.equity(*hand, 4)
+            del loaded
+
+    def test_shipped_table(self):
+        player = Player("Alice")
+        player.cards = cards("AH AD")
+        self.assertAlmostEqual(player.preflop_equity(2), 0.852, delta=0.01)
+        self.assertGreater(player.preflop_equity(2), player.preflop_equity(10))
+
+        aces = preflop.preflop_equity(*cards("AS AC"), 2)
+        seven_two = preflop.preflop_equity(*cards("7S 2C"), 2)
+        self.assertGreater(aces, seven_two)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import json
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from src.game import headless, profiling, tournament
+from src.game.profiling import HandProfiler, Histogram
+from src.game.strategies import passive_strategy
+
+
+def slow_strategy(player, prev_raise, can_re_raise):
+    time.sleep(0.002)
+    return passive_strategy(player, prev_raise, can_re_raise)
+
+
+class HistogramTestCase(unittest.TestCase):
+    def test_buckets_cover_every_duration(self):
+        previous = -1
+        for ns in list(range(64)) + [1000, 1023, 1024, 10 ** 6, 10 ** 9, 10 ** 12]:
+            bucket = profiling._bucket(ns)
+            self.assertGreaterEqual(bucket, previous)
+            self.assertLessEqual(profiling._bucket_start(bucket), ns)
+            self.assertGreater(profiling._bucket_start(bucket + 1), ns)
+            previous = bucket
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for ns in range(1, 1001):
+            histogram.add(ns * 1000, ns * 500)
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 500_000, delta=60_000)
+        self.assertAlmostEqual(histogram.percentile(99), 990_000, delta=120_000)
+        self.assertEqual(histogram.max, 1_000_000)
+
+
+class HandProfilerTestCase(unittest.TestCase):
+    def test_environment_phases(self):
+        profiler = HandProfiler()
+        env = headless.create_table({"Alice": slow_strategy, "Bob": passive_strategy}, seed=0, profiler=profiler)
+        headless.play_hands(env, 5)
+
+        for phase in profiling.PHASES:
+            self.assertEqual(profiler.phases[phase].count, 5, phase)
+        decisions = profiler.decisions["Alice"]
+        self.assertEqual(decisions.count, 5 * 4)
+        self.assertGreaterEqual(decisions.mean, 2e6)
+        # Streets do not include the time of the decisions made in them
+        for street in profiling.STREETS:
+            self.assertLess(profiler.phases[street].mean, 2e6)
+        self.assertGreater(profiler.phases[profiling.HAND].wall, decisions.wall)
+
+    def test_exports(self):
+        profiler = HandProfiler()
+        headless.play_hands(headless.create_table({"Alice": passive_strategy, "Bob": passive_strategy}, profiler=profiler), 3)
+        self.assertIn("pre_flop", profiler.summary())
+        self.assertIn("decision: Bob", profiler.summary())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.json")
+            profiler.write_json(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file)["phases"]["hand"]["count"], 3)
+
+            path = os.path.join(directory, "hands.prof")
+            profiler.dump_stats(path)
+            stats = pstats.Stats(path)
+            self.assertEqual(stats.stats[("environment", 0, "flop")][1], 3)
+
+    def test_tournament_profile(self):
+        result = tournament.run_tournament(2, 10, players_per_table=3, workers=1, profile=True)
+        self.assertEqual(result.profile.phases[profiling.HAND].count, 20)
+        self.assertIsNone(tournament.run_tournament(1, 1, players_per_table=2, workers=1).profile)
+
+
+if __name__ == '__main__':
+    unittest.main()
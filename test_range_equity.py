@@ -0,0 +1,82 @@
+import unittest
+from itertools import combinations
+
+import numpy as np
+
+from src.game import equity, evaluator, range_equity
+from src.game.card import Card
+from test_evaluator import cards
+
+
+def _brute_force(hero: list[Card], board: list[Card], hand_range: list) -> float:
+    """Enumerates every runout and combo with the scalar evaluator."""
+    known = set(hero) | set(board)
+    won = total = 0.0
+    remaining = [Card.from_index(i) for i in range(52) if Card.from_index(i) not in known]
+    for runout in combinations(remaining, 5 - len(board)):
+        full = board + list(runout)
+        hero_strength = evaluator.evaluate(hero + full)
+        for combo in hand_range:
+            if known.intersection(combo) or set(runout).intersection(combo):
+                continue
+            strength = evaluator.evaluate(list(combo) + full)
+            won += 1.0 if hero_strength > strength else 0.5 if hero_strength == strength else 0.0
+            total += 1
+    return won / total
+
+
+class RangeEquityTestCase(unittest.TestCase):
+    def setUp(self):
+        range_equity.clear_cache()
+        self.range = [(first, second) for first, second in combinations(cards("AH AD KH KS QS JC 9D"), 2)]
+
+    def test_strengths_match_evaluator(self):
+        rng = np.random.default_rng(0)
+        boards = rng.random((20, 52)).argsort(axis=1)[:, :5]
+        strengths = range_equity._strengths(boards)
+        for combo in rng.integers(0, range_equity.NUM_COMBOS, 50):
+            hands = np.concatenate([np.broadcast_to(range_equity._COMBO_CARDS[combo], (20, 2)), boards], axis=1)
+            blocked = (boards[:, :, None] == range_equity._COMBO_CARDS[combo]).any(axis=(1, 2))
+            np.testing.assert_array_equal(strengths[combo], np.where(blocked, -1, equity.evaluate_batch(hands)))
+
+    def test_enumeration_is_exact(self):
+        hero = cards("10C 10D")
+        for board in (cards("2S 7H JD"), cards("2S 7H JD KC"), cards("2S 7H JD KC 3C")):
+            result = range_equity.hand_vs_range(hero, board, self.range)
+            self.assertEqual(result.std_error, 0.0)
+            self.assertAlmostEqual(result.equity, _brute_force(hero, board, self.range))
+
+    def test_isomorphic_boards_share_a_table(self):
+        hero = cards("AH 10H")
+        board = cards("KH 7H 2C")
+        first = range_equity.hand_vs_range(hero, board, self.range)
+
+        def rename(card):
+            return Card.from_index(card.index ^ 1)
+        renamed = range_equity.hand_vs_range([rename(c) for c in hero], [rename(c) for c in board], [tuple(map(rename, combo)) for combo in self.range])
+        self.assertAlmostEqual(renamed.equity, first.equity)
+
+        # The turn is cut out of the cached flop table
+        turn = range_equity.hand_vs_range(hero, board + cards("5H"), self.range)
+        self.assertEqual(len(range_equity._cache), 1)
+        self.assertAlmostEqual(turn.equity, _brute_force(hero, board + cards("5H"), self.range))
+
+    def test_sampling_before_the_flop(self):
+        result = range_equity.hand_vs_range(cards("AH AC"), [], {combo: 1.0 for combo in combinations(cards("KS KD KC"), 2)}, rng=np.random.default_rng(0))
+        self.assertGreater(result.std_error, 0)
+        self.assertAlmostEqual(result.equity, 0.82, delta=4 * result.std_error + 0.01)
+
+    def test_range_vs_range_is_zero_sum(self):
+        board = cards("2S 7H JD")
+        other = [combo for combo in combinations(cards("QH QD 10C 9S 8S"), 2)]
+        first = range_equity.range_vs_range(self.range, other, board)
+        second = range_equity.range_vs_range(other, self.range, board)
+        self.assertAlmostEqual(first.equity + second.equity, 1.0)
+
+    def test_blocked_range(self):
+        with self.assertRaises(ValueError):
+            range_equity.hand_vs_range(cards("AH AD"), cards("KH KS 2C"), [tuple(cards("AH KS"))])
+
+
+if __name__ == '__main__':
+    unittest.main()
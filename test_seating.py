@@ -0,0 +1,119 @@
+import unittest
+
+from src.game.environment import Environment
+from src.game.player import Player
+from src.game.seating import Seating
+
+
+class SeatingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.seating = Seating(max_seats=6)
+        self.players = [Player(name) for name in ("Alice", "Bob", "Charlie", "Dave")]
+        for player in self.players:
+            self.seating.sit(player)
+
+    def test_money_lives_in_the_seating(self):
+        alice = self.players[0]
+        alice._money = 50
+        alice.bet_this_round = 5
+        self.assertEqual(self.seating.stacks[alice.seat], 50)
+        self.assertEqual(self.seating.bets[alice.seat], 5)
+
+        self.seating.new_hand()
+        self.assertEqual(alice.bet_this_round, 0)
+
+        # Leaving the table keeps the money
+        self.seating.leave(alice)
+        self.assertIsNone(alice.seat)
+        self.assertEqual(alice.money, 50)
+        self.assertNotIn(alice, self.seating)
+
+    def test_rotation(self):
+        alice, bob, charlie, dave = self.players
+        self.assertIs(self.seating.small_blind, alice)
+        self.assertIs(self.seating.big_blind, bob)
+
+        for _ in range(3):
+            self.seating.rotate()
+        self.assertIs(self.seating.small_blind, dave)
+        self.assertIs(self.seating.big_blind, alice)
+        self.assertEqual(list(self.seating), [dave, alice, bob, charlie])
+
+    def test_leave_passes_position_on(self):
+        alice, bob, charlie, dave = self.players
+        self.seating.rotate()
+        self.seating.leave(bob)
+        self.assertIs(self.seating.small_blind, charlie)
+
+        self.seating.leave(alice)
+        self.assertIs(self.seating.small_blind, charlie)
+        self.assertIs(self.seating.big_blind, dave)
+
+        self.seating.rotate()
+        self.seating.leave(dave)
+        self.assertIs(self.seating.small_blind, charlie)
+
+    def test_sitting_keeps_small_blind(self):
+        alice, bob, charlie, dave = self.players
+        self.seating.leave(alice)
+        self.seating.rotate()
+        self.assertIs(self.seating.small_blind, charlie)
+
+        eve = Player("Eve")
+        self.assertEqual(self.seating.sit(eve), 0)
+        self.assertIs(self.seating.small_blind, charlie)
+        self.assertEqual(list(self.seating), [charlie, dave, eve, bob])
+
+    def test_active_players(self):
+        alice, bob, charlie, dave = self.players
+        self.seating.new_hand()
+        self.seating.fold(bob.seat)
+        self.seating.fold(bob.seat)
+
+        self.assertEqual(self.seating.num_active, 3)
+        self.assertEqual(list(self.seating.active(start=1)), [charlie, dave, alice])
+
+    def test_full_table(self):
+        self.seating.sit(Player("Eve"))
+        self.seating.sit(Player("Frank"))
+        with self.assertRaises(ValueError):
+            self.seating.sit(Player("Grace"))
+
+    def test_environment_uses_seating(self):
+        env = Environment()
+        for player in self.players:
+            self.seating.leave(player)
+            env.add_player(player)
+        self.assertEqual(list(env.seating.stacks[:4]), [env.starting_score] * 4)
+        env.remove_player(self.players[0])
+        self.assertIs(env.small_blind, self.players[1])
+        self.assertIs(env.big_blind, self.players[2])
+
+    def test_restore_seats_players_again(self):
+        alice, bob, charlie, dave = self.players
+        self.seating.rotate()
+        self.seating.new_hand()
+        bob._money = 40
+        charlie.bet_this_round = 10
+        self.seating.fold(dave.seat)
+        snapshot = self.seating.snapshot()
+        players = tuple(self.seating.players)
+        self.assertEqual(len(snapshot), self.seating.snapshot_size)
+
+        bob._money = 0
+        self.seating.leave(bob)
+        eve = Player("Eve")
+        self.seating.sit(eve)
+        self.seating.new_hand()
+        self.seating.restore(snapshot, players)
+
+        self.assertIsNone(eve.seat)
+        self.assertIn(bob, self.seating)
+        self.assertEqual((bob.money, charlie.bet_this_round), (40, 10))
+        self.assertEqual(list(self.seating), [bob, charlie, dave, alice])
+        self.assertEqual(list(self.seating.active()), [bob, charlie, alice])
+        self.assertEqual(self.seating.snapshot(), snapshot)
+
+
+if __name__ == '__main__':
+    unittest.main()
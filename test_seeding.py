@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from src.game import headless, history, seeding
+from src.game.deck import ArrayDeck, Deck
+from src.game.strategies import random_strategy
+
+
+def _table(seed: int, history_writer: history.HandHistoryWriter = None):
+    rngs = seeding.spawn_rngs(seed, 3)
+    return headless.create_table(
+        {f"Bot {i}": random_strategy(rng) for i, rng in enumerate(rngs)},
+        starting_score=10_000,
+        history=history_writer,
+        seed=seed
+    )
+
+
+class SeedingTestCase(unittest.TestCase):
+    def test_spawned_seeds(self):
+        self.assertEqual(seeding.spawn_seeds(7, 4), seeding.spawn_seeds(7, 4))
+        self.assertEqual(len(set(seeding.spawn_seeds(7, 100))), 100)
+        self.assertNotEqual(seeding.spawn_seeds(7, 4), seeding.spawn_seeds(8, 4))
+
+        # Spawning again from the same sequence continues with new streams
+        sequence = seeding.seed_sequence(7)
+        first, second = seeding.spawn_seeds(sequence, 4), seeding.spawn_seeds(sequence, 4)
+        self.assertEqual(first, seeding.spawn_seeds(7, 4))
+        self.assertFalse(set(first) & set(second))
+
+    def test_decks_only_depend_on_seed(self):
+        for deck_class in (Deck, ArrayDeck):
+            deck = deck_class(seed=1)
+            deck.reset()
+            [deck.draw() for _ in range(9)]
+            deck.seed(99)
+            deck.reset()
+            drawn = [deck.draw() for _ in range(9)]
+
+            fresh = deck_class()
+            fresh.seed(99)
+            fresh.reset()
+            self.assertEqual(drawn, [fresh.draw() for _ in range(9)])
+
+    def test_tables_are_reproducible(self):
+        first, second = _table(3), _table(3)
+        headless.play_hands(first, 50)
+        headless.play_hands(second, 50)
+        self.assertEqual([p.money for p in first._players()], [p.money for p in second._players()])
+        self.assertEqual(first.hand_seed, second.hand_seed)
+        self.assertNotEqual(_table(4).rng.getrandbits(64), _table(3).rng.getrandbits(64))
+
+    def test_recorded_seed_deals_hand_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hands.bin")
+            with history.HandHistoryWriter(path) as writer:
+                headless.play_hands(_table(5, writer), 20)
+            hands = list(history.read_hands(path))
+
+        env = _table(6)
+        for hand in hands:
+            if len(hand.players) != env.num_players:
+                continue
+            decisions = env.play_hand(hand.seed)
+            next(decisions)
+            self.assertEqual(env.hand_seed, hand.seed)
+            self.assertEqual(
+                [tuple(p.cards) for p in env._players()],
+                [tuple(cards) for cards in hand.hole_cards]
+            )
+            decisions.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import asyncio
+import base64
+import json
+import os
+import unittest
+
+from src.game import server
+from src.game.strategies import passive_strategy, random_strategy
+
+
+async def join(port: int, name: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(json.dumps({"type": "join", "name": name}).encode() + b"\n")
+    await writer.drain()
+    return reader, writer
+
+
+async def messages(reader: asyncio.StreamReader):
+    while line := await reader.readline():
+        yield json.loads(line)
+
+
+class TableServerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_bot_tables_run_concurrently(self):
+        table_server = server.TableServer(hands_per_table=20, starting_score=10_000)
+
+        async def thinking_bot(player, prev_raise, can_re_raise):
+            await asyncio.sleep(0)
+            return passive_strategy(player, prev_raise, can_re_raise)
+
+        tables = [
+            table_server.open_table({"Alice": server.BotAgent(random_strategy()), "Bob": server.BotAgent(thinking_bot)})
+            for _ in range(10)
+        ]
+        await table_server.wait_tables()
+
+        for table in tables:
+            self.assertEqual(table.hands_played, 20)
+            self.assertEqual(sum(p.money for p in table.agents), 20_000)
+
+    async def test_remote_player(self):
+        table_server = server.TableServer(players_per_table=2, bots={"Bot": passive_strategy}, hands_per_table=3)
+        port = await table_server.start()
+        try:
+            reader, writer = await join(port, "Alice")
+            received = []
+            async for message in messages(reader):
+                received.append(message["type"])
+                if message["type"] == "decision":
+                    self.assertEqual(len(message["cards"]), 2)
+                    action = "CALL" if "CALL" in message["actions"] else "CHECK"
+                    writer.write(json.dumps({"id": message["id"], "action": action}).encode() + b"\n")
+                elif message["type"] == "closed":
+                    break
+            writer.close()
+        finally:
+            await table_server.close()
+
+        self.assertEqual(received[0], "joined")
+        self.assertEqual(received.count("hand"), 3)
+        self.assertIn("decision", received)
+        self.assertEqual(len(table_server.action_latencies), received.count("decision"))
+
+    async def test_timeout_and_illegal_moves_check_or_fold(self):
+        table_server = server.TableServer(players_per_table=2, hands_per_table=2, action_timeout=0.05)
+        port = await table_server.start()
+        try:
+            # Alice never answers, Bob always tries to check
+            alice = await join(port, "Alice")
+            bob_reader, bob_writer = await join(port, "Bob")
+            async for message in messages(bob_reader):
+                if message["type"] == "decision":
+                    bob_writer.write(json.dumps({"id": message["id"], "action": "CHECK"}).encode() + b"\n")
+                elif message["type"] == "closed":
+                    break
+            await table_server.wait_tables()
+        finally:
+            alice[1].close()
+            bob_writer.close()
+            await table_server.close()
+
+        table = table_server.tables[0]
+        self.assertEqual(table.hands_played, 2)
+        self.assertEqual(sum(p.money for p in table.agents), 2 * table.env.starting_score)
+
+    async def test_messages_that_are_not_objects(self):
+        table_server = server.TableServer(players_per_table=2, bots={"Bot": passive_strategy}, hands_per_table=2, action_timeout=1.0)
+        port = await table_server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"[]\n")
+            self.assertEqual(json.loads(await reader.readline())["type"], "error")
+            writer.close()
+
+            reader, writer = await join(port, "Alice")
+            replies = iter((b"[]\n", b"3\n"))
+            async for message in messages(reader):
+                if message["type"] == "decision":
+                    writer.write(next(replies, b'"x"\n'))
+                elif message["type"] == "closed":
+                    break
+            await table_server.wait_tables()
+            writer.close()
+        finally:
+            await table_server.close()
+
+        # The replies were illegal moves, the table played on with check or fold
+        table = table_server.tables[0]
+        self.assertEqual(table.hands_played, 2)
+        self.assertEqual(sum(p.money for p in table.agents), 2 * table.env.starting_score)
+
+    async def test_rejoin_after_leaving_the_queue(self):
+        table_server = server.TableServer(players_per_table=3, bots={"Bot": passive_strategy}, hands_per_table=1)
+        port = await table_server.start()
+        try:
+            reader, writer = await join(port, "Alice")
+            self.assertEqual(json.loads(await reader.readline())["type"], "joined")
+            writer.close()
+            await writer.wait_closed()
+            for _ in range(100):
+                if "Alice" not in table_server._waiting:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertNotIn("Alice", table_server._waiting)
+
+            clients = [await join(port, name) for name in ("Alice", "Bob")]
+
+            async def play(reader, writer) -> list[str]:
+                received = []
+                async for message in messages(reader):
+                    received.append(message["type"])
+                    if message["type"] == "decision":
+                        action = "CALL" if "CALL" in message["actions"] else "CHECK"
+                        writer.write(json.dumps({"id": message["id"], "action": action}).encode() + b"\n")
+                    elif message["type"] == "closed":
+                        break
+                writer.close()
+                return received
+
+            for received in await asyncio.gather(*(play(*client) for client in clients)):
+                self.assertEqual(received[0], "joined")
+                self.assertIn("decision", received)
+        finally:
+            await table_server.close()
+
+        self.assertEqual(len(table_server.tables), 1)
+        self.assertEqual(table_server.tables[0].hands_played, 1)
+
+    async def test_websocket(self):
+        table_server = server.TableServer(players_per_table=2, bots={"Bot": passive_strategy}, hands_per_table=1)
+        port = await table_server.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            key = base64.b64encode(os.urandom(16))
+            writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                         b"Sec-WebSocket-Key: " + key + b"\r\nSec-WebSocket-Version: 13\r\n\r\n")
+            self.assertIn(b"101", await reader.readline())
+            while await reader.readline() != b"\r\n":
+                pass
+
+            def send(message: dict) -> None:
+                writer.write(server.encode_frame(json.dumps(message).encode(), mask=os.urandom(4)))
+
+            send({"type": "join", "name": "Alice"})
+            received = []
+            while True:
+                _, _, payload = await server.read_frame(reader)
+                message = json.loads(payload)
+                received.append(message["type"])
+                if message["type"] == "decision":
+                    send({"id": message["id"], "action": "FOLD"})
+                elif message["type"] == "closed":
+                    break
+            writer.close()
+        finally:
+            await table_server.close()
+
+        self.assertEqual(received[0], "joined")
+        self.assertIn("hand", received)
+
+
+if __name__ == '__main__':
+    unittest.main()
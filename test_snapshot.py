@@ -0,0 +1,130 @@
+import random
+import unittest
+
+from src.game import events as ev
+from src.game import headless
+from src.game.deck import ArrayDeck, Deck
+from src.game.events import NULL, EventBus
+from src.game.strategies import passive_strategy, random_strategy
+
+
+def _table(strategies: dict, seed: int = 0):
+    return headless.create_table(strategies, starting_score=300, seed=seed)
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def test_rollouts_do_not_change_the_game(self):
+        def strategies():
+            return {f"Bot {i}": random_strategy(random.Random(i)) for i in range(4)}
+
+        reference = _table(strategies())
+        self.assertEqual(headless.play_hands(reference, 40), 40)
+        # Players busted out, rollouts bust them too and the snapshots seat them again
+        self.assertLess(reference.num_players, 4)
+
+        bots = strategies()
+        bot = bots["Bot 0"]
+
+        def searching(player, prev_raise, can_re_raise):
+            snapshot = env.snapshot()
+            for move in (("FOLD", 0), ("CALL", 0) if prev_raise else ("CHECK", 0)):
+                for _ in range(5):
+                    env.restore(snapshot)
+                    env.deck.shuffle()
+                    env.rollout(move, passive_strategy)
+            env.restore(snapshot)
+            self.assertEqual(env.snapshot(), snapshot)
+            return bot(player, prev_raise, can_re_raise)
+
+        bots["Bot 0"] = searching
+        env = _table(bots)
+        self.assertEqual(headless.play_hands(env, 40), 40)
+
+        self.assertEqual(env.num_players, reference.num_players)
+        for player, expected in zip(env.seating.in_seat_order(), reference.seating.in_seat_order()):
+            self.assertEqual(player.name, expected.name)
+            self.assertEqual(
+                (player.money, player.money_lost, player.times_raised, player.times_called),
+                (expected.money, expected.money_lost, expected.times_raised, expected.times_called)
+            )
+
+    def test_rollouts_are_silent(self):
+        received = []
+        bus = EventBus()
+        bus.subscribe(received.append, ev.DEBUG)
+        env = headless.create_table({f"Bot {i}": passive_strategy for i in range(3)}, starting_score=300, seed=3, events=bus)
+        hand = env.play_hand()
+        next(hand)
+        players = list(env._players())
+        snapshot = env.snapshot()
+        del received[:]
+
+        for _ in range(3):
+            env.restore(snapshot)
+            env.rollout(strategy=passive_strategy)
+        self.assertEqual(received, [])
+        self.assertTrue(all(player.events is bus for player in players))
+        self.assertIsNot(env.events, NULL)
+
+    def test_rollout_plays_like_the_hand(self):
+        env = _table({f"Bot {i}": passive_strategy for i in range(3)}, seed=5)
+        hand = env.play_hand()
+        decision = next(hand)
+        snapshot = env.snapshot()
+        env.rollout(strategy=passive_strategy)
+        rolled_out = env.snapshot()
+        self.assertEqual(len(env.table_cards), 5)
+
+        env.restore(snapshot)
+        self.assertEqual(env.table_cards, [])
+        self.assertIs(env.current_player, decision.player)
+        try:
+            while True:
+                player = decision.player
+                decision = hand.send(passive_strategy(player, decision.prev_raise, decision.can_re_raise))
+        except StopIteration:
+            pass
+        self.assertEqual(env.snapshot(), rolled_out)
+
+    def test_shuffling_deals_other_boards(self):
+        env = _table({f"Bot {i}": passive_strategy for i in range(2)}, seed=6)
+        next(env.play_hand())
+        snapshot = env.snapshot()
+        boards = set()
+        for _ in range(10):
+            env.restore(snapshot)
+            env.deck.shuffle()
+            env.rollout(strategy=passive_strategy)
+            boards.add(tuple(env.table_cards))
+        self.assertGreater(len(boards), 1)
+
+    def test_snapshots_have_a_fixed_size(self):
+        for deck in (Deck(), ArrayDeck()):
+            env = headless.create_table({f"Bot {i}": passive_strategy for i in range(3)}, deck=deck)
+            snapshot = env.snapshot()
+            self.assertIsNone(env.hand_seed)
+            env.restore(snapshot)
+            self.assertIsNone(env.hand_seed)
+
+            sizes = {len(snapshot.state)}
+            hand = env.play_hand(seed=7)
+            decision = next(hand)
+            try:
+                while True:
+                    sizes.add(len(env.snapshot().state))
+                    env.restore(env.snapshot())
+                    decision = hand.send(passive_strategy(decision.player, decision.prev_raise, decision.can_re_raise))
+            except StopIteration:
+                pass
+            self.assertEqual(len(sizes), 1)
+            self.assertEqual(env.hand_seed, 7)
+
+    def test_resume_needs_a_decision(self):
+        env = _table({f"Bot {i}": passive_strategy for i in range(2)})
+        env.restore(env.snapshot())
+        with self.assertRaises(ValueError):
+            next(env.resume_hand())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.game import evaluator
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True).stdout
+
+
+class StartupTestCase(unittest.TestCase):
+    def test_headless_import_is_lean(self):
+        output = run(
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "from src.game import headless, evaluator\n"
+            "print(time.perf_counter() - start)\n"
+            "print(isinstance(evaluator._DATA.flush, memoryview))\n"
+            "print(' '.join(name for name in ('numpy', 'json', 'pathlib', 'argparse') if name in sys.modules))\n"
+        )
+        seconds, mapped, heavy = (output.splitlines() + [""])[:3]
+        self.assertEqual(mapped, "True")
+        self.assertEqual(heavy, "")
+        # Generous, the import takes well under 100ms on a laptop
+        self.assertLess(float(seconds), 1.0)
+
+    def test_tournament_tables_do_not_load_numpy(self):
+        output = run(
+            "import sys\n"
+            "from src.game import tournament\n"
+            "task = tournament.TableTask(1, (2, 3), 5, 1000)\n"
+            "tournament.play_table(task)\n"
+            "print('numpy' in sys.modules)\n"
+        )
+        self.assertEqual(output.strip(), "False")
+
+    def test_table_file_matches_generated_tables(self):
+        built = evaluator._build_tables()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            evaluator.write_tables(path)
+            loaded = evaluator._load_tables(path)
+            for name in evaluator._TableData._fields:
+                self.assertEqual(evaluator._to_list(getattr(loaded, name)), list(getattr(built, name)), name)
+            self.assertIsNone(evaluator._load_tables(os.path.join(directory, "missing.bin")))
+
+    def test_broken_table_files_are_not_loaded(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.bin")
+            evaluator.write_tables(path)
+            with open(path, "rb") as file:
+                content = file.read()
+            # Shorter than the header, cut off in the last section and with trailing bytes
+            for broken in (content[:10], content[:-1], content + b"\0"):
+                with open(path, "wb") as file:
+                    file.write(broken)
+                self.assertIsNone(evaluator._load_tables(path))
+
+    def test_shipped_tables_are_current(self):
+        built = evaluator._build_tables()
+        for name in evaluator._TableData._fields:
+            self.assertEqual(evaluator._to_list(getattr(evaluator._DATA, name)), list(getattr(built, name)), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.game import headless, tournament
+from src.game.stats import StatsStore
+from src.game.strategies import passive_strategy, random_strategy
+
+STARTING_SCORE = 1_000_000
+
+
+def play(store: StatsStore, num_hands: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    strategies = {f"Bot {i}": random_strategy(rng) for i in range(4)}
+    strategies["Caller"] = passive_strategy
+    env = headless.create_table(strategies, starting_score=STARTING_SCORE, seed=seed, stats=store)
+    players = list(env._players())
+    headless.play_hands(env, num_hands)
+    return players
+
+
+class StatsStoreTestCase(unittest.TestCase):
+    def test_counts_match_the_players(self):
+        # A batch smaller than the hands played adds to the columns several times
+        store = StatsStore(batch_size=7)
+        players = play(store, 100)
+        totals = store.totals()
+
+        for player in players:
+            row = store.player_id(player.name)
+            self.assertEqual(totals["hands"][row], 100)
+            self.assertEqual(totals["folds"][row].sum(), player.times_folded)
+            self.assertEqual(totals["checks"][row].sum(), player.times_checked)
+            self.assertEqual(totals["calls"][row].sum(), player.times_called)
+            self.assertEqual(totals["raises"][row].sum(), player.times_raised)
+            self.assertEqual(totals["won"][row] - totals["chips"][row].sum(), player.money - STARTING_SCORE)
+            self.assertEqual(totals["seen"][row, 0], 100)
+            self.assertTrue((np.diff(totals["seen"][row]) <= 0).all())
+
+        caller = store.player_id("Caller")
+        self.assertEqual(totals["pfr"][caller], 0)
+        self.assertLessEqual(totals["showdowns"][caller], totals["seen"][caller, 3])
+
+    def test_report_groups_players(self):
+        store = StatsStore()
+        play(store, 50)
+        report = store.report(lambda name: name.split()[0])
+
+        self.assertEqual(report.labels, ["Bot", "Caller"])
+        np.testing.assert_array_equal(report.columns["hands"], [200, 50])
+        self.assertEqual(report.columns["pfr_rate"][1], 0)
+        self.assertEqual(report.columns["aggression"][1], 0)
+        self.assertGreater(report.columns["vpip_rate"][0], report.columns["pfr_rate"][0])
+        # Chips only change hands
+        self.assertEqual(report.columns["net"].sum(), 0)
+        self.assertIn("Caller", str(report))
+
+    def test_files_and_merging(self):
+        first, second = StatsStore(), StatsStore()
+        play(first, 30, seed=1)
+        play(second, 20, seed=2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.bin")
+            second.save(path)
+            loaded = StatsStore.load(path)
+
+            path = os.path.join(directory, "stats.csv")
+            loaded.report().write_csv(path)
+            with open(path) as file:
+                lines = file.read().splitlines()
+        self.assertEqual(loaded.names, second.names)
+        for name, column in second.totals().items():
+            np.testing.assert_array_equal(loaded.totals()[name], column)
+        self.assertEqual(len(lines), 1 + len(second))
+        self.assertTrue(lines[0].startswith("player,seen_pre_flop"))
+
+        expected = first.totals()["raises"] + second.totals()["raises"]
+        first.merge(loaded)
+        np.testing.assert_array_equal(first.totals()["raises"], expected)
+        self.assertEqual(first.totals()["hands"][0], 50)
+
+    def test_names_keep_every_character(self):
+        store = StatsStore()
+        for name in ("Line\nbreak", "", "Zoë", "a,b"):
+            store.player_id(name)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.bin")
+            store.save(path)
+            self.assertEqual(StatsStore.load(path).names, store.names)
+
+            path = os.path.join(directory, "stats.csv")
+            report = store.report()
+            report.write_csv(path)
+            with open(path, newline="") as file:
+                rows = list(csv.reader(file))
+        self.assertEqual([row[0] for row in rows[1:]], report.labels)
+        self.assertEqual({len(row) for row in rows}, {1 + len(report.columns)})
+
+    def test_tournament_merges_stores(self):
+        result = tournament.run_tournament(3, 20, players_per_table=3, workers=1, player_stats=True)
+        totals = result.player_stats.totals()
+        for name, stats in result.stats.items():
+            row = result.player_stats.player_id(name)
+            self.assertEqual(totals["hands"][row], stats["hands"])
+            self.assertEqual(totals["raises"][row].sum(), stats["times_raised"])
+        self.assertIsNone(tournament.run_tournament(1, 1, players_per_table=2, workers=1).player_stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
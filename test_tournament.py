@@ -0,0 +1,26 @@
+import unittest
+
+from src.game import tournament
+
+
+class TournamentTestCase(unittest.TestCase):
+    def test_reproducible_across_workers(self):
+        single = tournament.run_tournament(4, 30, players_per_table=3, workers=1, seed=5)
+        pooled = tournament.run_tournament(4, 30, players_per_table=3, workers=2, seed=5)
+
+        self.assertEqual(single.hands, 4 * 30)
+        self.assertEqual(single.stats, pooled.stats)
+
+    def test_merge_stats(self):
+        results = [
+            tournament.TableResult(10, {"Bot 0": {"times_folded": 1, "hands": 10}}),
+            tournament.TableResult(5, {"Bot 0": {"times_folded": 2, "hands": 5}, "Bot 1": {"times_folded": 3, "hands": 5}}),
+        ]
+        merged = tournament.merge_stats(results)
+
+        self.assertEqual(merged["Bot 0"], {"times_folded": 3, "hands": 15})
+        self.assertEqual(merged["Bot 1"], {"times_folded": 3, "hands": 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
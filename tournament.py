@@ -0,0 +1,40 @@
+import argparse
+import os
+
+from src.game.tournament import run_tournament
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Runs a headless self-play tournament over all cores.")
+    parser.add_argument("--tables", type=int, default=64, help="number of independent tables")
+    parser.add_argument("--hands", type=int, default=500, help="hands per table")
+    parser.add_argument("--players", type=int, default=6, help="players per table")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-baseline", action="store_true", help="skip the single process run used for the scaling efficiency")
+    parser.add_argument("--profile", action="store_true", help="time the phases of every hand and print a summary")
+    parser.add_argument("--stats", metavar="CSV", help="count every player's actions, print a report and write it to the file")
+    args = parser.parse_args()
+
+    result = run_tournament(args.tables, args.hands, args.players, args.workers, args.seed, profile=args.profile, player_stats=args.stats is not None)
+    print(f"[i] {result.hands} hands on {result.tables} tables with {result.workers} workers in {result.elapsed:.2f}s: {result.hands_per_second:,.0f} hands/s")
+
+    if not args.no_baseline:
+        baseline = run_tournament(args.tables, args.hands, args.players, 1, args.seed)
+        speedup = result.hands_per_second / baseline.hands_per_second
+        print(f"[i] Single process: {baseline.hands_per_second:,.0f} hands/s")
+        print(f"[i] Speedup {speedup:.2f}x, scaling efficiency {speedup / result.workers:.0%}")
+
+    if result.profile is not None:
+        print()
+        print(result.profile.summary())
+
+    if result.player_stats is not None:
+        report = result.player_stats.report()
+        report.write_csv(args.stats)
+        print()
+        print(report)
+
+    print()
+    print(f"{'player':<10}" + "".join(f"{stat:>15}" for stat in next(iter(result.stats.values()))))
+    for name, stats in result.stats.items():
+        print(f"{name:<10}" + "".join(f"{value:>15}" for value in stats.values()))